@@ -0,0 +1,89 @@
+"""Throughput of each JSON path with every installed codec.
+
+Usage: python benchmarks/bench_codec.py [--entities N] [--observations K]
+
+Measures bytes/sec for graph save (export_jsonl), graph load
+(import_jsonl), a read_graph tool response, and a Redis session
+round trip, once per backend in jade.codec.available_codecs().
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+from jade import codec
+from jade.mcp.memory_server import KnowledgeGraph
+from jade.memory.hot import HotMemoryClient, HotMemoryConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _build_graph(path: str, entities: int, observations: int) -> KnowledgeGraph:
+    graph = KnowledgeGraph(file_path=path)
+    for i in range(entities):
+        graph.upsert_entity(
+            f"entity-{i}", "Concept", [f"observation {j} about entity {i} — naïve ünïcode" for j in range(observations)]
+        )
+    for i in range(entities - 1):
+        graph.create_relation(f"entity-{i}", f"entity-{i + 1}", "relates_to")
+    return graph
+
+
+def _session_round_trips(hot: HotMemoryClient, session: dict[str, object], count: int) -> None:
+    for i in range(count):
+        hot.write_session(str(i % 10), session)
+        hot.read_session(str(i % 10))
+
+
+def _rate(nbytes: int, fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return nbytes / best / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--entities", type=int, default=20_000)
+    parser.add_argument("--observations", type=int, default=10)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    graph = _build_graph(path, args.entities, args.observations)
+    session = {"messages": [{"role": "user", "content": "x" * 200}] * 50, "state": {"turn": 12}}
+    hot = HotMemoryClient(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+
+    print(f"{'codec':<8} {'save MB/s':>10} {'load MB/s':>10} {'read_graph MB/s':>16} {'session MB/s':>13}")
+    try:
+        for name in codec.available_codecs():
+            previous = codec.set_codec(name)
+            try:
+                graph.export_jsonl(path)
+                file_bytes = os.path.getsize(path)
+                response = {"entities": graph.entities, "relations": graph.relations}
+                response_bytes = len(codec.dumpb(response))
+                session_bytes = len(codec.dumpb(session))
+
+                save = _rate(file_bytes, lambda: graph.export_jsonl(path))
+                load = _rate(file_bytes, lambda: KnowledgeGraph(file_path=path).import_jsonl(path))
+                tool = _rate(response_bytes, lambda: codec.dumps(response))  # noqa: B023
+                redis = _rate(session_bytes * 2000, lambda: _session_round_trips(hot, session, 1000))
+                print(f"{name:<8} {save:>10.1f} {load:>10.1f} {tool:>16.1f} {redis:>13.1f}")
+            finally:
+                codec.set_codec(previous.name)
+    finally:
+        for leftover in (path, f"{path}.tmp"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Graph size and latency of record_decision / log_insight under repeated calls.
+
+Usage: python benchmarks/bench_jade_tools.py [--rounds N] [--calls K] [--distinct D]
+
+Each round makes K calls cycling through D distinct decisions and
+insights, i.e. mostly retries of calls already made. Since both tools
+are idempotent, entity and relation counts, the memory file size and the
+per-call latency should stay flat from round to round.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from jade.mcp.jade_server import create_jade_server
+from jade.mcp.memory_server import KnowledgeGraph
+
+
+async def _round(server: object, calls: int, distinct: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        n = i % distinct
+        await server.call_tool(  # type: ignore[attr-defined]
+            "record_decision",
+            {"decisionName": f"decision-{n}", "rationale": f"because {n}", "decidedBy": "Alex", "sessionId": "s1"},
+        )
+        await server.call_tool(  # type: ignore[attr-defined]
+            "log_insight", {"insight": f"Insight number {n} about hot memory", "sessionId": "s1"}
+        )
+    return (time.perf_counter() - start) / (2 * calls) * 1000
+
+
+async def _main(rounds: int, calls: int, distinct: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        graph = KnowledgeGraph(file_path=path)
+        server = create_jade_server(graph=graph)
+        print(f"{'round':>5} {'entities':>9} {'relations':>10} {'file KB':>8} {'ms/call':>8}")
+        for index in range(1, rounds + 1):
+            ms = await _round(server, calls, distinct)
+            size = os.path.getsize(path) / 1024
+            print(f"{index:>5} {len(graph.entities):>9} {len(graph.relations):>10} {size:>8.1f} {ms:>8.3f}")
+    finally:
+        for leftover in (path, f"{path}.tmp"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--distinct", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_main(args.rounds, args.calls, args.distinct))
+
+
+if __name__ == "__main__":
+    main()
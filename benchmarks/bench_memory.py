@@ -0,0 +1,112 @@
+"""Resident bytes per entity and per relation, dict layout vs compact.
+
+Usage: python benchmarks/bench_memory.py [--entities N] [--observations K] [--fanout F]
+
+Loads the same JSONL memory file into the dict-of-dicts layout the graph
+used before jade.mcp.compact (rebuilt here) and into KnowledgeGraph, and
+reports the memory tracemalloc sees retained by each. Entity cost
+includes observations; relation cost is the growth from loading the
+relations on top of the entities.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from jade import codec
+from jade.mcp.memory_server import KnowledgeGraph, ObservationList
+from jade.mcp.shards import read_records
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _write_file(path: str, entities: int, observations: int, fanout: int, with_relations: bool) -> int:
+    relation_count = 0
+    with open(path, "wb") as f:
+        for i in range(entities):
+            obs = [f"observation {j} about entity {i}" for j in range(observations)]
+            record = {"name": f"entity-{i}", "entityType": "Concept", "observations": obs, "type": "entity"}
+            f.write(codec.dumpb(record) + b"\n")
+        if with_relations:
+            for i in range(entities):
+                for step in range(1, fanout + 1):
+                    relation_type = ("relates_to", "depends_on", "uses")[step % 3]
+                    to = f"entity-{(i + step) % entities}"
+                    record = {"from": f"entity-{i}", "to": to, "relationType": relation_type, "type": "relation"}
+                    f.write(codec.dumpb(record) + b"\n")
+                    relation_count += 1
+    return relation_count
+
+
+def _dict_layout(path: str) -> tuple[Any, ...]:
+    entities, relations = read_records(path)
+    by_name: dict[str, dict[str, Any]] = {}
+    for record in entities:
+        record["observations"] = ObservationList(record.get("observations", []))
+        by_name[record["name"]] = record
+    by_key: dict[tuple[str, str, str], dict[str, Any]] = {}
+    outgoing: dict[str, dict[tuple[str, str, str], None]] = {}
+    incoming: dict[str, dict[tuple[str, str, str], None]] = {}
+    for record in relations:
+        key = (record["from"], record["to"], record["relationType"])
+        by_key[key] = record
+        outgoing.setdefault(key[0], {})[key] = None
+        incoming.setdefault(key[1], {})[key] = None
+    return by_name, by_key, outgoing, incoming
+
+
+def _compact_layout(path: str) -> KnowledgeGraph:
+    graph = KnowledgeGraph(file_path=path)
+    graph.load()
+    return graph
+
+
+def _retained(load: Callable[[str], object], path: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        loaded = load(path)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del loaded
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--observations", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4, help="relations per entity")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    entities_path = os.path.join(directory, "entities.jsonl")
+    full_path = os.path.join(directory, "memory.jsonl")
+    try:
+        _write_file(entities_path, args.entities, args.observations, args.fanout, with_relations=False)
+        relations = _write_file(full_path, args.entities, args.observations, args.fanout, with_relations=True)
+
+        print(f"{args.entities} entities x {args.observations} observations, {relations} relations")
+        print(f"{'layout':<8} {'B/entity':>9} {'B/relation':>11} {'total MB':>9}")
+        for name, load in (("dict", _dict_layout), ("compact", _compact_layout)):
+            entity_bytes = _retained(load, entities_path)
+            total = _retained(load, full_path)
+            per_entity = entity_bytes / args.entities
+            per_relation = (total - entity_bytes) / max(relations, 1)
+            print(f"{name:<8} {per_entity:>9.0f} {per_relation:>11.0f} {total / 1e6:>9.1f}")
+    finally:
+        for filename in os.listdir(directory):
+            os.unlink(os.path.join(directory, filename))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Sharded KnowledgeGraph.load() time, inline vs in worker processes.
+
+Usage: python benchmarks/bench_shards.py [--entities N] [--observations K] [--shards S] [--workers W ...]
+
+Writes one sharded graph (observations carry write times, as the server
+records them), then times a full load with the shards read inline
+(load_workers=1) and with each worker count. The defaults make a graph
+well above shards.PARALLEL_MIN_BYTES; a pool can only win with more
+than one CPU, so the CPU count is printed alongside.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+
+from jade import codec
+from jade.mcp.memory_server import KnowledgeGraph
+from jade.mcp.shards import PARALLEL_MIN_BYTES, shard_path
+
+
+def _write_graph(path: str, entities: int, observations: int, shards: int) -> None:
+    graph = KnowledgeGraph(file_path=path, shards=shards)
+    for i in range(entities):
+        obs = [f"observation {j} about entity {i}" for j in range(observations)]
+        graph.upsert_entity(f"entity-{i}", "Concept", obs)
+    for i in range(entities):
+        graph.create_relation(f"entity-{i}", f"entity-{(i + 1) % entities}", "relates_to")
+    graph.save()
+
+
+def _best(path: str, *, shards: int, workers: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        graph = KnowledgeGraph(file_path=path, shards=shards, load_workers=workers)
+        gc.collect()
+        start = time.perf_counter()
+        graph.load()
+        best = min(best, time.perf_counter() - start)
+        del graph
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--observations", type=int, default=10)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "memory.jsonl")
+    try:
+        _write_graph(path, args.entities, args.observations, args.shards)
+        total = sum(os.path.getsize(shard_path(f"{path}.shards", i)) for i in range(args.shards))
+        print(
+            f"{args.entities} entities x {args.observations} observations in {args.shards} shards, "
+            f"{total / 1e6:.1f} MB (PARALLEL_MIN_BYTES {PARALLEL_MIN_BYTES / 1e6:.1f} MB); "
+            f"{os.cpu_count()} CPUs, codec {codec.active_codec().name}"
+        )
+        inline = _best(path, shards=args.shards, workers=1, repeat=args.repeat)
+        print(f"{'workers':<8} {'load s':>7} {'vs inline':>10}")
+        print(f"{'inline':<8} {inline:>7.2f} {1:>9.1f}x")
+        for workers in args.workers:
+            seconds = _best(path, shards=args.shards, workers=workers, repeat=args.repeat)
+            print(f"{workers:<8} {seconds:>7.2f} {inline / seconds:>9.1f}x")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
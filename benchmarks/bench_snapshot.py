@@ -0,0 +1,93 @@
+"""KnowledgeGraph.load() time from JSONL vs the binary snapshot.
+
+Usage: python benchmarks/bench_snapshot.py [--entities N] [--observations K] [--fanout F]
+
+Writes one memory file (observations carry write times, as the server
+records them) and its binary snapshot, then times a full load of each,
+once per backend in jade.codec.available_codecs(). The defaults make a
+1M-observation graph.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from jade import codec
+from jade.mcp.memory_server import KnowledgeGraph
+from jade.mcp.snapshot import jsonl_to_snapshot, snapshot_path
+
+
+def _write_file(path: str, entities: int, observations: int, fanout: int) -> None:
+    with open(path, "wb") as f:
+        for i in range(entities):
+            obs = [f"observation {j} about entity {i}" for j in range(observations)]
+            at = 1_700_000_000.0 + i
+            record = {
+                "type": "entity",
+                "name": f"entity-{i}",
+                "entityType": ("Concept", "Person", "Decision")[i % 3],
+                "observations": obs,
+                "observedAt": [at] * observations,
+            }
+            f.write(codec.dumpb(record) + b"\n")
+        for i in range(entities):
+            for step in range(1, fanout + 1):
+                to = f"entity-{(i + step) % entities}"
+                record = {"type": "relation", "from": f"entity-{i}", "to": to, "relationType": "relates_to"}
+                f.write(codec.dumpb(record) + b"\n")
+
+
+def _best(path: str, *, binary: bool, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        graph = KnowledgeGraph(file_path=path)
+        if not binary:
+            graph._snapshot_is_current = lambda: False  # type: ignore[method-assign]
+        gc.collect()
+        start = time.perf_counter()
+        graph.load()
+        best = min(best, time.perf_counter() - start)
+        del graph
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--observations", type=int, default=10)
+    parser.add_argument("--fanout", type=int, default=2, help="relations per entity")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "memory.jsonl")
+    try:
+        _write_file(path, args.entities, args.observations, args.fanout)
+        jsonl_to_snapshot(path)
+        jsonl_mb = os.path.getsize(path) / 1e6
+        snap_mb = os.path.getsize(snapshot_path(path)) / 1e6
+        print(
+            f"{args.entities} entities x {args.observations} observations, {args.entities * args.fanout} relations; "
+            f"JSONL {jsonl_mb:.1f} MB, snapshot {snap_mb:.1f} MB"
+        )
+        print(f"{'codec':<8} {'JSONL s':>8} {'snapshot s':>11} {'speedup':>8}")
+        for name in codec.available_codecs():
+            previous = codec.set_codec(name)
+            try:
+                jsonl = _best(path, binary=False, repeat=args.repeat)
+                binary = _best(path, binary=True, repeat=args.repeat)
+                print(f"{name:<8} {jsonl:>8.2f} {binary:>11.2f} {jsonl / binary:>7.1f}x")
+            finally:
+                codec.set_codec(previous.name)
+    finally:
+        for filename in os.listdir(directory):
+            os.unlink(os.path.join(directory, filename))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,21 +7,30 @@ Fail-fast: invalid config raises immediately.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import anthropic
 
 from jade.mcp.jade_server import create_jade_server
-from jade.mcp.memory_server import create_memory_server
+from jade.mcp.memory_server import create_memory_server, load_graph
+
+if TYPE_CHECKING:
+    from jade.memory.hot import AsyncHotMemoryClient, HotMemoryClient
 
 
 @dataclass(frozen=True)
 class JadeAgentConfig:
-    """Immutable configuration for JadeAgent. Validates at creation time."""
+    """Immutable configuration for JadeAgent. Validates at creation time.
+
+    With ``hot_memory``, update_hot_memory writes through to Redis (see
+    jade_server); an AsyncHotMemoryClient keeps those writes off the
+    agent's event loop.
+    """
 
     api_key: str
     model: str
     memory_file_path: str
+    hot_memory: AsyncHotMemoryClient | HotMemoryClient | None = None
 
     def __post_init__(self) -> None:
         if not self.api_key or not self.api_key.strip():
@@ -35,6 +44,15 @@ class JadeAgentConfig:
             raise ValueError(msg)
 
 
+# Paging, filtering and projection arguments shared by the graph read tools
+_READ_PROPERTIES: dict[str, Any] = {
+    "cursor": {"type": "string", "description": "nextCursor from the previous page."},
+    "limit": {"type": "integer", "minimum": 1},
+    "entityTypes": {"type": "array", "items": {"type": "string"}},
+    "projection": {"type": "string", "enum": ["full", "summary", "names"]},
+    "maxObservations": {"type": "integer", "minimum": 0},
+}
+
 # Tool definitions for the Anthropic Messages API
 _MEMORY_TOOLS = [
     {
@@ -156,31 +174,99 @@ _MEMORY_TOOLS = [
             "required": ["relations"],
         },
     },
+    {
+        "name": "apply_mutations",
+        "description": (
+            "Apply several mutations atomically with one save; results are returned per operation. "
+            'Each operation is {"op": <mutation tool name>, <that tool\'s argument>: [...]}.'
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "op": {
+                                "type": "string",
+                                "enum": [
+                                    "create_entities",
+                                    "create_relations",
+                                    "add_observations",
+                                    "delete_entities",
+                                    "delete_observations",
+                                    "delete_relations",
+                                ],
+                            },
+                        },
+                        "required": ["op"],
+                    },
+                }
+            },
+            "required": ["operations"],
+        },
+    },
     {
         "name": "read_graph",
-        "description": "Read the entire knowledge graph.",
-        "input_schema": {"type": "object", "properties": {}},
+        "description": "Read the knowledge graph: entities, then relations, a page at a time.",
+        "input_schema": {"type": "object", "properties": {**_READ_PROPERTIES}},
     },
     {
         "name": "search_nodes",
-        "description": "Search for entities matching a query string.",
+        "description": "Search for entities matching a query string, best match first.",
         "input_schema": {
             "type": "object",
-            "properties": {"query": {"type": "string"}},
+            "properties": {
+                "query": {"type": "string"},
+                **_READ_PROPERTIES,
+            },
             "required": ["query"],
         },
     },
     {
         "name": "open_nodes",
-        "description": "Open specific nodes by name.",
+        "description": "Open specific nodes by name, with the relations touching them.",
         "input_schema": {
             "type": "object",
             "properties": {
                 "names": {"type": "array", "items": {"type": "string"}},
+                **_READ_PROPERTIES,
             },
             "required": ["names"],
         },
     },
+    {
+        "name": "traverse",
+        "description": "Walk relations breadth-first from seed entities, up to maxDepth hops and maxNodes entities.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "names": {"type": "array", "items": {"type": "string"}},
+                "maxDepth": {"type": "integer", "minimum": 0},
+                "relationTypes": {"type": "array", "items": {"type": "string"}},
+                "direction": {"type": "string", "enum": ["out", "in", "both"]},
+                "maxNodes": {"type": "integer", "minimum": 1},
+                "projection": _READ_PROPERTIES["projection"],
+                "maxObservations": _READ_PROPERTIES["maxObservations"],
+            },
+            "required": ["names"],
+        },
+    },
+    {
+        "name": "changes_since",
+        "description": (
+            "Mutations numbered after seq, oldest first; pass the returned seq and history on the next call."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "seq": {"type": "integer", "minimum": 0},
+                "limit": _READ_PROPERTIES["limit"],
+                "history": {"type": "string"},
+            },
+        },
+    },
 ]
 
 _JADE_TOOLS = [
@@ -200,10 +286,25 @@ _JADE_TOOLS = [
     },
     {
         "name": "recall_context",
-        "description": "Search the knowledge graph by session, date, or topic.",
+        "description": (
+            "Search the knowledge graph by session, date, or topic, most relevant and recent first "
+            "(up to limit entities, default 20, with their relations)."
+        ),
         "input_schema": {
             "type": "object",
-            "properties": {"query": {"type": "string"}},
+            "properties": {
+                "query": {"type": "string"},
+                "limit": _READ_PROPERTIES["limit"],
+                "entityTypes": _READ_PROPERTIES["entityTypes"],
+                "since": {
+                    "type": "string",
+                    "description": "ISO 8601 date or datetime; only entities with an observation written since.",
+                },
+                "until": {
+                    "type": "string",
+                    "description": "ISO 8601 date or datetime (a date includes the whole day).",
+                },
+            },
             "required": ["query"],
         },
     },
@@ -244,9 +345,11 @@ class JadeAgent:
         self.client = anthropic.Anthropic(api_key=config.api_key)
         self.model = config.model
 
-        # Initialize MCP servers for tool execution
-        self._memory_server = create_memory_server(config.memory_file_path)
-        self._jade_server = create_jade_server(config.memory_file_path)
+        # Initialize MCP servers for tool execution. Both share one loaded
+        # graph so it is parsed once and writes are visible to either toolset.
+        self.graph = load_graph(config.memory_file_path)
+        self._memory_server = create_memory_server(config.memory_file_path, graph=self.graph)
+        self._jade_server = create_jade_server(config.memory_file_path, graph=self.graph, hot_memory=config.hot_memory)
 
         # Build tool name → server mapping
         self._memory_tool_names = {t["name"] for t in _MEMORY_TOOLS}
@@ -0,0 +1,176 @@
+"""Pluggable JSON codec for graph persistence, tool responses and Redis state.
+
+Uses orjson, else msgspec, when installed (``pip install jade[fast-json]``)
+and falls back to the stdlib ``json`` module. Every backend produces valid
+JSON, but spacing differs: the fast ones are compact and write UTF-8 rather
+than ``\\u`` escapes, so never compare encoded text across backends.
+
+Values a fast backend cannot encode (lone surrogates, ints wider than 64
+bits, unknown types) are retried with stdlib, and input it rejects is
+re-parsed by stdlib, so decode errors are always ``ValueError`` subclasses
+(``json.JSONDecodeError`` or ``UnicodeDecodeError``).
+
+Mappings that are not dicts (e.g. the graph's slotted entity records) are
+encoded as JSON objects by every backend.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """One JSON backend: compact text/bytes encoders, a pretty encoder, a decoder."""
+
+    name: str
+    dumps: Callable[[Any], str]
+    dumpb: Callable[[Any], bytes]
+    dumps_pretty: Callable[[Any], str]
+    loads: Callable[[str | bytes], Any]
+
+
+def _as_builtin(obj: Any) -> Any:
+    """Encoder hook: JSON-encodable stand-in for a non-builtin value."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def _json_dumps(obj: Any, indent: int | None = None) -> str:
+    return json.dumps(obj, indent=indent, default=_as_builtin)
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        name="json",
+        dumps=_json_dumps,
+        dumpb=lambda obj: _json_dumps(obj).encode("utf-8"),
+        dumps_pretty=lambda obj: _json_dumps(obj, indent=2),
+        loads=json.loads,
+    )
+
+
+def _orjson_codec() -> JsonCodec | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def dumpb(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_as_builtin)
+        except TypeError:
+            return _json_dumps(obj).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, default=_as_builtin, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            return _json_dumps(obj, indent=2)
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    return JsonCodec(
+        name="orjson", dumps=lambda obj: dumpb(obj).decode("utf-8"), dumpb=dumpb, dumps_pretty=dumps_pretty, loads=loads
+    )
+
+
+def _msgspec_codec() -> JsonCodec | None:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    encoder, decoder = msgspec.json.Encoder(enc_hook=_as_builtin), msgspec.json.Decoder()
+
+    def dumpb(obj: Any) -> bytes:
+        try:
+            return encoder.encode(obj)
+        except (TypeError, UnicodeEncodeError, OverflowError):
+            return _json_dumps(obj).encode("utf-8")
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+
+    return JsonCodec(
+        name="msgspec",
+        dumps=lambda obj: dumpb(obj).decode("utf-8"),
+        dumpb=dumpb,
+        dumps_pretty=lambda obj: msgspec.json.format(dumpb(obj), indent=2).decode("utf-8"),
+        loads=loads,
+    )
+
+
+_FACTORIES: dict[str, Callable[[], JsonCodec | None]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> list[str]:
+    """Names of the installed backends, fastest first."""
+    return [name for name, factory in _FACTORIES.items() if factory() is not None]
+
+
+def get_codec(name: str | None = None) -> JsonCodec:
+    """The named backend, or the fastest installed one when ``name`` is None."""
+    if name is None:
+        return next(codec for codec in (factory() for factory in _FACTORIES.values()) if codec is not None)
+    factory = _FACTORIES.get(name)
+    if factory is None:
+        msg = f"unknown JSON codec '{name}', expected one of {sorted(_FACTORIES)}"
+        raise ValueError(msg)
+    codec = factory()
+    if codec is None:
+        msg = f"JSON codec '{name}' is not installed"
+        raise ValueError(msg)
+    return codec
+
+
+_active = get_codec()
+
+
+def active_codec() -> JsonCodec:
+    return _active
+
+
+def set_codec(name: str | None) -> JsonCodec:
+    """Switch every caller to another backend; returns the previous one."""
+    global _active
+    previous, _active = _active, get_codec(name)
+    return previous
+
+
+def dumps(obj: Any) -> str:
+    """Encode to compact JSON text."""
+    return _active.dumps(obj)
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes (for files and sockets)."""
+    return _active.dumpb(obj)
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Encode to JSON text indented by two spaces."""
+    return _active.dumps_pretty(obj)
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode JSON text or UTF-8 bytes."""
+    return _active.loads(data)
@@ -0,0 +1,37 @@
+"""Change feed shared by the knowledge graph storage backends.
+
+Every mutation a graph applies is numbered with a monotonically
+increasing sequence number and kept as its op record, e.g.::
+
+    {"op": "upsert_entity", "name": "Redis", "entityType": "Technology", "observations": [...], "seq": 42}
+    {"op": "create_relation", "from": "Alex", "to": "Redis", "relationType": "uses", "seq": 43}
+    {"op": "delete_relations", "relations": [["Alex", "Redis", "uses"]], "seq": 44}
+
+(plus add_observations, delete_observations and delete_entities records
+in the delta-log format of KnowledgeGraph). A consumer reads the graph
+once, then calls changes_since() with the last seq it applied, and the
+``history`` id returned with it, to follow along instead of re-reading
+everything. A ``reset`` answer means the feed no longer reaches back that
+far, or the seq belongs to another history: re-read the graph and
+continue from the seq returned with it.
+
+KnowledgeGraph keeps the last ``change_buffer`` changes in a ring. In WAL
+mode op records carry their seq into the delta log and its checkpoint
+records the seq and history it starts from, so numbering survives
+restarts and older changes are read back from the log. Without WAL
+numbering restarts at 0 on load, under a new history. Ops tailed from
+another process keep the writer's seq when it is ahead; with several
+writers each process numbers its own mutations. SqliteKnowledgeGraph
+numbers changes in its database and keeps one history per database.
+"""
+
+from __future__ import annotations
+
+
+def check_change_args(seq: int, limit: int | None) -> None:
+    if seq < 0:
+        msg = "seq must be non-negative"
+        raise ValueError(msg)
+    if limit is not None and limit < 1:
+        msg = "limit must be at least 1"
+        raise ValueError(msg)
@@ -0,0 +1,442 @@
+"""Compact in-memory records for KnowledgeGraph.
+
+A plain dict per entity and per relation costs a hash table each, and
+names parsed from JSONL are separate string objects everywhere they
+appear (entity records, relation endpoints, index keys). At scale that
+overhead, not the text itself, dominates memory. Instead:
+
+- SymbolTable interns names, entity types and relation types: each
+  distinct string is stored once and has a small integer id.
+- Entity is a ``__slots__`` record that reads like the old dict
+  (``entity["name"]``, ``.get()``, ``{**entity}``, ``==`` against a
+  dict), so the tool layer keeps its dict-shaped view. jade.codec
+  encodes it as a JSON object. Observation write times are kept beside
+  it, out of that view (see recall).
+- RelationIndex stores each relation as one int packing the three
+  symbol ids, with adjacency lists per endpoint id; relation dicts are
+  built only when read. The rare relation with other keys keeps them
+  in a side table, so they round-trip like Entity.extra.
+
+Symbols are never freed while the graph is loaded; deleted names keep
+their id until the next load.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+_BITS = 32
+_MASK = (1 << _BITS) - 1
+
+# Adjacency lists longer than this become dicts, so removal stays O(1) on hubs
+_LIST_MAX = 32
+_Adjacency = dict[int, "list[int] | dict[int, None]"]
+
+_ENTITY_KEYS = ("name", "entityType", "observations")
+_RELATION_KEYS = ("from", "to", "relationType")
+
+# JSONL key holding observation write times, parallel to "observations"
+OBSERVED_AT = "observedAt"
+
+
+class SymbolTable:
+    """Interned strings with dense integer ids."""
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getitem__(self, symbol: int) -> str:
+        return self._strings[symbol]
+
+    def id(self, text: str) -> int:
+        """The id of ``text``, assigning the next one if it is new."""
+        symbol = self._ids.get(text)
+        if symbol is None:
+            if len(self._strings) > _MASK:
+                msg = "symbol table is full"
+                raise OverflowError(msg)
+            symbol = self._ids[text] = len(self._strings)
+            self._strings.append(text)
+        return symbol
+
+    def ids(self, texts: Sequence[str]) -> list[int]:
+        """id() of each of ``texts``, interning the new ones in bulk."""
+        known, strings = self._ids, self._strings
+        new = [text for text in dict.fromkeys(texts) if text not in known]
+        if len(strings) + len(new) > _MASK + 1:
+            msg = "symbol table is full"
+            raise OverflowError(msg)
+        known.update(zip(new, range(len(strings), len(strings) + len(new)), strict=True))
+        strings.extend(new)
+        return list(map(known.__getitem__, texts))
+
+    def texts(self, symbols: Iterable[int]) -> list[str]:
+        """The string of each of ``symbols``."""
+        return list(map(self._strings.__getitem__, symbols))
+
+    def find(self, text: str) -> int | None:
+        """The id of ``text``, or None if it was never interned."""
+        return self._ids.get(text)
+
+    def intern(self, text: str) -> str:
+        """The one shared instance of ``text``."""
+        return self._strings[self.id(text)]
+
+
+class LoadedTimes:
+    """Observation write times of a bulk load, in column form.
+
+    Entity ``i`` owns ``observations[ends[i - 1]:ends[i]]`` and the same
+    span of ``times`` (NaN where unknown). Entities hold this and their
+    index until observed_at is first used, so loading costs nothing per
+    entity for times nobody reads, and edits to an entity's own list
+    cannot unpair them.
+    """
+
+    __slots__ = ("ends", "observations", "times")
+
+    def __init__(self, observations: Sequence[str], times: Sequence[float], ends: Sequence[int]) -> None:
+        self.observations = observations
+        self.times = times
+        self.ends = ends
+
+    def stamps(self, index: int) -> dict[str, float]:
+        """The known write times of entity ``index``'s observations."""
+        start, end = self.ends[index - 1] if index else 0, self.ends[index]
+        pairs = zip(self.observations[start:end], self.times[start:end], strict=True)
+        # NaN (unknown write time) is the only value unequal to itself
+        return {observation: at for observation, at in pairs if at == at}
+
+
+class Entity(Mapping[str, Any]):
+    """Slotted entity record with a read-mostly dict interface.
+
+    Keys other than name, entityType and observations (from hand-edited
+    or newer JSONL files) are kept in ``extra`` so they round-trip.
+    ``observed_at`` maps observations to their write time in epoch
+    seconds; observations written before times were recorded have none.
+    It is not part of the dict view, and to_dict() writes it as an
+    ``observedAt`` list parallel to ``observations``. Times loaded in bulk
+    (see defer_times()) become that mapping on first use.
+    """
+
+    __slots__ = ("name", "entity_type", "observations", "extra", "_observed_at", "_loaded", "_loaded_index")
+
+    def __init__(
+        self,
+        name: str,
+        entity_type: str,
+        observations: list[str],
+        extra: dict[str, Any] | None = None,
+        observed_at: dict[str, float] | None = None,
+    ) -> None:
+        self.name = name
+        self.entity_type = entity_type
+        self.observations = observations
+        self.extra = extra
+        self._observed_at = observed_at
+        self._loaded: LoadedTimes | None = None
+        self._loaded_index = 0
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, Any], symbols: SymbolTable, observations: list[str]) -> Entity:
+        """An entity for a decoded JSONL record, its strings interned."""
+        extra = None
+        if len(record) > 3 or not all(key in _ENTITY_KEYS for key in record):
+            extra = {key: value for key, value in record.items() if key not in _ENTITY_KEYS and key != OBSERVED_AT}
+        entity = cls(
+            symbols.intern(record["name"]), symbols.intern(record.get("entityType", "")), observations, extra or None
+        )
+        times = record.get(OBSERVED_AT)
+        if isinstance(times, list):
+            entity.stamp_each(record.get("observations", []), times)
+        return entity
+
+    @property
+    def observed_at(self) -> dict[str, float] | None:
+        loaded = self._loaded
+        if loaded is not None:
+            stamps = loaded.stamps(self._loaded_index)
+            if stamps:
+                self._observed_at = {**stamps, **(self._observed_at or {})}
+            self._loaded = None  # Only after the merge, so a concurrent reader never sees neither
+        return self._observed_at
+
+    @observed_at.setter
+    def observed_at(self, value: dict[str, float] | None) -> None:
+        self._loaded = None
+        self._observed_at = value
+
+    def defer_times(self, loaded: LoadedTimes, index: int) -> None:
+        """Take the write times of entity ``index`` of a bulk load on first use of observed_at."""
+        self._loaded = loaded
+        self._loaded_index = index
+
+    def stamp(self, observations: Iterable[str], at: float) -> None:
+        """Record ``at`` as the write time of ``observations``."""
+        observed_at = self.observed_at
+        if observed_at is None:
+            observed_at = self._observed_at = {}
+        observed_at.update(dict.fromkeys(observations, at))
+
+    def stamp_each(self, observations: Iterable[str], times: Iterable[Any]) -> None:
+        """Record loaded write times, pairwise; observations that already have one keep it."""
+        observed_at = self.observed_at
+        for observation, at in zip(observations, times, strict=False):
+            if isinstance(at, int | float) and not isinstance(at, bool):
+                if observed_at is None:
+                    observed_at = self._observed_at = {}
+                observed_at.setdefault(observation, float(at))
+
+    def stamps(self) -> Iterator[tuple[str, float]]:
+        """(observation, write time) for each current observation that has one."""
+        observed_at = self.observed_at
+        if observed_at:
+            for observation in self.observations:
+                at = observed_at.get(observation)
+                if at is not None:
+                    yield observation, at
+
+    def latest(self, since: float | None = None, until: float | None = None) -> float | None:
+        """Newest write time of a current observation within [since, until]; None if there is none."""
+        newest = None
+        for _, at in self.stamps():
+            if (since is None or at >= since) and (until is None or at <= until) and (newest is None or at > newest):
+                newest = at
+        return newest
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "name":
+            return self.name
+        if key == "entityType":
+            return self.entity_type
+        if key == "observations":
+            return self.observations
+        if self.extra is not None:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "name":
+            self.name = value
+        elif key == "entityType":
+            self.entity_type = value
+        elif key == "observations":
+            self.observations = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _ENTITY_KEYS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return 3 + len(self.extra or ())
+
+    def to_dict(self) -> dict[str, Any]:
+        record = {"name": self.name, "entityType": self.entity_type, "observations": self.observations}
+        observed_at = self.observed_at
+        if observed_at:
+            times = [observed_at.get(o) for o in self.observations]
+            if any(at is not None for at in times):
+                record[OBSERVED_AT] = times
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def __repr__(self) -> str:
+        return f"Entity({self.to_dict()!r})"
+
+
+class RelationIndex:
+    """Insertion-ordered set of (from, to, relationType) triples.
+
+    Each relation is a single int packing three symbol ids, so an edge
+    costs one small int plus its slots in the ordered set and in the two
+    endpoint adjacency lists, and endpoint names are shared with the
+    entities they refer to. Keys beyond the triple live in ``_extra``.
+    The adjacency lists are built from the set on first use, so a bulk
+    load only pays for them once something traverses the graph.
+    """
+
+    def __init__(self, symbols: SymbolTable) -> None:
+        self._symbols = symbols
+        self._keys: dict[int, None] = {}
+        self._extra: dict[int, dict[str, Any]] = {}
+        # (outgoing, incoming) endpoint id → keys; None until _adjacency() builds it
+        self._edges: tuple[_Adjacency, _Adjacency] | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+    def __contains__(self, triple: object) -> bool:
+        return isinstance(triple, tuple) and self._find(*triple) in self._keys
+
+    def add(self, from_entity: str, to_entity: str, relation_type: str, extra: dict[str, Any] | None = None) -> bool:
+        """Index a relation, with any keys beyond the triple. False if the exact triple already exists."""
+        symbols = self._symbols
+        source, target = symbols.id(from_entity), symbols.id(to_entity)
+        key = (source << _BITS | target) << _BITS | symbols.id(relation_type)
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if extra:
+            self._extra[key] = extra
+        edges = self._edges
+        if edges is not None:
+            _attach(edges[0], source, key)
+            _attach(edges[1], target, key)
+        return True
+
+    def discard(self, from_entity: str, to_entity: str, relation_type: str) -> bool:
+        """Remove a relation. False if it was not present."""
+        key = self._find(from_entity, to_entity, relation_type)
+        if key is None or key not in self._keys:
+            return False
+        del self._keys[key]
+        self._extra.pop(key, None)
+        edges = self._edges
+        if edges is not None:
+            _detach(edges[0], key >> 2 * _BITS, key)
+            _detach(edges[1], key >> _BITS & _MASK, key)
+        return True
+
+    def extend_symbols(
+        self, triples: Iterable[tuple[int, int, int]], extras: Mapping[int, dict[str, Any]] | None = None
+    ) -> None:
+        """add() each (from, to, relationType) triple of symbol ids, skipping duplicates.
+
+        ``extras`` maps a triple's position to its keys beyond the triple.
+        For bulk loads (e.g. a decoded snapshot) whose strings are interned.
+        """
+        keys = self._keys
+        packed = [(source << _BITS | target) << _BITS | kind for source, target, kind in triples]
+        if extras:
+            for position, extra in extras.items():
+                if extra and packed[position] not in keys:
+                    self._extra.setdefault(packed[position], extra)
+        keys.update(dict.fromkeys(packed))  # Existing keys keep their place
+        self._edges = None
+
+    def add_record(self, record: Mapping[str, Any]) -> bool:
+        """add() for a relation record (e.g. decoded JSONL)."""
+        extra = None
+        if len(record) > 3:
+            extra = {key: value for key, value in record.items() if key not in _RELATION_KEYS}
+        return self.add(record["from"], record["to"], record["relationType"], extra)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._extra.clear()
+        self._edges = None
+
+    def keys(self) -> Iterator[tuple[str, str, str]]:
+        """Every triple in insertion order."""
+        return map(self._unpack, self._keys)
+
+    def values(self) -> Iterator[dict[str, Any]]:
+        """Every relation record in insertion order, built on demand."""
+        return map(self._record, self._keys)
+
+    def outgoing(self, name: str) -> list[tuple[str, str, str]]:
+        return self._adjacent(self._adjacency()[0], name)
+
+    def incoming(self, name: str) -> list[tuple[str, str, str]]:
+        return self._adjacent(self._adjacency()[1], name)
+
+    def has_outgoing(self, name: str) -> bool:
+        symbol = self._symbols.find(name)
+        return symbol is not None and symbol in self._adjacency()[0]
+
+    def sources(self) -> Iterator[str]:
+        """Names with at least one outgoing relation."""
+        return map(self._symbols.__getitem__, self._adjacency()[0])
+
+    def record(self, triple: tuple[str, str, str]) -> dict[str, Any]:
+        """The relation record for a triple, with its extra keys."""
+        from_entity, to_entity, relation_type = triple
+        record = {"from": from_entity, "to": to_entity, "relationType": relation_type}
+        if self._extra:
+            key = self._find(*triple)
+            extra = self._extra.get(key) if key is not None else None
+            if extra:
+                record.update(extra)
+        return record
+
+    def _find(self, from_entity: str, to_entity: str, relation_type: str) -> int | None:
+        symbols = self._symbols
+        source, target, kind = symbols.find(from_entity), symbols.find(to_entity), symbols.find(relation_type)
+        if source is None or target is None or kind is None:
+            return None
+        return (source << _BITS | target) << _BITS | kind
+
+    def _adjacency(self) -> tuple[_Adjacency, _Adjacency]:
+        edges = self._edges
+        if edges is None:
+            out: _Adjacency = {}
+            incoming: _Adjacency = {}
+            for key in self._keys:
+                _attach(out, key >> 2 * _BITS, key)
+                _attach(incoming, key >> _BITS & _MASK, key)
+            # Published whole, so concurrent readers see both lists or neither
+            edges = self._edges = (out, incoming)
+        return edges
+
+    def _adjacent(self, adjacency: _Adjacency, name: str) -> list[tuple[str, str, str]]:
+        symbol = self._symbols.find(name)
+        edges = adjacency.get(symbol) if symbol is not None else None
+        return [self._unpack(key) for key in edges] if edges else []
+
+    def _unpack(self, key: int) -> tuple[str, str, str]:
+        symbols = self._symbols
+        return symbols[key >> 2 * _BITS], symbols[key >> _BITS & _MASK], symbols[key & _MASK]
+
+    def _record(self, key: int) -> dict[str, Any]:
+        symbols = self._symbols
+        record = {
+            "from": symbols[key >> 2 * _BITS],
+            "to": symbols[key >> _BITS & _MASK],
+            "relationType": symbols[key & _MASK],
+        }
+        extra = self._extra.get(key)
+        if extra:
+            record.update(extra)
+        return record
+
+
+def _attach(adjacency: _Adjacency, node: int, key: int) -> None:
+    edges = adjacency.get(node)
+    if edges is None:
+        adjacency[node] = [key]
+    elif isinstance(edges, list):
+        edges.append(key)
+        if len(edges) > _LIST_MAX:
+            adjacency[node] = dict.fromkeys(edges)
+    else:
+        edges[key] = None
+
+
+def _detach(adjacency: _Adjacency, node: int, key: int) -> None:
+    edges = adjacency[node]
+    if isinstance(edges, list):
+        edges.remove(key)
+    else:
+        del edges[key]
+    if not edges:
+        del adjacency[node]
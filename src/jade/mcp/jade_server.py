@@ -2,28 +2,145 @@
 
 Provides domain-specific tools: record_decision, recall_context,
 update_hot_memory, log_insight.
+
+record_decision and log_insight are idempotent: entities are upserted by
+name, observations merged and relations deduplicated, so a retried call
+changes nothing (and writes no op).
+
+recall_context ranks matches by relevance and recency and returns a
+capped list, optionally filtered by entity type and write time (see
+recall). Given an EmbeddingPipeline and a ColdMemoryClient it is hybrid:
+the lexical graph recall and a vector search of cold memory run
+concurrently, and their rankings are merged by reciprocal rank fusion,
+so paraphrases are found in one call and latency is that of the slower
+lookup. Vector hits obey the same filters (a time range keeps only hits
+that are graph entities written to within it). Hybrid responses are not
+cached, since cold memory changes without the graph noticing.
+
+Given a HotMemoryClient, update_hot_memory writes through to Redis: the
+summary goes into the session state (as the Session entity promotion
+reads) and the active threads replace the session's ``activeThreads``
+working memory, then the tool returns. The graph is updated afterwards
+by a background writer, in call order. Updates to one session run one
+at a time, since each reads, merges and rewrites its state; different
+sessions proceed concurrently. A failed graph write is listed
+under ``graphWriteErrors`` in the next update_hot_memory response (the
+call itself still goes through), or raised when the server stops. With an
+AsyncHotMemoryClient the Redis writes are awaited, so the event loop
+keeps serving other sessions during the round trips.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import weakref
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
 
 from mcp.server.fastmcp import FastMCP
 
-from jade.mcp.memory_server import KnowledgeGraph
+from jade import codec
+from jade.mcp.memory_server import Durability, KnowledgeGraph, graph_lifespan, in_thread, load_graph
+from jade.mcp.recall import DEFAULT_LIMIT, check_recall_args, fuse, parse_time
+from jade.mcp.response_cache import ResponseCache, freeze
+from jade.memory.hot import AsyncHotMemoryClient
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from jade.mcp.sqlite_store import SqliteKnowledgeGraph
+    from jade.memory.cold import ColdMemoryClient
+    from jade.memory.embeddings import EmbeddingPipeline
+    from jade.memory.hot import HotMemoryClient
+
+# Working memory namespace update_hot_memory keeps the active threads in
+ACTIVE_THREADS = "activeThreads"
+
+# Vector hits fetched per requested entity when filters may discard some
+_FILTERED_OVERFETCH = 4
+
+
+def insight_name(insight: str) -> str:
+    """Entity name for an insight: a slug of its first five words plus a hash of the whole text.
+
+    Logging the same insight again maps to the same entity, while insights
+    that merely start alike get distinct ones.
+    """
+    words = insight.split()
+    slug = "-".join(filter(None, (w.lower().strip(".,!?") for w in words[:5])))
+    digest = hashlib.sha256(" ".join(words).encode("utf-8", "surrogatepass")).hexdigest()[:8]
+    return f"{slug}-{digest}" if slug else digest
 
 
 def create_jade_server(
     memory_file_path: str = "./memory.jsonl",
-    graph: KnowledgeGraph | None = None,
+    graph: KnowledgeGraph | SqliteKnowledgeGraph | None = None,
+    *,
+    wal: bool = False,
+    durability: Durability = Durability.IMMEDIATE,
+    response_cache_size: int = 128,
+    hot_memory: HotMemoryClient | AsyncHotMemoryClient | None = None,
+    embeddings: EmbeddingPipeline | None = None,
+    cold_memory: ColdMemoryClient | None = None,
 ) -> FastMCP:
-    """Create a Jade-specific MCP server with domain tools."""
-    mcp = FastMCP("jade-tools")
+    """Create a Jade-specific MCP server with domain tools.
+
+    recall_context reuses up to ``response_cache_size`` encoded responses
+    while the graph is unchanged (see response_cache); 0 disables the cache.
+    With ``hot_memory``, update_hot_memory writes to Redis first and
+    updates the graph in the background; with ``embeddings`` and
+    ``cold_memory`` (both or neither), recall_context is hybrid (see
+    module docstring).
+    """
+    if (embeddings is None) != (cold_memory is None):
+        msg = "embeddings and cold_memory must be given together"
+        raise ValueError(msg)
     if graph is None:
-        graph = KnowledgeGraph(file_path=memory_file_path)
-        graph.load()
+        graph = load_graph(memory_file_path, wal=wal, durability=durability)
+    graph_writes = None
+    if hot_memory is not None:
+        graph_writes = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jade-hot-graph")
+    queued: deque[tuple[str, Future[None]]] = deque()
+    # One lock per session with an update in flight; dropped once no call holds it
+    session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    def failed_graph_writes() -> list[str]:
+        """Forget finished background graph writes, describing those that failed."""
+        failures = []
+        while queued and queued[0][1].done():
+            session_id, write = queued.popleft()
+            error = write.exception()
+            if error is not None:
+                failures.append(f"{session_id}: {error}")
+        return failures
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+        async with graph_lifespan(graph)(server):
+            try:
+                yield
+            finally:
+                if graph_writes is not None:
+                    await asyncio.to_thread(graph_writes.shutdown)
+                    failures = failed_graph_writes()
+                    if failures:
+                        msg = f"background graph writes failed: {'; '.join(failures)}"
+                        raise RuntimeError(msg)
+
+    mcp = FastMCP("jade-tools", lifespan=lifespan)
+    responses = ResponseCache(response_cache_size)
+
+    def upsert(name: str, entity_type: str, observations: list[str]) -> None:
+        """Upsert unless the entity already has every observation, so retries write nothing."""
+        existing = graph.find_entity(name)
+        if existing is None or any(o not in existing["observations"] for o in observations):
+            graph.upsert_entity(name, entity_type, observations)
 
     @mcp.tool()
+    @in_thread
     def record_decision(
         decisionName: str,  # noqa: N803
         rationale: str,
@@ -35,55 +152,25 @@ def create_jade_server(
             msg = "decisionName must be a non-empty string"
             raise ValueError(msg)
 
-        # Create decision entity
-        graph.entities.append(
-            {
-                "name": decisionName,
-                "entityType": "Decision",
-                "observations": [rationale],
-            }
-        )
+        with graph.transaction():
+            # Create decision entity (a repeated name merges its rationale, as load() would)
+            upsert(decisionName, "Decision", [rationale])
 
-        # Create person entity if not exists (skip empty names)
-        if decidedBy and decidedBy.strip() and not graph.find_entity(decidedBy):
-            graph.entities.append(
-                {
-                    "name": decidedBy,
-                    "entityType": "Person",
-                    "observations": [],
-                }
-            )
-
-        # Create session entity if not exists (skip empty names)
-        if sessionId and sessionId.strip() and not graph.find_entity(sessionId):
-            graph.entities.append(
-                {
-                    "name": sessionId,
-                    "entityType": "Session",
-                    "observations": [],
-                }
-            )
-
-        # Create relations (skip if endpoint is empty)
-        if decidedBy and decidedBy.strip():
-            graph.relations.append(
-                {
-                    "from": decidedBy,
-                    "to": decisionName,
-                    "relationType": "made_decision",
-                }
-            )
-        if sessionId and sessionId.strip():
-            graph.relations.append(
-                {
-                    "from": decisionName,
-                    "to": sessionId,
-                    "relationType": "participated_in",
-                }
-            )
+            # Create person entity if not exists (skip empty names)
+            if decidedBy and decidedBy.strip():
+                upsert(decidedBy, "Person", [])
 
-        graph.save()
-        return json.dumps(
+            # Create session entity if not exists (skip empty names)
+            if sessionId and sessionId.strip():
+                upsert(sessionId, "Session", [])
+
+            # Create relations (skip if endpoint is empty); duplicates are rejected
+            if decidedBy and decidedBy.strip():
+                graph.create_relation(decidedBy, decisionName, "made_decision")
+            if sessionId and sessionId.strip():
+                graph.create_relation(decisionName, sessionId, "participated_in")
+
+        return codec.dumps(
             {
                 "status": "recorded",
                 "decision": decisionName,
@@ -93,89 +180,113 @@ def create_jade_server(
         )
 
     @mcp.tool()
-    def recall_context(query: str) -> str:
-        """Search the knowledge graph by session, date, or topic."""
-        query_lower = query.lower()
-        matches = []
-        for e in graph.entities:
-            if (
-                query_lower in e["name"].lower()
-                or query_lower in e.get("entityType", "").lower()
-                or any(query_lower in obs.lower() for obs in e.get("observations", []))
-            ):
-                matches.append(e)
-        related = [r for r in graph.relations if any(r["from"] == m["name"] or r["to"] == m["name"] for m in matches)]
-        return json.dumps({"entities": matches, "relations": related})
+    async def recall_context(
+        query: str,
+        limit: int | None = None,
+        entityTypes: list[str] | None = None,  # noqa: N803
+        since: str | None = None,
+        until: str | None = None,
+    ) -> str:
+        """Search the knowledge graph by session, date, or topic, most relevant and recent first.
+
+        Returns up to ``limit`` entities (default 20) with their relations.
+        ``entityTypes`` keeps only those types; ``since`` / ``until`` (ISO
+        8601 dates or datetimes, inclusive) keep only entities with an
+        observation written in that range.
+        """
+        start = parse_time(since, "since")
+        end = parse_time(until, "until", end_of_day=True)
+        count = DEFAULT_LIMIT if limit is None else limit
+        check_recall_args(count, start, end)
+        types = entityTypes or None  # [] means no filter, as in the read tools
+
+        if embeddings is None or cold_memory is None or not query.strip():
+
+            def encode() -> str:
+                matches = graph.recall(query, count, types, start, end)
+                related = graph.relations_of(m["name"] for m in matches)
+                return codec.dumps({"entities": matches, "relations": related})
+
+            def cached() -> str:
+                key = ("recall_context", query, limit, freeze(types), start, end)
+                with graph.reading():
+                    return responses.get_or_encode(graph.generation, key, encode)
+
+            return await asyncio.to_thread(cached)
+
+        lexical, vector = await asyncio.gather(
+            asyncio.to_thread(graph.recall, query, count, types, start, end),
+            asyncio.to_thread(similar_entities, graph, embeddings, cold_memory, query, count, types, start, end),
+        )
+        names = fuse(([e["name"] for e in lexical], [e["name"] for e in vector]), count)
+
+        def encode() -> str:
+            # Graph entities are live records the background writer may be changing
+            with graph.reading():
+                found = {entity["name"]: entity for entity in (*vector, *lexical)}
+                return codec.dumps(
+                    {"entities": [found[name] for name in names], "relations": graph.relations_of(names)}
+                )
+
+        return await asyncio.to_thread(encode)
+
+    def write_summary(session_id: str, summary: str, threads: list[str]) -> None:
+        with graph.writing():
+            # Create or update session entity
+            graph.upsert_entity(session_id, "Session", [summary])
+
+            # Record active threads as observations
+            if threads:
+                graph.add_observations(session_id, [f"Active thread: {thread}" for thread in threads])
+
+        graph.save()
 
     @mcp.tool()
-    def update_hot_memory(
+    async def update_hot_memory(
         sessionId: str,  # noqa: N803
         summary: str,
         activeThreads: list[str] | None = None,  # noqa: N803
     ) -> str:
-        """Write a session summary to the knowledge graph as hot memory."""
-        # Create or update session entity
-        session = graph.find_entity(sessionId)
-        if session:
-            merged = session.get("observations", []) + [summary]
-            session["observations"] = list(dict.fromkeys(merged))
+        """Write a session summary to hot memory and the knowledge graph."""
+        threads = activeThreads or []
+        failures: list[str] = []
+        if hot_memory is None or graph_writes is None:
+            await asyncio.to_thread(write_summary, sessionId, summary, threads)
         else:
-            graph.entities.append(
-                {
-                    "name": sessionId,
-                    "entityType": "Session",
-                    "observations": [summary],
-                }
-            )
-
-        # Record active threads as observations
-        if activeThreads:
-            session = graph.find_entity(sessionId)
-            if session:
-                for thread in activeThreads:
-                    if thread not in session.get("observations", []):
-                        session["observations"].append(f"Active thread: {thread}")
-
-        graph.save()
-        return json.dumps(
-            {
-                "status": "updated",
-                "session": sessionId,
-                "summaryLength": len(summary),
-                "activeThreads": activeThreads or [],
-            }
-        )
+            failures = failed_graph_writes()
+            async with session_locks.setdefault(sessionId, asyncio.Lock()):
+                if isinstance(hot_memory, AsyncHotMemoryClient):
+                    await write_hot_session_async(hot_memory, sessionId, summary, threads)
+                else:
+                    await asyncio.to_thread(write_hot_session, hot_memory, sessionId, summary, threads)
+                queued.append((sessionId, graph_writes.submit(write_summary, sessionId, summary, threads)))
+        result: dict[str, Any] = {
+            "status": "updated",
+            "session": sessionId,
+            "summaryLength": len(summary),
+            "activeThreads": activeThreads or [],
+        }
+        if failures:
+            result["graphWriteErrors"] = failures
+        return codec.dumps(result)
 
     @mcp.tool()
+    @in_thread
     def log_insight(
         insight: str,
         category: str = "Concept",
         sessionId: str = "",  # noqa: N803
     ) -> str:
         """Record an observation or learning as a concept entity."""
-        # Create a name from the insight (slug-ify first few words)
-        words = insight.split()[:5]
-        name = "-".join(w.lower().strip(".,!?") for w in words)
+        name = insight_name(insight)
 
-        graph.entities.append(
-            {
-                "name": name,
-                "entityType": category,
-                "observations": [insight],
-            }
-        )
+        with graph.transaction():
+            upsert(name, category, [insight])
 
-        if sessionId:
-            graph.relations.append(
-                {
-                    "from": name,
-                    "to": sessionId,
-                    "relationType": "participated_in",
-                }
-            )
+            if sessionId:
+                graph.create_relation(name, sessionId, "participated_in")
 
-        graph.save()
-        return json.dumps(
+        return codec.dumps(
             {
                 "status": "logged",
                 "name": name,
@@ -185,3 +296,78 @@ def create_jade_server(
         )
 
     return mcp
+
+
+def write_hot_session(hot_memory: HotMemoryClient, session_id: str, summary: str, threads: list[str]) -> None:
+    """Record a session summary and its active threads in Redis.
+
+    The session's Session entity gets the same observations the graph
+    would, so promotion carries them to cold storage.
+    """
+    session = merge_hot_session(hot_memory.read_session(session_id), session_id, summary, threads)
+    hot_memory.write_session(session_id, session)
+    hot_memory.replace_working_memory(session_id, ACTIVE_THREADS, threads)
+
+
+async def write_hot_session_async(
+    hot_memory: AsyncHotMemoryClient, session_id: str, summary: str, threads: list[str]
+) -> None:
+    """write_hot_session on an AsyncHotMemoryClient; the two writes go out together."""
+    session = merge_hot_session(await hot_memory.read_session(session_id), session_id, summary, threads)
+    await asyncio.gather(
+        hot_memory.write_session(session_id, session),
+        hot_memory.replace_working_memory(session_id, ACTIVE_THREADS, threads),
+    )
+
+
+def merge_hot_session(
+    session: dict[str, Any] | None, session_id: str, summary: str, threads: list[str]
+) -> dict[str, Any]:
+    """Session state with the summary and threads added to its Session entity."""
+    observations = [summary, *(f"Active thread: {thread}" for thread in threads)]
+    session = session or {}
+    entities = [e for e in session.get("entities", []) if e.get("name") != session_id]
+    previous = next((e for e in session.get("entities", []) if e.get("name") == session_id), None)
+    if previous is not None:
+        known = previous.get("observations", [])
+        observations = [*known, *(o for o in observations if o not in known)]
+    entities.append({"name": session_id, "entityType": "Session", "observations": observations})
+    session.update(summary=summary, activeThreads=threads, entities=entities)
+    return session
+
+
+def similar_entities(
+    graph: KnowledgeGraph | SqliteKnowledgeGraph,
+    embeddings: EmbeddingPipeline,
+    cold_memory: ColdMemoryClient,
+    query: str,
+    limit: int,
+    entity_types: list[str] | None = None,
+    since: float | None = None,
+    until: float | None = None,
+) -> list[Any]:
+    """Cold memory entities nearest to ``query`` by embedding, best first, in graph entity shape.
+
+    Entities also in the graph are returned as the graph has them. A time
+    range keeps only graph entities with an observation written in it.
+    """
+    filtered = entity_types is not None or since is not None or until is not None
+    hits = cold_memory.semantic_search(embeddings.embed(query), limit * _FILTERED_OVERFETCH if filtered else limit)
+    in_range = None
+    if since is not None or until is not None:
+        in_range = {entity["name"] for entity in graph.recall("", None, entity_types, since, until)}
+    similar: list[Any] = []
+    for hit in hits:
+        entity = graph.find_entity(hit["name"]) or {
+            "name": hit["name"],
+            "entityType": hit.get("entity_type", "Concept"),
+            "observations": hit.get("observations", []),
+        }
+        if entity_types is not None and entity["entityType"] not in entity_types:
+            continue
+        if in_range is not None and entity["name"] not in in_range:
+            continue
+        similar.append(entity)
+        if len(similar) == limit:
+            break
+    return similar
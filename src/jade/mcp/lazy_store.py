@@ -0,0 +1,248 @@
+"""Lazily decoded entity storage for very large knowledge graphs.
+
+LazyEntityStore is a drop-in for KnowledgeGraph's name → entity dict. At
+load time it only records where each entity lives in a memory-mapped
+source (a binary snapshot or the JSONL file itself); the entity, with its
+observations, is decoded on first access and kept in a bounded LRU. Only
+names, locators and relations stay resident, so memory no longer grows
+with observation volume.
+
+Entities that are mutated are pinned: pin() moves them out of the LRU so
+an edit can never be evicted. Entities assigned directly (new ones) are
+resident too.
+
+KnowledgeGraph(lazy=True) loads into this store, with an LRU of
+``lazy_cache_size`` entries, from the binary snapshot or else the JSONL
+file. Building the search index decodes every entity once, and the index
+then holds the searchable text.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Protocol
+
+from jade import codec
+from jade.mcp.compact import OBSERVED_AT
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from jade.mcp.snapshot import MappedSnapshot
+
+# Fast path for the line layout export_jsonl writes; anything else is parsed fully
+_ENTITY_LINE = re.compile(rb'\{"name": ?("(?:[^"\\]|\\.)*"), ?"entityType": ?')
+_ENTITY_TAIL = re.compile(rb', ?"type": ?"entity"\}$')
+
+
+class EntitySource(Protocol):
+    """Where lazily loaded entities are decoded from."""
+
+    def decode(self, locator: Any) -> dict[str, Any]: ...
+
+    def close(self) -> None: ...
+
+
+class SnapshotSource:
+    """Decodes entity ``i`` of a memory-mapped binary snapshot."""
+
+    def __init__(self, snapshot: MappedSnapshot) -> None:
+        self._snapshot = snapshot
+
+    def decode(self, locator: int) -> dict[str, Any]:
+        record = {
+            "name": self._snapshot.names[locator],
+            "entityType": self._snapshot.entity_types[locator],
+            "observations": self._snapshot.observations(locator),
+        }
+        times = self._snapshot.observed_at(locator)
+        if times is not None:
+            record[OBSERVED_AT] = times
+        extra = self._snapshot.extra(locator)
+        if extra:
+            record.update(extra)
+        return record
+
+    def close(self) -> None:
+        self._snapshot.close()
+
+
+class JsonlSource:
+    """Decodes entities from byte ranges of a memory-mapped JSONL file."""
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        self._map = mapped
+
+    @classmethod
+    def scan(cls, path: str) -> tuple[JsonlSource | None, dict[str, tuple[int, ...]], list[dict[str, Any]]]:
+        """Map ``path`` and index it: entity name → line spans, plus all relations.
+
+        Entity lines in export_jsonl's layout are indexed from their prefix
+        alone; other lines are parsed. A name on several lines gets every
+        span, merged on decode like a full load would. Corrupt lines are
+        skipped.
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None, {}, []  # Missing or empty file
+
+        spans: dict[str, tuple[int, ...]] = {}
+        relations: list[dict[str, Any]] = []
+        start = 0
+        for line in iter(mapped.readline, b""):
+            end = start + len(line.rstrip())
+            match = _ENTITY_LINE.match(line)
+            if match and _ENTITY_TAIL.search(line.rstrip()):
+                raw = match.group(1)
+                name = codec.loads(raw) if b"\\" in raw else raw[1:-1].decode("utf-8")
+                spans[name] = (*spans.get(name, ()), start, end)
+            elif line.strip():
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    record = None  # Skip corrupt lines, keep loading valid ones
+                if isinstance(record, dict):
+                    kind = record.pop("type", None)
+                    if kind == "entity" and "name" in record:
+                        spans[record["name"]] = (*spans.get(record["name"], ()), start, end)
+                    elif kind == "relation":
+                        relations.append(record)
+            start += len(line)
+        return cls(mapped), spans, relations
+
+    def decode(self, locator: tuple[int, ...]) -> dict[str, Any]:
+        entity: dict[str, Any] | None = None
+        for i in range(0, len(locator), 2):
+            record = codec.loads(self._map[locator[i] : locator[i + 1]])
+            record.pop("type", None)
+            if entity is None:
+                entity = record
+                entity["observations"] = list(record.get("observations", []))
+            else:
+                entity["observations"].extend(record.get("observations", []))
+        if entity is None:
+            msg = "entity locator has no spans"
+            raise ValueError(msg)
+        return entity
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class LazyEntityStore(MutableMapping[str, dict[str, Any]]):
+    """Insertion-ordered name → entity mapping that decodes entities on demand.
+
+    Each slot holds either a resident entity dict or a source locator.
+    Decoded entities go through ``wrap`` (e.g. to build an ObservationList)
+    and into an LRU of ``cache_size`` entries. values() streams entities
+    without disturbing the LRU, so exports and index builds stay bounded.
+    Lookups are safe from concurrent readers; slot changes (assignment,
+    deletion, pin) need the caller's exclusive lock.
+    """
+
+    def __init__(
+        self,
+        source: EntitySource | None,
+        locators: dict[str, Any],
+        cache_size: int,
+        wrap: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> None:
+        if cache_size <= 0:
+            msg = "cache_size must be positive"
+            raise ValueError(msg)
+        self._source = source
+        self._slots: dict[str, Any] = locators
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_size = cache_size
+        self._wrap = wrap
+        self._pinned = 0
+        self.decodes = 0
+
+    @property
+    def resident(self) -> int:
+        """Entities currently held in memory (cached plus pinned)."""
+        return len(self._cache) + self._pinned
+
+    def __getitem__(self, name: str) -> dict[str, Any]:
+        slot = self._slots[name]
+        if isinstance(slot, Mapping):
+            return slot
+        with self._cache_lock:
+            entity = self._cache.get(name)
+            if entity is not None:
+                self._cache.move_to_end(name)
+                return entity
+        entity = self._decode(slot)
+        with self._cache_lock:
+            # A concurrent reader may have decoded it first; keep one copy
+            entity = self._cache.setdefault(name, entity)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entity
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self._slots:
+            return default
+        return self[name]
+
+    def pin(self, name: str) -> dict[str, Any] | None:
+        """The entity for ``name``, made resident so in-place edits are kept."""
+        slot = self._slots.get(name)
+        if slot is None or isinstance(slot, Mapping):
+            return slot
+        entity = self._cache.pop(name, None)
+        if entity is None:
+            entity = self._decode(slot)
+        self._slots[name] = entity
+        self._pinned += 1
+        return entity
+
+    def __setitem__(self, name: str, entity: dict[str, Any]) -> None:
+        if not isinstance(self._slots.get(name), Mapping):
+            self._pinned += 1
+        self._slots[name] = entity
+        self._cache.pop(name, None)
+
+    def __delitem__(self, name: str) -> None:
+        slot = self._slots.pop(name)
+        if isinstance(slot, Mapping):
+            self._pinned -= 1
+        self._cache.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def values(self) -> Iterator[dict[str, Any]]:  # type: ignore[override]
+        """Every entity in order; cold ones are decoded transiently, not cached."""
+        for name, slot in self._slots.items():
+            if isinstance(slot, Mapping):
+                yield slot
+            else:
+                cached = self._cache.get(name)
+                yield cached if cached is not None else self._decode(slot)
+
+    def close(self) -> None:
+        """Release the mapped source. Cold entities are unreadable afterwards."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def _decode(self, locator: Any) -> dict[str, Any]:
+        if self._source is None:
+            msg = "lazy entity store is closed"
+            raise ValueError(msg)
+        self.decodes += 1
+        return self._wrap(self._source.decode(locator))
@@ -1,199 +1,1730 @@
 """FastMCP knowledge graph memory server.
 
-Implements the 9-tool MCP memory protocol with JSONL file persistence.
+Implements the 9-tool MCP memory protocol, plus a bounded traverse tool,
+an atomic apply_mutations batch tool and a changes_since change feed,
+with JSONL file persistence.
 Based on @modelcontextprotocol/server-memory patterns.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import functools
+import gc
 import os
-from dataclasses import dataclass, field
-from typing import Any
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from itertools import dropwhile, islice
+from typing import TYPE_CHECKING, Any, SupportsIndex, TypeVar
 
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory file locks
+    fcntl = None  # type: ignore[assignment]
+
+from jade import codec
+from jade.mcp.changes import check_change_args
+from jade.mcp.compact import OBSERVED_AT, Entity, LoadedTimes, RelationIndex, SymbolTable
+from jade.mcp.lazy_store import JsonlSource, LazyEntityStore, SnapshotSource
+from jade.mcp.paging import Projection, check_page_args, decode_cursor, encode_page, project
+from jade.mcp.recall import DEFAULT_LIMIT, check_recall_args, now, rank
+from jade.mcp.response_cache import ResponseCache, freeze
+from jade.mcp.rwlock import ReadWriteLock
+from jade.mcp.search_index import SearchIndex
+from jade.mcp.shards import (
+    manifest_path,
+    pool_size,
+    read_manifest,
+    read_records,
+    read_shards,
+    shard_dir,
+    shard_of,
+    shard_path,
+    write_manifest,
+    write_shard,
+)
+from jade.mcp.snapshot import (
+    MappedSnapshot,
+    SnapshotColumns,
+    SnapshotError,
+    file_identity,
+    read_columns,
+    read_source,
+    snapshot_path,
+    write_snapshot,
+)
+from jade.mcp.sqlite_store import SQLITE_SUFFIXES, SqliteKnowledgeGraph
+from jade.mcp.time_index import TimeIndex
+from jade.mcp.traversal import Direction, breadth_first
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterable, Iterator
+    from contextlib import AbstractAsyncContextManager, AbstractContextManager
+
+_T = TypeVar("_T")
+
+# Never fold a delta log smaller than this into the snapshot via the ratio rule
+_MIN_COMPACT_BYTES = 64 * 1024
+
+# KnowledgeGraph tuning argument → (the mode it tunes, its default)
+_TUNING: dict[str, tuple[str, Any]] = {
+    "compact_bytes": ("wal=True", 4 * 1024 * 1024),
+    "compact_ratio": ("wal=True", 1.0),
+    "group_window_ms": ("durability=GROUP", 50),
+    "group_max_mutations": ("durability=GROUP", 100),
+    "flush_interval_ms": ("durability=INTERVAL", 1000),
+    "lazy_cache_size": ("lazy=True", 1024),
+    "watch_interval_ms": ("watch=True", 500),
+    "load_workers": ("shards", None),  # One per CPU
+}
+
+
+class Durability(StrEnum):
+    """When KnowledgeGraph.save() actually writes to disk."""
+
+    IMMEDIATE = "immediate"  # Every save() writes
+    GROUP = "group"  # Coalesce saves within a time window or mutation budget
+    INTERVAL = "interval"  # A background thread flushes on a fixed period
+
 
 @dataclass
+class FlushStats:
+    """How many mutations each flush to disk covered."""
+
+    flushes: int = 0
+    mutations: int = 0
+    last_batch: int = 0
+    max_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.mutations / self.flushes if self.flushes else 0.0
+
+    def record(self, batch: int) -> None:
+        self.flushes += 1
+        self.mutations += batch
+        self.last_batch = batch
+        self.max_batch = max(self.max_batch, batch)
+
+
+class ObservationList(list[str]):
+    """Insertion-ordered, duplicate-free observation list.
+
+    A side set makes membership and append O(1); merges cost O(k) in the
+    number of incoming observations instead of rebuilding the whole list.
+    The set is built on first use, so loading entities nobody touches
+    costs no hashing. Still a ``list``, so it serializes to the same JSONL
+    shape.
+    """
+
+    __slots__ = ("_seen",)
+
+    def __init__(self, observations: Iterable[str] = ()) -> None:
+        super().__init__(dict.fromkeys(observations))
+        self._seen: set[str] | None = None
+
+    @classmethod
+    def from_unique(cls, observations: list[str]) -> ObservationList:
+        """Build from a list already known to be duplicate-free (e.g. a snapshot)."""
+        result = cls.__new__(cls)
+        list.extend(result, observations)
+        result._seen = None
+        return result
+
+    @classmethod
+    def split_unique(cls, observations: list[str], ends: Iterable[int]) -> list[ObservationList]:
+        """from_unique() of each span ``observations[previous end:end]``, in one pass."""
+        new, extend = cls.__new__, list.extend
+        result = []
+        start = 0
+        for end in ends:
+            part = new(cls)
+            extend(part, observations[start:end])
+            part._seen = None
+            result.append(part)
+            start = end
+        return result
+
+    @property
+    def _members(self) -> set[str]:
+        if self._seen is None:
+            self._seen = set(self)
+        return self._seen
+
+    def __contains__(self, observation: object) -> bool:
+        return observation in self._members
+
+    def append(self, observation: str) -> None:
+        members = self._members
+        if observation not in members:
+            members.add(observation)
+            super().append(observation)
+
+    def extend(self, observations: Iterable[str]) -> None:
+        self.merge(observations)
+
+    def __iadd__(self, observations: Iterable[str]) -> ObservationList:  # type: ignore[override]
+        self.merge(observations)
+        return self
+
+    def merge(self, observations: Iterable[str]) -> list[str]:
+        """Append the observations not already present; return those added."""
+        members = self._members
+        added = []
+        for observation in observations:
+            if observation not in members:
+                members.add(observation)
+                added.append(observation)
+        super().extend(added)
+        return added
+
+    def discard(self, observations: Iterable[str]) -> list[str]:
+        """Remove the given observations if present; return those removed."""
+        to_remove = self._members.intersection(observations)
+        if not to_remove:
+            return []
+        removed = [o for o in self if o in to_remove]
+        self[:] = [o for o in self if o not in to_remove]
+        return removed
+
+    def remove(self, observation: str) -> None:
+        super().remove(observation)
+        self._members.discard(observation)
+
+    # Positional mutators are rare; resync the side set after them.
+
+    def insert(self, index: SupportsIndex, observation: str) -> None:
+        members = self._members
+        if observation not in members:
+            super().insert(index, observation)
+            members.add(observation)
+
+    def pop(self, index: SupportsIndex = -1) -> str:
+        observation = super().pop(index)
+        self._members.discard(observation)
+        return observation
+
+    def clear(self) -> None:
+        super().clear()
+        self._seen = None
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._resync()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._resync()
+
+    def _resync(self) -> None:
+        unique = list(dict.fromkeys(self))
+        if len(unique) != len(self):
+            super().__setitem__(slice(None), unique)
+        self._seen = None
+
+
+def _reads(method: Callable[..., _T]) -> Callable[..., _T]:  # noqa: UP047 - runs on 3.11 too
+    """Run a KnowledgeGraph method under the read side of its lock."""
+
+    @functools.wraps(method)
+    def locked(self: KnowledgeGraph, *args: Any, **kwargs: Any) -> _T:
+        with self._rw.read():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def _writes(method: Callable[..., _T]) -> Callable[..., _T]:  # noqa: UP047
+    """Run a KnowledgeGraph method under the write side of its lock."""
+
+    @functools.wraps(method)
+    def locked(self: KnowledgeGraph, *args: Any, **kwargs: Any) -> _T:
+        with self._rw.write():
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic GC while bulk-loading; the records it would scan are acyclic."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class KnowledgeGraph:
-    """In-memory knowledge graph with JSONL persistence."""
+    """In-memory knowledge graph with JSONL persistence.
+
+    Entities and relations are held in compact indexes (see compact) behind
+    a reader-writer lock (see rwlock). Storage modes are documented where
+    they live: ``wal`` and ``durability`` in save(), compaction in
+    compact(), ``watch`` in refresh(), ``binary_snapshot`` in snapshot,
+    ``lazy`` in lazy_store and ``shards`` in shards. Tuning arguments of a
+    mode that is off are rejected.
+    """
+
+    def __init__(
+        self,
+        entities: list[dict[str, Any]] | None = None,
+        relations: list[dict[str, Any]] | None = None,
+        file_path: str = "./memory.jsonl",
+        *,
+        wal: bool = False,
+        compact_bytes: int | None = None,
+        compact_ratio: float | None = None,
+        binary_snapshot: bool = False,
+        durability: Durability = Durability.IMMEDIATE,
+        group_window_ms: int | None = None,
+        group_max_mutations: int | None = None,
+        flush_interval_ms: int | None = None,
+        lazy: bool = False,
+        lazy_cache_size: int | None = None,
+        watch: bool = False,
+        watch_interval_ms: int | None = None,
+        shards: int = 0,
+        load_workers: int | None = None,
+        change_buffer: int = 10_000,
+    ) -> None:
+        durability = Durability(durability)
+        if any(value is not None and value <= 0 for value in (group_window_ms, group_max_mutations, flush_interval_ms)):
+            msg = "group_window_ms, group_max_mutations and flush_interval_ms must be positive"
+            raise ValueError(msg)
+        if any(value is not None and value <= 0 for value in (lazy_cache_size, watch_interval_ms)):
+            msg = "lazy_cache_size and watch_interval_ms must be positive"
+            raise ValueError(msg)
+        modes = {
+            "wal=True": wal,
+            "durability=GROUP": durability is Durability.GROUP,
+            "durability=INTERVAL": durability is Durability.INTERVAL,
+            "lazy=True": lazy,
+            "watch=True": watch,
+            "shards": bool(shards),
+        }
+        tuning = {
+            "compact_bytes": compact_bytes,
+            "compact_ratio": compact_ratio,
+            "group_window_ms": group_window_ms,
+            "group_max_mutations": group_max_mutations,
+            "flush_interval_ms": flush_interval_ms,
+            "lazy_cache_size": lazy_cache_size,
+            "watch_interval_ms": watch_interval_ms,
+            "load_workers": load_workers,
+        }
+        for name, value in tuning.items():
+            mode, default = _TUNING[name]
+            if value is not None and not modes[mode]:
+                msg = f"{name} only applies with {mode}"
+                raise ValueError(msg)
+            tuning[name] = default if value is None else value
+        if watch and not wal:
+            msg = "watch=True requires wal=True: only the append-only log can be tailed"
+            raise ValueError(msg)
+        if shards < 0 or (load_workers is not None and load_workers <= 0):
+            msg = "shards must be non-negative and load_workers positive"
+            raise ValueError(msg)
+        if shards and (lazy or binary_snapshot):
+            msg = "shards cannot be combined with lazy or binary_snapshot"
+            raise ValueError(msg)
+        if change_buffer <= 0:
+            msg = "change_buffer must be positive"
+            raise ValueError(msg)
+        self.shards = shards
+        self.load_workers: int | None = tuning["load_workers"]
+        self._shard_members: list[dict[str, None]] = [{} for _ in range(shards)]
+        self._dirty_shards: set[int] = set()
+        self._symbols = SymbolTable()
+        self._entities: dict[str, Entity] | LazyEntityStore = {}
+        for entity in entities or []:
+            self._index_entity(entity)
+        self._relations = RelationIndex(self._symbols)
+        for relation in relations or []:
+            self._link(relation)
+        self.file_path = file_path
+        self.wal = wal
+        self.compact_bytes: int = tuning["compact_bytes"]
+        self.compact_ratio: float = tuning["compact_ratio"]
+        self.binary_snapshot = binary_snapshot
+        self.lazy = lazy
+        self.lazy_cache_size: int = tuning["lazy_cache_size"]
+        self._search: SearchIndex | None = None
+        self._timeline: TimeIndex | None = None
+        self._pending: list[dict[str, Any]] = []
+        self._undo: list[Callable[[], object]] | None = None
+        self._seq = 0
+        self._history = uuid.uuid4().hex  # Names the numbering _seq belongs to (see changes)
+        self._generation = 0
+        self._changes: deque[dict[str, Any]] = deque(maxlen=change_buffer)
+        self._changes_floor = 0  # The ring holds every change after this seq
+        self._log_floor: int | None = None  # The current delta log holds every change after this seq
+        self._wal_bytes = 0
+        self._wal_current = False
+        self.durability = durability
+        self.group_window_ms: int = tuning["group_window_ms"]
+        self.group_max_mutations: int = tuning["group_max_mutations"]
+        self.flush_interval_ms: int = tuning["flush_interval_ms"]
+        self.flush_stats = FlushStats()
+        self._rw = ReadWriteLock()
+        self._lock = threading.RLock()
+        self._index_lock = threading.Lock()
+        self._unflushed = 0
+        self._first_unflushed_at = 0.0
+        self._timer: threading.Timer | None = None
+        self._flusher: threading.Thread | None = None
+        self._stop_flusher = threading.Event()
+        self._exit_hook = False
+        self.watch = watch
+        self.watch_interval_ms: int = tuning["watch_interval_ms"]
+        self._snapshot_id: list[int] | None = None
+        self._file_locked = False
+        self._watcher: threading.Thread | None = None
+        self._stop_watcher = threading.Event()
+        self._reshard()
+
+    @property
+    @_reads
+    def entities(self) -> list[Entity]:
+        """All entities in insertion order."""
+        return list(self._entities.values())
+
+    @property
+    @_reads
+    def relations(self) -> list[dict[str, Any]]:
+        """All relations in insertion order."""
+        return list(self._relations.values())
+
+    @property
+    def generation(self) -> int:
+        """Bumped whenever the graph's contents may have changed (see response_cache)."""
+        return self._generation
+
+    @property
+    def history(self) -> str:
+        """Identifies the change numbering; changes_since() seqs are only valid within it."""
+        return self._history
+
+    @property
+    def wal_path(self) -> str:
+        return f"{self.file_path}.wal"
+
+    @property
+    def snapshot_path(self) -> str:
+        return snapshot_path(self.file_path)
+
+    @property
+    def lock_path(self) -> str:
+        return f"{self.file_path}.lock"
 
-    entities: list[dict[str, Any]] = field(default_factory=list)
-    relations: list[dict[str, Any]] = field(default_factory=list)
-    file_path: str = "./memory.jsonl"
+    @property
+    def shard_dir(self) -> str:
+        return shard_dir(self.file_path)
 
+    @property
+    def _snapshot_file(self) -> str:
+        """The file whose version identifies the snapshot: the shard manifest when sharded."""
+        return manifest_path(self.shard_dir) if self.shards else self.file_path
+
+    def reading(self) -> AbstractContextManager[None]:
+        """Hold the read side of the graph lock across several reads.
+
+        Read tools use it so one response sees a single consistent graph,
+        including while it is being encoded.
+        """
+        return self._rw.read()
+
+    def writing(self) -> AbstractContextManager[None]:
+        """Hold the write side of the graph lock across several mutations."""
+        return self._rw.write()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Apply the mutations made in the block atomically, with one save().
+
+        The block holds the write side of the lock and sees its own
+        mutations as it makes them. On a normal exit the batch is saved
+        once (not at all if it made no mutation); if the block raises,
+        every mutation it made is undone (the search index is dropped and
+        rebuilt on the next search) and nothing is saved. Undone deletions
+        come back at the end of the insertion order. A nested transaction
+        joins the outer one.
+        """
+        with self._rw.write():
+            if self._undo is not None:
+                yield
+                return
+            undo: list[Callable[[], object]] = []
+            pending, unflushed, seq = len(self._pending), self._unflushed, self._seq
+            self._undo = undo
+            try:
+                yield
+            except BaseException:
+                self._undo = None
+                with self._lock:
+                    for step in reversed(undo):
+                        step()
+                    del self._pending[pending:]
+                    self._unflushed = unflushed
+                    self._search = self._timeline = None
+                    while self._changes and self._changes[-1]["seq"] > seq:
+                        self._changes.pop()
+                    self._seq = seq
+                    self._changes_floor = min(self._changes_floor, seq)
+                    self._generation += 1  # Undone deletions changed the order
+                raise
+            finally:
+                self._undo = None
+            changed = self._seq != seq
+        if changed:
+            self.save()
+
+    @_writes
     def load(self) -> None:
-        """Load graph from JSONL file."""
-        if not os.path.exists(self.file_path):
+        """Load graph from the binary or JSONL snapshot, then replay the delta log.
+
+        A graph saved with ``shards=N`` only keeps its shards up to date,
+        so opening it without them is refused rather than reading a stale
+        ``file_path``.
+        """
+        self._check_layout()
+        self._generation += 1
+        self._search = self._timeline = None  # Rebuilt lazily from the loaded graph
+        self._history = uuid.uuid4().hex  # Unless the delta log carries the numbering on
+        with _gc_paused(), self._file_lock(shared=True):
+            self._snapshot_id = file_identity(self._snapshot_file)
+            if self.shards:
+                self._load_shards()
+            elif self.lazy and not self._entities and not self._relations:
+                self._load_lazy()
+            elif not self._load_binary():
+                self.import_jsonl(self.file_path)
+            self._replay_log(record=False)
+        # Changes up to now are history the ring never saw; only the log can serve them
+        self._changes.clear()
+        self._changes_floor = self._seq
+        if self.watch:
+            self._start_watcher()
+
+    def refresh(self) -> bool:
+        """Apply changes other processes made to the memory files. True if any.
+
+        ``watch=True`` (WAL mode only) keeps processes sharing one memory
+        file coherent: writers hold an advisory lock on ``<file_path>.lock``
+        while flushing and first apply what others appended, and a poller
+        calls this every ``watch_interval_ms``. Appended log bytes are
+        tailed; only a rewritten snapshot (another process compacted)
+        forces a full reload, after which unflushed mutations are re-applied.
+        """
+        if not self._files_changed():
+            return False
+        with self._rw.write(), self._lock, self._file_lock(shared=True):
+            return self._catch_up()
+
+    def _files_changed(self) -> bool:
+        if file_identity(self._snapshot_file) != self._snapshot_id:
+            return True
+        try:
+            return os.path.getsize(self.wal_path) != self._wal_bytes
+        except OSError:
+            return self._wal_current  # Log vanished
+
+    def _catch_up(self) -> bool:
+        """Reload or tail what other processes wrote. Caller holds the write side and a file lock."""
+        if file_identity(self._snapshot_file) != self._snapshot_id:
+            self._reload()
+            return True
+        if not self._wal_current:
+            self._replay_log()
+            return self._wal_current
+        return self._tail_log()
+
+    def _check_layout(self) -> None:
+        stored = None if self.shards else read_manifest(self.shard_dir)
+        if stored is not None:
+            msg = f"{self.file_path} is stored in {stored} shards under {self.shard_dir}; open it with shards={stored}"
+            raise ValueError(msg)
+
+    def _reload(self) -> None:
+        """Full reload after another process rewrote the snapshot; keeps unflushed ops."""
+        self._check_layout()  # Before dropping the graph we have
+        if isinstance(self._entities, LazyEntityStore):
+            self._entities.close()  # Release the old map before mapping the new snapshot
+        self._entities = {}
+        self._relations.clear()
+        self._shard_members = [{} for _ in range(self.shards)]
+        self.load()
+        for op in self._pending:
+            self._apply(op)
+            self._seq = max(self._seq, op["seq"])
+        self._changes_floor = self._seq
+
+    def _tail_log(self) -> bool:
+        """Apply ops appended to the delta log since we last read or wrote it."""
+        try:
+            with open(self.wal_path, "rb") as f:
+                f.seek(self._wal_bytes)
+                appended = f.read()
+        except OSError:
+            return False
+        # Only whole lines; a partial one is finished by its writer later
+        complete = appended[: appended.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                op = codec.loads(line)
+            except ValueError:
+                continue
+            self._apply(op)
+            self._record(op)
+        self._wal_bytes += len(complete)
+        return bool(complete)
+
+    @contextmanager
+    def _file_lock(self, *, shared: bool) -> Iterator[None]:
+        """Advisory lock coordinating processes in watch mode; re-entrant within one graph."""
+        if not self.watch or fcntl is None or self._file_locked:
+            yield
             return
+        with open(self.lock_path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self._file_locked = True
+            try:
+                yield
+            finally:
+                self._file_locked = False
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _io_guard(self) -> AbstractContextManager[None]:
+        # Catching up on other processes mutates the graph, so watch mode flushes as a writer
+        return self._rw.write() if self.watch else self._rw.read()
+
+    def _start_watcher(self) -> None:
+        if self._watcher is None:
+            self._stop_watcher.clear()
+            self._watcher = threading.Thread(target=self._watch_loop, name="jade-graph-watch", daemon=True)
+            self._watcher.start()
+
+    def _watch_loop(self) -> None:
+        while not self._stop_watcher.wait(self.watch_interval_ms / 1000):
+            try:
+                self.refresh()
+            except OSError:
+                continue  # Transient (e.g. a file mid-replace); retry next tick
+
+    def _snapshot_is_current(self) -> bool:
+        """Whether the binary snapshot is a cache of the current JSONL file (never if that is gone)."""
         try:
-            with open(self.file_path, encoding="utf-8") as f:
+            source = read_source(self.snapshot_path)
+        except (OSError, SnapshotError, ValueError):
+            return False
+        current = file_identity(self.file_path)
+        return current is not None and source == current
+
+    def _load_lazy(self) -> None:
+        """Index the mapped snapshot (or JSONL) by name; decode entities on access."""
+        source: SnapshotSource | JsonlSource | None = None
+        locators: dict[str, Any] = {}
+        relations: list[dict[str, Any]] = []
+        if self._snapshot_is_current():
+            try:
+                mapped = MappedSnapshot(self.snapshot_path)
+            except (OSError, SnapshotError):
+                pass
+            else:
+                source = SnapshotSource(mapped)
+                locators = dict(zip(mapped.names, range(len(mapped.names)), strict=True))
+                relations = mapped.relations
+        if source is None:
+            source, locators, relations = JsonlSource.scan(self.file_path)
+        self._entities = LazyEntityStore(source, locators, self.lazy_cache_size, self._wrap_decoded)
+        for relation in relations:
+            self._link(relation)
+
+    def _wrap_decoded(self, record: dict[str, Any]) -> Entity:
+        return Entity.from_record(record, self._symbols, ObservationList(record.get("observations", [])))
+
+    def _load_binary(self) -> bool:
+        """Load the binary snapshot if it is a cache of the current JSONL file."""
+        if not self._snapshot_is_current():
+            return False
+        try:
+            columns = read_columns(self.snapshot_path)
+        except (OSError, SnapshotError, ValueError):
+            return False
+        self._index_columns(columns)
+        return True
+
+    def _index_columns(self, columns: SnapshotColumns) -> None:
+        """Build entities and relations straight from snapshot columns, without per-record dicts."""
+        symbols, entities = self._symbols, self._entities
+        ids = symbols.ids(columns.names)
+        types = symbols.ids(columns.types)
+        entity_types = list(map(symbols.texts(types).__getitem__, columns.entity_types))
+        # Names past the entities are relation endpoints only
+        names = symbols.texts(ids[: len(entity_types)])
+        observations, ends, extras = columns.observations, columns.obs_ends, columns.entity_extras
+        loaded = LoadedTimes(observations, columns.obs_times, ends)
+        lists = ObservationList.split_unique(observations, ends)
+        for index, (name, entity_type, unique) in enumerate(zip(names, entity_types, lists, strict=True)):
+            extra = extras.get(index) if extras else None
+            if name in entities:
+                record = {"name": name, "entityType": entity_type, "observations": unique, **(extra or {})}
+                stamps = loaded.stamps(index)
+                record[OBSERVED_AT] = [stamps.get(observation) for observation in unique]
+                self._index_entity(record)
+            else:
+                entity = entities[name] = Entity(name, entity_type, unique, extra)
+                entity.defer_times(loaded, index)
+        self._relations.extend_symbols(
+            zip(
+                map(ids.__getitem__, columns.rel_from),
+                map(ids.__getitem__, columns.rel_to),
+                map(types.__getitem__, columns.rel_types),
+                strict=True,
+            ),
+            columns.relation_extras,
+        )
+
+    def _load_shards(self) -> None:
+        """Parse the shard files (in worker processes when pool_size() says so) and merge them into the indexes."""
+        fresh = not self._entities and not self._relations
+        stored = read_manifest(self.shard_dir)
+        if stored is None:
+            self.import_jsonl(self.file_path)  # Not sharded yet
+        else:
+            paths = [shard_path(self.shard_dir, i) for i in range(stored)]
+            workers = pool_size(paths, self.load_workers)
+            if workers > 1:
+                for i, columns in enumerate(read_shards(paths, workers)):
+                    self._index_columns(columns)
+                    members = self._shard_members[i] if stored == self.shards else {}
+                    names = columns.names
+                    members.update(dict.fromkeys(names[: len(columns.entity_types)]))
+                    members.update(dict.fromkeys(map(names.__getitem__, columns.rel_from)))
+            else:
+                for i, (entities, relations) in enumerate(map(read_records, paths)):
+                    members = self._shard_members[i] if stored == self.shards else {}
+                    for entity in entities:
+                        self._index_entity(entity)
+                        members[entity["name"]] = None
+                    for relation in relations:
+                        self._link(relation)
+                        members[relation["from"]] = None
+        if fresh and stored == self.shards:
+            self._dirty_shards.clear()  # Memory matches the files
+        else:
+            self._reshard()
+
+    def _reshard(self) -> None:
+        """Assign every entity and relation to its shard and mark all shards dirty."""
+        for name in self._entities:
+            self._touch(name)
+        for name in self._relations.sources():
+            self._touch(name)
+        self._dirty_shards.update(range(self.shards))
+
+    def _touch(self, name: str) -> None:
+        """Mark the shard holding ``name`` (and its outgoing relations) for rewriting."""
+        if self.shards:
+            index = shard_of(name, self.shards)
+            self._shard_members[index][name] = None
+            self._dirty_shards.add(index)
+
+    def import_jsonl(self, path: str) -> None:
+        """Merge entity and relation records from a JSONL file into the graph."""
+        self._generation += 1
+        entities, relations = read_records(path)
+        for entity in entities:
+            self._index_entity(entity)
+        for relation in relations:
+            self._link(relation)
+
+    def _replay_log(self, *, record: bool = True) -> None:
+        """Apply the current delta log; ``record`` adds its ops to the change ring."""
+        self._wal_bytes = 0
+        self._wal_current = False
+        self._log_floor = None
+        try:
+            with open(self.wal_path, "rb") as f:
+                header = f.readline()
+                try:
+                    checkpoint = codec.loads(header)
+                except ValueError:
+                    return
+                snapshot = file_identity(self._snapshot_file)
+                if checkpoint.get("op") != "checkpoint" or checkpoint.get("snapshot") != snapshot:
+                    return  # Stale log — already folded into the snapshot
+                self._wal_current = True
+                self._wal_bytes = len(header)
+                self._seq = max(self._seq, checkpoint.get("seq", 0))
+                self._history = checkpoint.get("history", self._history)
+                self._log_floor = self._seq
                 for line in f:
+                    self._wal_bytes += len(line)
                     line = line.strip()
                     if not line:
                         continue
                     try:
-                        record = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue  # Skip corrupt lines, keep loading valid ones
-                    if record.get("type") == "entity":
-                        # Avoid duplicates
-                        existing = [e for e in self.entities if e["name"] == record["name"]]
-                        if not existing:
-                            self.entities.append(record)
-                        else:
-                            # Merge observations (preserve insertion order)
-                            merged = existing[0].get("observations", []) + record.get("observations", [])
-                            existing[0]["observations"] = list(dict.fromkeys(merged))
-                    elif record.get("type") == "relation":
-                        self.relations.append(record)
+                        op = codec.loads(line)
+                    except ValueError:
+                        continue  # Torn tail from an interrupted append
+                    self._apply(op)
+                    if record:
+                        self._record(op)
+                    else:
+                        self._number(op)
         except OSError:
-            pass  # File unreadable — start with empty graph
+            pass  # No log yet
 
     def save(self) -> None:
-        """Save graph to JSONL file."""
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            for entity in self.entities:
-                record = {**entity, "type": "entity"}
-                f.write(json.dumps(record) + "\n")
-            for relation in self.relations:
-                record = {**relation, "type": "relation"}
-                f.write(json.dumps(record) + "\n")
-
-    def find_entity(self, name: str) -> dict[str, Any] | None:
-        for e in self.entities:
-            if e["name"] == name:
-                return e
-        return None
-
-
-def create_memory_server(memory_file_path: str = "./memory.jsonl") -> FastMCP:
-    """Create a FastMCP server with all 9 knowledge graph tools."""
+        """Persist recent mutations, now or later depending on ``durability``.
+
+        By default this rewrites the whole snapshot file. With ``wal=True``
+        it appends the pending op records to ``<file_path>.wal`` instead, and
+        load() replays that log on top of the snapshot (see compact()).
+
+        IMMEDIATE writes every time; GROUP coalesces saves until
+        ``group_window_ms`` has passed since the first unflushed mutation or
+        ``group_max_mutations`` have accumulated; INTERVAL leaves writing to
+        a background thread that flushes every ``flush_interval_ms``.
+        Deferred modes also flush at interpreter exit; ``flush_stats``
+        counts mutations per flush.
+        """
+        with self._io_guard(), self._lock:
+            if self.durability is Durability.IMMEDIATE:
+                self._flush_locked()
+                return
+            if not self._unflushed:
+                return
+            self._register_exit_hook()
+            if self.durability is Durability.INTERVAL:
+                self._start_flusher()
+                return
+            age_ms = (time.monotonic() - self._first_unflushed_at) * 1000
+            if self._unflushed >= self.group_max_mutations or age_ms >= self.group_window_ms:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer((self.group_window_ms - age_ms) / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write every unflushed mutation to disk now."""
+        with self._io_guard(), self._lock:
+            if self._unflushed:
+                self._flush_locked()
+
+    def close(self) -> None:
+        """Stop background flushing and watching, and write anything still pending."""
+        if self._watcher is not None:
+            self._stop_watcher.set()
+            self._watcher.join()
+            self._watcher = None
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        if self._exit_hook:
+            atexit.unregister(self.close)
+            self._exit_hook = False
+
+    def compact(self) -> None:
+        """Fold the delta log into a fresh snapshot and start an empty log.
+
+        WAL saves do this once the log outgrows ``compact_bytes``, or
+        ``compact_ratio`` times the snapshot size. The new log starts with a
+        checkpoint naming the snapshot version (and seq) it applies to, so
+        a log that was already folded in is never replayed twice.
+        """
+        with self._io_guard(), self._lock, self._file_lock(shared=False):
+            if self.watch:
+                self._catch_up()
+            self._pending.clear()
+            self._write_snapshot()
+            self._start_log(self._seq)
+            self._mark_flushed()
+
+    def _flush_locked(self) -> None:
+        """Full snapshot rewrite, or log append in WAL mode. Caller holds the lock."""
+        if not self.wal:
+            self._write_snapshot()
+            self._mark_flushed()
+            return
+        with self._file_lock(shared=False):
+            if self.watch:
+                self._catch_up()
+            if self._pending:
+                self._append_log(self._pending)
+                self._pending.clear()
+            self._mark_flushed()
+            if self._should_compact():
+                self.compact()
+
+    def _mark_flushed(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._unflushed:
+            self.flush_stats.record(self._unflushed)
+            self._unflushed = 0
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            self._stop_flusher.clear()
+            self._flusher = threading.Thread(target=self._flush_loop, name="jade-graph-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval_ms / 1000):
+            self.flush()
+
+    def _register_exit_hook(self) -> None:
+        if not self._exit_hook:
+            atexit.register(self.close)
+            self._exit_hook = True
+
+    def _write_snapshot(self) -> None:
+        if self.shards:
+            self._write_shards()
+            self._snapshot_id = file_identity(self._snapshot_file)
+            return
+        self.export_jsonl(self.file_path)
+        self._snapshot_id = file_identity(self.file_path)
+        if self.binary_snapshot:
+            write_snapshot(
+                self.snapshot_path,
+                (entity.to_dict() for entity in self._entities.values()),
+                self._relations.values(),
+                file_identity(self.file_path),
+            )
+
+    def _write_shards(self) -> None:
+        """Rewrite the dirty shards, then the manifest. Caller holds the lock."""
+        os.makedirs(self.shard_dir, exist_ok=True)
+        for index in sorted(self._dirty_shards):
+            # Drop names whose entity and outgoing relations are all gone
+            relations = self._relations
+            members = [n for n in self._shard_members[index] if n in self._entities or relations.has_outgoing(n)]
+            self._shard_members[index] = dict.fromkeys(members)
+            write_shard(
+                shard_path(self.shard_dir, index),
+                (self._entities[n].to_dict() for n in members if n in self._entities),
+                (relations.record(key) for n in members for key in relations.outgoing(n)),
+            )
+        self._dirty_shards.clear()
+        write_manifest(self.shard_dir, self.shards)
+
+    @_reads
+    def export_jsonl(self, path: str) -> None:
+        """Write the whole graph to a JSONL file (atomically)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for entity in self._entities.values():
+                record = entity.to_dict()
+                record["type"] = "entity"
+                f.write(codec.dumpb(record) + b"\n")
+            for relation in self._relations.values():
+                f.write(codec.dumpb({**relation, "type": "relation"}) + b"\n")
+        os.replace(tmp_path, path)
+
+    def _start_log(self, seq: int) -> None:
+        """Start an empty log on the current snapshot, which holds every change up to ``seq``."""
+        checkpoint = {
+            "op": "checkpoint",
+            "snapshot": file_identity(self._snapshot_file),
+            "seq": seq,
+            "history": self._history,
+        }
+        header = codec.dumpb(checkpoint) + b"\n"
+        with open(self.wal_path, "wb") as f:
+            f.write(header)
+        self._wal_bytes = len(header)
+        self._wal_current = True
+        self._log_floor = seq
+
+    def _append_log(self, ops: list[dict[str, Any]]) -> None:
+        if not self._wal_current:
+            self._start_log(ops[0]["seq"] - 1)
+        payload = b"".join(codec.dumpb(op) + b"\n" for op in ops)
+        with open(self.wal_path, "ab") as f:
+            f.write(payload)
+        self._wal_bytes += len(payload)
+
+    def _should_compact(self) -> bool:
+        if self._wal_bytes >= self.compact_bytes:
+            return True
+        return self._wal_bytes >= _MIN_COMPACT_BYTES and self._wal_bytes >= self.compact_ratio * self._snapshot_bytes()
+
+    def _snapshot_bytes(self) -> int:
+        paths = [shard_path(self.shard_dir, i) for i in range(self.shards)] if self.shards else [self.file_path]
+        total = 0
+        for path in paths:
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                continue
+        return total
+
+    @_reads
+    def find_entity(self, name: str) -> Entity | None:
+        return self._entities.get(name)
+
+    def _entity_for_update(self, name: str) -> Entity | None:
+        """The entity to edit in place; a lazy store keeps it resident from now on."""
+        if isinstance(self._entities, LazyEntityStore):
+            return self._entities.pin(name)
+        return self._entities.get(name)
+
+    def _index_entity(self, record: dict[str, Any]) -> None:
+        """Add a loaded entity record, merging into an existing one of the same name."""
+        existing = self._entity_for_update(record["name"])
+        if existing is None:
+            entity = Entity.from_record(record, self._symbols, ObservationList(record.get("observations", [])))
+            self._entities[entity.name] = entity
+        else:
+            existing["observations"].merge(record.get("observations", []))
+            times = record.get(OBSERVED_AT)
+            if isinstance(times, list):
+                existing.stamp_each(record.get("observations", []), times)
+
+    @_reads
+    def search(self, query: str, limit: int | None = None) -> list[Entity]:
+        """Entities whose name, type or an observation contains ``query``, best first."""
+        return [self._entities[name] for name in self._search_index().search(query, limit)]
+
+    @_reads
+    def recall(
+        self,
+        query: str,
+        limit: int | None = DEFAULT_LIMIT,
+        entity_types: Collection[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[Entity]:
+        """Up to ``limit`` entities matching ``query``, ranked by relevance and recency (see recall).
+
+        ``entity_types`` keeps only entities of those types; ``since`` /
+        ``until`` (epoch seconds, inclusive) keep only entities with an
+        observation written in that range, looked up in the time index.
+        """
+        check_recall_args(limit, since, until)
+        within = None
+        if since is not None or until is not None:
+            within = self._time_index().between(since, until)
+        matches: list[str] = []
+        latest: dict[str, float] = {}
+        for name in self._search_index().search(query, within=within):
+            entity = self._entities[name]
+            if entity_types is not None and entity.entity_type not in entity_types:
+                continue
+            newest = entity.latest(since, until)
+            if newest is not None:
+                latest[name] = newest
+            elif within is not None:
+                continue  # Stale time index entry
+            matches.append(name)
+        return [self._entities[name] for name in rank(matches, latest, limit)]
+
+    def _search_index(self) -> SearchIndex:
+        index = self._search
+        if index is None:
+            # Readers may race to build it; one does, and publishes it complete
+            with self._index_lock:
+                if self._search is None:
+                    built = SearchIndex()
+                    for entity in self._entities.values():
+                        built.add(entity.name, entity.entity_type, entity.observations)
+                    self._search = built
+                index = self._search
+        return index
+
+    def _time_index(self) -> TimeIndex:
+        index = self._timeline
+        if index is None:
+            with self._index_lock:
+                if self._timeline is None:
+                    entries = ((at, entity.name) for entity in self._entities.values() for _, at in entity.stamps())
+                    self._timeline = TimeIndex(entries)
+                index = self._timeline
+        return index
+
+    @_reads
+    def has_relation(self, from_entity: str, to_entity: str, relation_type: str) -> bool:
+        return (from_entity, to_entity, relation_type) in self._relations
+
+    @_reads
+    def relations_of(self, names: Iterable[str]) -> list[dict[str, Any]]:
+        """Relations with either endpoint in ``names``, each listed once."""
+        keys: dict[tuple[str, str, str], None] = {}
+        for name in names:
+            keys.update(dict.fromkeys(self._relations.outgoing(name)))
+            keys.update(dict.fromkeys(self._relations.incoming(name)))
+        return [self._relations.record(key) for key in keys]
+
+    @_reads
+    def traverse(
+        self,
+        names: Iterable[str],
+        max_depth: int = 2,
+        relation_types: Collection[str] | None = None,
+        direction: Direction = Direction.BOTH,
+        max_nodes: int = 100,
+    ) -> tuple[list[Entity], list[dict[str, Any]], bool]:
+        """Entities within ``max_depth`` hops of ``names``, nearest first (see traversal).
+
+        Follows only ``relation_types`` when given. Returns (entities,
+        relations among the reached names, whether ``max_nodes`` cut the
+        walk short).
+        """
+        depths, keys, truncated = breadth_first(
+            names, self._edges_of, max_depth, relation_types, Direction(direction), max_nodes
+        )
+        entities = [self._entities[name] for name in depths if name in self._entities]
+        return entities, [self._relations.record(key) for key in keys], truncated
+
+    def _edges_of(self, names: list[str], direction: Direction) -> Iterator[tuple[str, str, str]]:
+        for name in names:
+            if direction is not Direction.IN:
+                yield from self._relations.outgoing(name)
+            if direction is not Direction.OUT:
+                yield from self._relations.incoming(name)
+
+    @_reads
+    def read_page(
+        self, offset: int = 0, limit: int | None = None, entity_types: Collection[str] | None = None
+    ) -> tuple[list[Entity], list[dict[str, Any]], int | None]:
+        """Up to ``limit`` records of the graph, resuming at position ``offset``.
+
+        The graph reads as every entity in insertion order, then every
+        relation. ``entity_types`` keeps only entities of those types and
+        relations touching one of them. Returns (entities, relations, next
+        offset), with None once the graph is exhausted.
+        """
+        entities: list[Entity] = []
+        relations: list[dict[str, Any]] = []
+        entity_count = len(self._entities)
+        total = entity_count + len(self._relations)
+        position = offset
+        for name in islice(self._entities, position, None):
+            position += 1
+            entity = self._entities[name]
+            if entity_types is None or entity.get("entityType") in entity_types:
+                entities.append(entity)
+                if len(entities) == limit:
+                    return entities, relations, position if position < total else None
+        selected = None
+        if entity_types is not None:
+            selected = {e["name"] for e in self._entities.values() if e.get("entityType") in entity_types}
+        for relation in islice(self._relations.values(), max(0, position - entity_count), None):
+            position += 1
+            if selected is None or relation["from"] in selected or relation["to"] in selected:
+                relations.append(relation)
+                if len(entities) + len(relations) == limit:
+                    return entities, relations, position if position < total else None
+        return entities, relations, None
+
+    @_reads
+    def changes_since(
+        self, seq: int, limit: int | None = None, history: str | None = None
+    ) -> tuple[list[dict[str, Any]], int, bool]:
+        """Up to ``limit`` changes numbered after ``seq``, oldest first.
+
+        Returns (op records with their ``seq``, the seq to pass next time,
+        reset). ``reset`` means the changes after ``seq`` are no longer all
+        available, or ``seq`` is from another history: ``history`` is not
+        this graph's (e.g. it was reloaded without a delta log to carry the
+        numbering on) or ``seq`` is ahead of it. The consumer should then
+        re-read the whole graph and continue from the returned seq.
+        """
+        check_change_args(seq, limit)
+        if seq > self._seq or (history is not None and history != self._history):
+            return [], self._seq, True
+        if seq >= self._changes_floor:
+            changes = list(islice(dropwhile(lambda change: change["seq"] <= seq, self._changes), limit))
+        else:
+            logged = self._logged_changes(seq, limit)
+            if logged is None:
+                return [], self._seq, True
+            changes = logged
+        if limit is not None and len(changes) == limit:
+            return changes, changes[-1]["seq"], False
+        return changes, self._seq, False
+
+    def _logged_changes(self, seq: int, limit: int | None) -> list[dict[str, Any]] | None:
+        """Changes after ``seq`` read back from the delta log, then the ring; None if either has a gap."""
+        with self._lock:  # No flush or compaction while we read
+            if self.watch or self._log_floor is None or seq < self._log_floor:
+                return None
+            changes: list[dict[str, Any]] = []
+            try:
+                with open(self.wal_path, "rb") as f:
+                    f.readline()  # Checkpoint
+                    for line in f:
+                        try:
+                            op = codec.loads(line)
+                        except ValueError:
+                            continue
+                        if op.get("seq", 0) > seq:
+                            changes.append(op)
+                            if len(changes) == limit:
+                                return changes
+            except OSError:
+                return None
+            last = changes[-1]["seq"] if changes else seq
+            if last < self._changes_floor:
+                return None  # Unflushed changes already left the ring
+            remaining = None if limit is None else limit - len(changes)
+            changes.extend(islice(dropwhile(lambda change: change["seq"] <= last, self._changes), remaining))
+            return changes
+
+    def _link(self, record: dict[str, Any]) -> bool:
+        """Index a relation record. False if the exact triple already exists."""
+        return self._relations.add_record(record)
+
+    def _unlink(self, key: tuple[str, str, str]) -> bool:
+        return self._relations.discard(*key)
+
+    def _restore(self, entity: Entity | None, relations: list[dict[str, Any]]) -> None:
+        """Undo step: put back a deleted entity and the relations deleted with it."""
+        if entity is not None:
+            self._entities[entity.name] = entity
+        for relation in relations:
+            self._link(relation)
+
+    # ── Mutations ───────────────────────────────────────────────
+    # Every change goes through _commit() so WAL mode can record it as an op.
+
+    def upsert_entity(self, name: str, entity_type: str = "Concept", observations: list[str] | None = None) -> None:
+        """Create an entity, or merge observations into an existing one."""
+        self._commit(
+            {
+                "op": "upsert_entity",
+                "name": name,
+                "entityType": entity_type,
+                "observations": observations or [],
+                "at": now(),
+            }
+        )
+
+    @_writes
+    def add_observations(self, name: str, contents: list[str]) -> bool:
+        """Append observations to an existing entity. False if it does not exist."""
+        if self.find_entity(name) is None:
+            return False
+        self._commit({"op": "add_observations", "name": name, "contents": contents, "at": now()})
+        return True
+
+    def delete_entities(self, names: list[str]) -> None:
+        """Delete entities and every relation touching them."""
+        self._commit({"op": "delete_entities", "names": names})
+
+    def delete_observations(self, name: str, observations: list[str]) -> None:
+        """Remove specific observations from an entity."""
+        self._commit({"op": "delete_observations", "name": name, "observations": observations})
+
+    @_writes
+    def create_relation(self, from_entity: str, to_entity: str, relation_type: str) -> bool:
+        """Add a directed relation. False if the exact relation already exists."""
+        if self.has_relation(from_entity, to_entity, relation_type):
+            return False
+        self._commit({"op": "create_relation", "from": from_entity, "to": to_entity, "relationType": relation_type})
+        return True
+
+    def delete_relations(self, triples: list[tuple[str, str, str]]) -> None:
+        """Delete relations matching any (from, to, relationType) triple."""
+        self._commit({"op": "delete_relations", "relations": [list(t) for t in triples]})
+
+    def _commit(self, op: dict[str, Any]) -> None:
+        with self._rw.write(), self._lock:
+            self._apply(op)
+            self._record(op)
+            if self.wal:
+                self._pending.append(op)
+            if not self._unflushed:
+                self._first_unflushed_at = time.monotonic()
+            self._unflushed += 1
+
+    def _number(self, op: dict[str, Any]) -> None:
+        """Give an applied op its seq: the next one, or the one it carries if that is ahead."""
+        seq = op.get("seq")
+        self._seq = seq if isinstance(seq, int) and seq > self._seq else self._seq + 1
+        op["seq"] = self._seq
+
+    def _record(self, op: dict[str, Any]) -> None:
+        """Number an applied op and append it to the change ring."""
+        self._number(op)
+        if len(self._changes) == self._changes.maxlen:
+            self._changes_floor = self._changes[0]["seq"]
+        self._changes.append(op)
+
+    def _apply(self, op: dict[str, Any]) -> None:
+        """Apply one op; inside transaction() also record how to undo it."""
+        self._generation += 1
+        kind = op.get("op")
+        search = self._search
+        undo = self._undo
+        if kind in ("upsert_entity", "add_observations", "delete_observations"):
+            self._touch(op["name"])
+        elif kind == "create_relation":
+            self._touch(op["from"])
+        if kind == "upsert_entity":
+            existing = self._entity_for_update(op["name"])
+            if existing:
+                added = self._merge_observations(existing, op["observations"], op.get("at"))
+                if undo is not None and added:
+                    undo.append(functools.partial(existing.observations.discard, added))
+            else:
+                symbols = self._symbols
+                entity = Entity(
+                    symbols.intern(op["name"]), symbols.intern(op["entityType"]), ObservationList(op["observations"])
+                )
+                self._entities[entity.name] = entity
+                if search is not None:
+                    search.add(entity.name, entity.entity_type, entity.observations)
+                self._stamp(entity, entity.observations, op.get("at"))
+                if undo is not None:
+                    undo.append(functools.partial(self._entities.pop, entity.name, None))
+        elif kind == "add_observations":
+            entity = self._entity_for_update(op["name"])
+            if entity:
+                added = self._merge_observations(entity, op["contents"], op.get("at"))
+                if undo is not None and added:
+                    undo.append(functools.partial(entity.observations.discard, added))
+        elif kind == "delete_entities":
+            names = set(op["names"])
+            for name in names:
+                self._touch(name)
+                removed_entity = self._entities.pop(name, None)
+                if search is not None:
+                    search.remove(name)
+                keys = [*self._relations.outgoing(name), *self._relations.incoming(name)]
+                removed = [self._relations.record(key) for key in keys] if undo is not None else []
+                for key in keys:
+                    self._touch(key[0])
+                    self._unlink(key)
+                if undo is not None and (removed_entity is not None or keys):
+                    undo.append(functools.partial(self._restore, removed_entity, removed))
+        elif kind == "delete_observations":
+            entity = self._entity_for_update(op["name"])
+            if entity:
+                before = list(entity.observations) if undo is not None else None
+                removed = entity.observations.discard(op["observations"])
+                if search is not None and removed:
+                    search.remove_observations(entity.name, removed)
+                if before is not None and removed:
+                    undo.append(functools.partial(entity.observations.__setitem__, slice(None), before))
+        elif kind == "create_relation":
+            key = (op["from"], op["to"], op["relationType"])
+            if self._relations.add(*key) and undo is not None:
+                undo.append(functools.partial(self._unlink, key))
+        elif kind == "delete_relations":
+            for from_entity, to_entity, relation_type in op["relations"]:
+                self._touch(from_entity)
+                key = (from_entity, to_entity, relation_type)
+                record = self._relations.record(key) if undo is not None else None
+                if self._unlink(key) and record is not None:
+                    undo.append(functools.partial(self._link, record))
+        # Unknown ops (e.g. from a newer writer) are skipped like corrupt lines
+
+    def _merge_observations(self, entity: Entity, incoming: list[str], at: float | None) -> list[str]:
+        """Merge observations (preserve insertion order), index, stamp and return the new ones."""
+        added = entity.observations.merge(incoming)
+        if self._search is not None and added:
+            self._search.add_observations(entity.name, added)
+        self._stamp(entity, added, at)
+        return added
+
+    def _stamp(self, entity: Entity, observations: list[str], at: float | None) -> None:
+        """Record the write time of new observations (ops from before times were kept have none)."""
+        if at is None or not observations:
+            return
+        entity.stamp(observations, at)
+        if self._timeline is not None:
+            self._timeline.add(at, entity.name)
+
+
+def in_thread(tool: Callable[..., _T]) -> Callable[..., Awaitable[_T]]:  # noqa: UP047
+    """Make a blocking tool function async by running it in a worker thread.
+
+    FastMCP calls sync tools on the event loop itself, so without this
+    read tools never overlap and a tool waiting for the graph lock (or a
+    save) stalls every other request.
+    """
+
+    @functools.wraps(tool)
+    async def run(*args: Any, **kwargs: Any) -> _T:
+        return await asyncio.to_thread(tool, *args, **kwargs)
+
+    return run
+
+
+def graph_lifespan(
+    graph: KnowledgeGraph | SqliteKnowledgeGraph,
+) -> Callable[[FastMCP], AbstractAsyncContextManager[None]]:
+    """FastMCP lifespan that flushes deferred graph writes when the server stops."""
+
+    @asynccontextmanager
+    async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            graph.flush()
+
+    return lifespan
+
+
+def load_graph(
+    memory_file_path: str = "./memory.jsonl",
+    *,
+    wal: bool = False,
+    durability: Durability = Durability.IMMEDIATE,
+    lazy: bool = False,
+    watch: bool = False,
+    shards: int = 0,
+    binary_snapshot: bool = False,
+) -> KnowledgeGraph | SqliteKnowledgeGraph:
+    """Validate the memory file path and load the graph stored there.
+
+    ``wal=True`` persists mutations through the append-only delta log
+    instead of rewriting the JSONL file on every tool call; ``durability``
+    lets bursts of tool calls share one disk write; ``lazy=True`` decodes
+    entities on first access for memory files too large to hold in RAM;
+    ``watch=True`` (with ``wal=True``) follows changes other processes make
+    to the same file; ``shards=N`` stores the graph as N hash-partitioned
+    files that save and load independently; ``binary_snapshot=True`` also
+    writes the columnar snapshot on every save, so later loads skip JSON
+    parsing.
+
+    A ``.db``, ``.sqlite`` or ``.sqlite3`` path selects the SQLite storage
+    engine instead (see sqlite_store), which persists every mutation as it
+    happens and takes none of the JSONL options.
+    """
     resolved = os.path.realpath(memory_file_path)
+    if resolved.endswith(SQLITE_SUFFIXES):
+        if wal or lazy or watch or shards or binary_snapshot:
+            msg = "wal, lazy, watch, shards and binary_snapshot only apply to JSONL memory files"
+            raise ValueError(msg)
+        sqlite_graph = SqliteKnowledgeGraph(resolved)
+        sqlite_graph.load()
+        return sqlite_graph
     if not resolved.endswith(".jsonl"):
-        msg = "memory_file_path must end with .jsonl"
+        msg = "memory_file_path must end with .jsonl (or .db / .sqlite for SQLite storage)"
         raise ValueError(msg)
 
-    mcp = FastMCP("jade-memory")
-    graph = KnowledgeGraph(file_path=resolved)
+    graph = KnowledgeGraph(
+        file_path=resolved,
+        wal=wal,
+        durability=durability,
+        lazy=lazy,
+        watch=watch,
+        shards=shards,
+        binary_snapshot=binary_snapshot,
+    )
     graph.load()
+    return graph
 
-    @mcp.tool()
-    def create_entities(entities: list[dict[str, Any]]) -> str:
-        """Create new entities in the knowledge graph."""
+
+def create_memory_server(
+    memory_file_path: str = "./memory.jsonl",
+    graph: KnowledgeGraph | SqliteKnowledgeGraph | None = None,
+    *,
+    wal: bool = False,
+    durability: Durability = Durability.IMMEDIATE,
+    binary_snapshot: bool = False,
+    response_cache_size: int = 128,
+) -> FastMCP:
+    """Create a FastMCP server with all 9 knowledge graph tools plus traverse, apply_mutations and changes_since.
+
+    Pass ``graph`` to share one loaded graph (and its indexes) with other
+    servers; otherwise it is loaded from ``memory_file_path`` (see
+    load_graph() for ``wal``, ``durability`` and ``binary_snapshot``).
+    Read tools reuse up to ``response_cache_size`` encoded responses
+    while the graph is unchanged (see response_cache); 0 disables the
+    cache. Tools run in worker threads (see in_thread), so reads overlap.
+    """
+    if graph is None:
+        graph = load_graph(memory_file_path, wal=wal, durability=durability, binary_snapshot=binary_snapshot)
+    mcp = FastMCP("jade-memory", lifespan=graph_lifespan(graph))
+    responses = ResponseCache(response_cache_size)
+
+    # Each mutation tool is one transaction; apply_mutations runs several
+    # of them in a single transaction, keyed by tool name.
+
+    def _create_entities(entities: list[dict[str, Any]]) -> dict[str, Any]:
         created = []
         for e in entities:
             name = e.get("name", "")
             if not name:
                 msg = "Entity name is required"
                 raise ValueError(msg)
-            existing = graph.find_entity(name)
-            if existing:
-                # Merge observations (preserve insertion order)
-                merged = existing.get("observations", []) + e.get("observations", [])
-                existing["observations"] = list(dict.fromkeys(merged))
-            else:
-                graph.entities.append(
-                    {
-                        "name": name,
-                        "entityType": e.get("entityType", "Concept"),
-                        "observations": e.get("observations", []),
-                    }
-                )
+            graph.upsert_entity(name, e.get("entityType", "Concept"), e.get("observations", []))
             created.append(name)
-        graph.save()
-        return json.dumps({"created": created})
+        return {"created": created}
 
-    @mcp.tool()
-    def create_relations(relations: list[dict[str, Any]]) -> str:
-        """Create relations between entities."""
+    def _create_relations(relations: list[dict[str, Any]]) -> dict[str, Any]:
         created = []
+        duplicates = []
         for r in relations:
-            graph.relations.append(
-                {
-                    "from": r["from"],
-                    "to": r["to"],
-                    "relationType": r["relationType"],
-                }
-            )
-            created.append(f"{r['from']} -> {r['to']}")
-        graph.save()
-        return json.dumps({"created": created})
+            label = f"{r['from']} -> {r['to']}"
+            if graph.create_relation(r["from"], r["to"], r["relationType"]):
+                created.append(label)
+            else:
+                duplicates.append(label)
+        result: dict[str, Any] = {"created": created}
+        if duplicates:
+            result["duplicates"] = duplicates
+        return result
 
-    @mcp.tool()
-    def add_observations(observations: list[dict[str, Any]]) -> str:
-        """Add observations to existing entities."""
+    def _add_observations(observations: list[dict[str, Any]]) -> dict[str, Any]:
         added = []
         not_found: list[str] = []
         for obs in observations:
             entity_name = obs.get("entityName", "")
             contents = obs.get("contents", [])
-            entity = graph.find_entity(entity_name)
-            if entity:
-                merged = entity.get("observations", []) + contents
-                entity["observations"] = list(dict.fromkeys(merged))
+            if graph.add_observations(entity_name, contents):
                 added.append({"entityName": entity_name, "addedCount": len(contents)})
             else:
                 not_found.append(entity_name)
-        graph.save()
         result: dict[str, Any] = {"added": added}
         if not_found:
             result["notFound"] = not_found
-        return json.dumps(result)
+        return result
+
+    def _delete_entities(entity_names: list[str]) -> dict[str, Any]:
+        graph.delete_entities(entity_names)
+        return {"deleted": entity_names}
+
+    def _delete_observations(deletions: list[dict[str, Any]]) -> dict[str, Any]:
+        for d in deletions:
+            graph.delete_observations(d.get("entityName", ""), d.get("observations", []))
+        return {"status": "ok"}
+
+    def _delete_relations(relations: list[dict[str, Any]]) -> dict[str, Any]:
+        graph.delete_relations([(r["from"], r["to"], r["relationType"]) for r in relations])
+        return {"status": "ok"}
+
+    # op name → (argument name, handler)
+    mutations: dict[str, tuple[str, Callable[[list[Any]], dict[str, Any]]]] = {
+        "create_entities": ("entities", _create_entities),
+        "create_relations": ("relations", _create_relations),
+        "add_observations": ("observations", _add_observations),
+        "delete_entities": ("entityNames", _delete_entities),
+        "delete_observations": ("deletions", _delete_observations),
+        "delete_relations": ("relations", _delete_relations),
+    }
 
     @mcp.tool()
+    @in_thread
+    def create_entities(entities: list[dict[str, Any]]) -> str:
+        """Create new entities in the knowledge graph."""
+        with graph.transaction():
+            result = _create_entities(entities)
+        return codec.dumps(result)
+
+    @mcp.tool()
+    @in_thread
+    def create_relations(relations: list[dict[str, Any]]) -> str:
+        """Create relations between entities."""
+        with graph.transaction():
+            result = _create_relations(relations)
+        return codec.dumps(result)
+
+    @mcp.tool()
+    @in_thread
+    def add_observations(observations: list[dict[str, Any]]) -> str:
+        """Add observations to existing entities."""
+        with graph.transaction():
+            result = _add_observations(observations)
+        return codec.dumps(result)
+
+    @mcp.tool()
+    @in_thread
     def delete_entities(entityNames: list[str]) -> str:  # noqa: N803
         """Delete entities and their associated relations."""
-        graph.entities = [e for e in graph.entities if e["name"] not in entityNames]
-        graph.relations = [r for r in graph.relations if r["from"] not in entityNames and r["to"] not in entityNames]
-        graph.save()
-        return json.dumps({"deleted": entityNames})
+        with graph.transaction():
+            result = _delete_entities(entityNames)
+        return codec.dumps(result)
 
     @mcp.tool()
+    @in_thread
     def delete_observations(deletions: list[dict[str, Any]]) -> str:
         """Delete specific observations from entities."""
-        for d in deletions:
-            entity_name = d.get("entityName", "")
-            to_remove = set(d.get("observations", []))
-            entity = graph.find_entity(entity_name)
-            if entity:
-                entity["observations"] = [o for o in entity.get("observations", []) if o not in to_remove]
-        graph.save()
-        return json.dumps({"status": "ok"})
+        with graph.transaction():
+            result = _delete_observations(deletions)
+        return codec.dumps(result)
 
     @mcp.tool()
+    @in_thread
     def delete_relations(relations: list[dict[str, Any]]) -> str:
         """Delete specific relations."""
-        to_remove = {(r["from"], r["to"], r["relationType"]) for r in relations}
-        graph.relations = [r for r in graph.relations if (r["from"], r["to"], r["relationType"]) not in to_remove]
-        graph.save()
-        return json.dumps({"status": "ok"})
+        with graph.transaction():
+            result = _delete_relations(relations)
+        return codec.dumps(result)
+
+    @mcp.tool()
+    @in_thread
+    def apply_mutations(operations: list[dict[str, Any]]) -> str:
+        """Apply several mutations atomically with one save; results are returned per operation.
+
+        Each operation names a mutation tool in "op" and carries that tool's
+        argument, e.g. {"op": "create_relations", "relations": [...]}. If any
+        operation fails, none of them is applied.
+        """
+        for index, op in enumerate(operations):
+            if op.get("op") not in mutations:
+                msg = f"operations[{index}]: op must be one of {', '.join(mutations)}"
+                raise ValueError(msg)
+            argument = mutations[op["op"]][0]
+            if not isinstance(op.get(argument), list):
+                msg = f"operations[{index}]: {op['op']} needs a {argument} list"
+                raise ValueError(msg)
+        results = []
+        with graph.transaction():
+            for op in operations:
+                argument, handler = mutations[op["op"]]
+                results.append({"op": op["op"], **handler(op[argument])})
+        return codec.dumps({"results": results})
+
+    # Read tools page with cursor/limit (nextCursor is present while more
+    # remains), filter by entityTypes and trim entities via projection and
+    # maxObservations; see paging.
 
     @mcp.tool()
-    def read_graph() -> str:
-        """Read the entire knowledge graph."""
-        return json.dumps({"entities": graph.entities, "relations": graph.relations})
+    @in_thread
+    def read_graph(
+        cursor: str | None = None,
+        limit: int | None = None,
+        entityTypes: list[str] | None = None,  # noqa: N803
+        projection: Projection = Projection.FULL,
+        maxObservations: int | None = None,  # noqa: N803
+    ) -> str:
+        """Read the knowledge graph: entities, then relations, a page at a time."""
+        check_page_args(limit, maxObservations)
+        offset = decode_cursor(cursor)
+        types = set(entityTypes) if entityTypes else None
+        key = ("read_graph", offset, limit, freeze(types), Projection(projection), maxObservations)
+
+        def encode() -> str:
+            entities, relations, next_offset = graph.read_page(offset, limit, types)
+            return encode_page(entities, relations, next_offset, Projection(projection), maxObservations)
+
+        with graph.reading():
+            return responses.get_or_encode(graph.generation, key, encode)
+
+    @mcp.tool()
+    @in_thread
+    def search_nodes(
+        query: str,
+        limit: int | None = None,
+        cursor: str | None = None,
+        entityTypes: list[str] | None = None,  # noqa: N803
+        projection: Projection = Projection.FULL,
+        maxObservations: int | None = None,  # noqa: N803
+    ) -> str:
+        """Search for entities matching a query string, best match first."""
+        check_page_args(limit, maxObservations)
+        offset = decode_cursor(cursor)
+        types = set(entityTypes) if entityTypes else None
+        key = ("search_nodes", query, offset, limit, freeze(types), Projection(projection), maxObservations)
+
+        def encode() -> str:
+            if types:
+                matches = [e for e in graph.search(query) if e.get("entityType") in types]
+            else:
+                # One extra hit tells us whether another page exists
+                matches = graph.search(query, None if limit is None else offset + limit + 1)
+            end = len(matches) if limit is None else offset + limit
+            next_offset = end if end < len(matches) else None
+            return encode_page(matches[offset:end], [], next_offset, Projection(projection), maxObservations)
+
+        with graph.reading():
+            return responses.get_or_encode(graph.generation, key, encode)
 
     @mcp.tool()
-    def search_nodes(query: str) -> str:
-        """Search for entities matching a query string."""
-        query_lower = query.lower()
-        matches = []
-        for e in graph.entities:
-            if (
-                query_lower in e["name"].lower()
-                or query_lower in e.get("entityType", "").lower()
-                or any(query_lower in obs.lower() for obs in e.get("observations", []))
-            ):
-                matches.append(e)
-        return json.dumps({"entities": matches, "relations": []})
+    @in_thread
+    def open_nodes(
+        names: list[str],
+        cursor: str | None = None,
+        limit: int | None = None,
+        entityTypes: list[str] | None = None,  # noqa: N803
+        projection: Projection = Projection.FULL,
+        maxObservations: int | None = None,  # noqa: N803
+    ) -> str:
+        """Open specific nodes by name, with the relations touching them."""
+        check_page_args(limit, maxObservations)
+        offset = decode_cursor(cursor)
+        requested = list(dict.fromkeys(names))
+        types = set(entityTypes) if entityTypes else None
+        key = ("open_nodes", tuple(requested), offset, limit, freeze(types), Projection(projection), maxObservations)
+
+        def encode() -> str:
+            end = len(requested) if limit is None else offset + limit
+            page = requested[offset:end]
+            matches = [e for e in map(graph.find_entity, page) if e is not None]
+            if types:
+                matches = [e for e in matches if e.get("entityType") in types]
+                page = [e["name"] for e in matches]
+            next_offset = end if end < len(requested) else None
+            return encode_page(matches, graph.relations_of(page), next_offset, Projection(projection), maxObservations)
+
+        with graph.reading():
+            return responses.get_or_encode(graph.generation, key, encode)
 
     @mcp.tool()
-    def open_nodes(names: list[str]) -> str:
-        """Open specific nodes by name."""
-        name_set = set(names)
-        matches = [e for e in graph.entities if e["name"] in name_set]
-        related = [r for r in graph.relations if r["from"] in name_set or r["to"] in name_set]
-        return json.dumps({"entities": matches, "relations": related})
+    @in_thread
+    def traverse(
+        names: list[str],
+        maxDepth: int = 2,  # noqa: N803
+        relationTypes: list[str] | None = None,  # noqa: N803
+        direction: Direction = Direction.BOTH,
+        maxNodes: int = 100,  # noqa: N803
+        projection: Projection = Projection.FULL,
+        maxObservations: int | None = None,  # noqa: N803
+    ) -> str:
+        """Walk relations breadth-first from seed entities, up to maxDepth hops and maxNodes entities."""
+        check_page_args(None, maxObservations)
+        types = set(relationTypes) if relationTypes else None
+        key = (
+            "traverse",
+            tuple(names),
+            maxDepth,
+            freeze(types),
+            Direction(direction),
+            maxNodes,
+            Projection(projection),
+            maxObservations,
+        )
+
+        def encode() -> str:
+            entities, relations, truncated = graph.traverse(names, maxDepth, types, Direction(direction), maxNodes)
+            projected = [project(e, Projection(projection), maxObservations) for e in entities]
+            return codec.dumps({"entities": projected, "relations": relations, "truncated": truncated})
+
+        with graph.reading():
+            return responses.get_or_encode(graph.generation, key, encode)
+
+    @mcp.tool()
+    @in_thread
+    def changes_since(seq: int = 0, limit: int | None = None, history: str | None = None) -> str:
+        """Mutations numbered after seq, oldest first; pass the returned seq and history on the next call.
+
+        reset=true means the feed no longer reaches back to seq, or seq is
+        from another history (numbering restarted): re-read the graph, then
+        follow changes from the returned seq.
+        """
+        with graph.reading():
+            changes, next_seq, reset = graph.changes_since(seq, limit, history)
+            return codec.dumps({"changes": changes, "seq": next_seq, "history": graph.history, "reset": reset})
 
     return mcp
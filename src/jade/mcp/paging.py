@@ -0,0 +1,106 @@
+"""Pagination, projection and streamed encoding for graph read tools.
+
+read_graph, open_nodes and search_nodes return pages of a stream of
+records. A cursor is an opaque token wrapping the position to resume from;
+it is only meaningful for the same tool and arguments, and a page may skip
+or repeat records if the graph changes between calls.
+
+Projections trim what each entity carries:
+
+- ``full``: every field (observations optionally cut to ``maxObservations``,
+  with ``observationCount`` giving the untruncated total)
+- ``summary``: name and entityType
+- ``names``: name only
+
+iter_page_json() encodes a page one record at a time, so the only large
+string built is the response itself.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from jade import codec
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class Projection(StrEnum):
+    """Which entity fields a read tool returns."""
+
+    FULL = "full"
+    SUMMARY = "summary"
+    NAMES = "names"
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(codec.dumpb({"o": offset})).decode("ascii")
+
+
+def decode_cursor(cursor: str | None) -> int:
+    """Position a cursor resumes from; 0 for no cursor."""
+    if not cursor:
+        return 0
+    try:
+        offset = codec.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["o"]
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        offset = None
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        msg = "cursor is invalid; pass the nextCursor of a previous response"
+        raise ValueError(msg)
+    return offset
+
+
+def check_page_args(limit: int | None, max_observations: int | None) -> None:
+    if limit is not None and limit < 1:
+        msg = "limit must be at least 1"
+        raise ValueError(msg)
+    if max_observations is not None and max_observations < 0:
+        msg = "maxObservations must be non-negative"
+        raise ValueError(msg)
+
+
+def project(entity: dict[str, Any], projection: Projection, max_observations: int | None = None) -> dict[str, Any]:
+    """The fields of ``entity`` a response should carry."""
+    if projection is Projection.NAMES:
+        return {"name": entity["name"]}
+    if projection is Projection.SUMMARY:
+        return {"name": entity["name"], "entityType": entity.get("entityType", "")}
+    observations = entity.get("observations", [])
+    if max_observations is None or len(observations) <= max_observations:
+        return entity
+    return {**entity, "observations": observations[:max_observations], "observationCount": len(observations)}
+
+
+def iter_page_json(
+    entities: Iterable[dict[str, Any]],
+    relations: Iterable[dict[str, Any]],
+    next_offset: int | None = None,
+    projection: Projection = Projection.FULL,
+    max_observations: int | None = None,
+) -> Iterator[str]:
+    """Encode a page as JSON chunks: one per record plus the framing."""
+    yield '{"entities":['
+    for i, entity in enumerate(entities):
+        yield ("," if i else "") + codec.dumps(project(entity, projection, max_observations))
+    yield '],"relations":['
+    for i, relation in enumerate(relations):
+        yield ("," if i else "") + codec.dumps(relation)
+    yield "]"
+    if next_offset is not None:
+        yield ',"nextCursor":' + codec.dumps(encode_cursor(next_offset))
+    yield "}"
+
+
+def encode_page(
+    entities: Iterable[dict[str, Any]],
+    relations: Iterable[dict[str, Any]],
+    next_offset: int | None = None,
+    projection: Projection = Projection.FULL,
+    max_observations: int | None = None,
+) -> str:
+    return "".join(iter_page_json(entities, relations, next_offset, projection, max_observations))
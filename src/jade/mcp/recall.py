@@ -0,0 +1,110 @@
+"""Ranked recall shared by the knowledge graph storage backends.
+
+recall_context puts the entities most worth reading in front of the
+model: those matching a query, optionally only of some entity types and
+only written to within a time range. Matches are ranked by reciprocal
+rank fusion of two orderings, search relevance (BM25) and recency (the
+newest write time of an observation, within the range if one is given),
+so both a strong match from last month and a fresh weaker one surface;
+then the list is cut at ``limit``.
+
+Write times are epoch seconds recorded when an observation is first
+written, carried as ``"at"`` on upsert_entity / add_observations op
+records and as an ``observedAt`` list beside ``observations`` in JSONL.
+Observations written before times were recorded have none: they rank as
+oldest and never match ``since`` / ``until``.
+
+With an embedding pipeline and cold memory, recall_context also runs a
+vector search and merges both result lists with fuse(), the same rank
+fusion.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+# recall_context returns at most this many entities unless asked for more
+DEFAULT_LIMIT = 20
+
+# Reciprocal rank fusion constant: damps the advantage of the very top ranks
+_RRF_K = 60
+
+_DAY = 24 * 60 * 60
+
+
+def now() -> float:
+    """Write time for new observations: epoch seconds, to the millisecond."""
+    return round(time.time(), 3)
+
+
+def check_recall_args(limit: int | None, since: float | None, until: float | None) -> None:
+    if limit is not None and limit < 1:
+        msg = "limit must be at least 1"
+        raise ValueError(msg)
+    if since is not None and until is not None and since > until:
+        msg = "since must not be after until"
+        raise ValueError(msg)
+
+
+def parse_time(value: str | None, name: str, *, end_of_day: bool = False) -> float | None:
+    """Epoch seconds for an ISO 8601 date or datetime (UTC unless it has an offset).
+
+    With ``end_of_day``, a bare date means the end of that day, so an
+    inclusive ``until`` covers all of it.
+    """
+    if value is None:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        msg = f"{name} must be an ISO 8601 date or datetime, got {value!r}"
+        raise ValueError(msg) from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    stamp = moment.timestamp()
+    if end_of_day and _is_date(value):
+        stamp += _DAY - 0.001
+    return stamp
+
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def rank(relevant: list[str], latest: Mapping[str, float], limit: int | None) -> list[str]:
+    """The top ``limit`` of ``relevant`` (best match first), fused with recency from ``latest``.
+
+    Names without a write time share the last recency rank; ties keep
+    relevance order.
+    """
+    by_recency = sorted((name for name in relevant if name in latest), key=latest.__getitem__, reverse=True)
+    recency = {name: position for position, name in enumerate(by_recency)}
+    oldest = len(by_recency)
+    scores = {
+        name: 1 / (_RRF_K + position) + 1 / (_RRF_K + recency.get(name, oldest))
+        for position, name in enumerate(relevant)
+    }
+    ranked = sorted(relevant, key=scores.__getitem__, reverse=True)
+    return ranked if limit is None else ranked[:limit]
+
+
+def fuse(rankings: Iterable[list[str]], limit: int | None) -> list[str]:
+    """Reciprocal rank fusion of best-first rankings; a name missing from one scores nothing there.
+
+    Ties keep the order names were first seen in.
+    """
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for position, name in enumerate(ranking):
+            scores[name] = scores.get(name, 0.0) + 1 / (_RRF_K + position)
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return ranked if limit is None else ranked[:limit]
@@ -0,0 +1,88 @@
+"""LRU of encoded read-tool responses, keyed by graph generation.
+
+Within one agent session the same read_graph / open_nodes /
+recall_context call is often repeated while the graph has not changed,
+and each repeat pays for the scan and the JSON encoding again. Every
+mutation bumps the graph's ``generation``, so an encoded response stays
+valid for as long as the generation it was built at is current: a repeat
+call becomes a dictionary hit.
+
+Generations only grow. Only the newest generation's responses are kept;
+the first lookup at a newer one drops the rest. The cache is bounded by
+entry count and by total response size (in characters); responses larger
+than the size budget are returned uncached.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+
+def freeze(value: Any) -> Hashable:
+    """A hashable stand-in for a tool argument (lists become tuples, dicts sorted items)."""
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, set | frozenset):
+        return tuple(sorted(value))
+    return value
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded responses for one graph generation."""
+
+    def __init__(self, max_entries: int = 128, max_chars: int = 8 * 1024 * 1024) -> None:
+        if max_entries < 0 or max_chars < 0:
+            msg = "max_entries and max_chars must be non-negative"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: OrderedDict[Hashable, str] = OrderedDict()
+        self._chars = 0
+        self._generation: int | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_encode(self, generation: int, key: Hashable, encode: Callable[[], str]) -> str:
+        """The cached response for ``key`` at ``generation``, else ``encode()`` (and cache it).
+
+        Call it while holding the graph's read lock, so the generation and
+        the encoded content agree.
+        """
+        if not self.max_entries:
+            return encode()
+        with self._lock:
+            if self._generation is None or generation > self._generation:
+                self._entries.clear()
+                self._chars = 0
+                self._generation = generation
+            elif generation < self._generation:
+                return encode()  # A reader still on an older graph
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            self.misses += 1
+        response = encode()
+        if len(response) > self.max_chars:
+            return response
+        with self._lock:
+            if generation != self._generation or key in self._entries:
+                return response  # Superseded, or a concurrent reader cached it first
+            self._entries[key] = response
+            self._chars += len(response)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+        return response
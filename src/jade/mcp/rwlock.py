@@ -0,0 +1,79 @@
+"""Reader-writer lock guarding a shared KnowledgeGraph.
+
+Any number of threads may hold the read side at once; the write side is
+exclusive. Waiting writers block new readers, so a steady stream of read
+tools cannot starve a mutation. Both sides are re-entrant per thread, and
+the writing thread may also take the read side (e.g. save() inside a
+write batch); upgrading a read hold to a write hold would deadlock, so it
+raises instead.
+
+KnowledgeGraph lookups, search and exports take the read side and
+mutations the write side; reading() / writing() hold a side across
+several calls. Disk writes happen under the read side, so reads proceed
+during a flush, except in watch mode, where catching up on other
+processes mutates the graph and flushes take the write side.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class ReadWriteLock:
+    """Writer-preferring, per-thread re-entrant reader-writer lock."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: dict[int, int] = {}  # thread id → hold depth
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                depth = self._readers[me] - 1
+                if depth:
+                    self._readers[me] = depth
+                else:
+                    del self._readers[me]
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me:
+                if me in self._readers:
+                    msg = "cannot take the write lock while holding the read lock"
+                    raise RuntimeError(msg)
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._cond.notify_all()
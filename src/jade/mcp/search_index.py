@@ -0,0 +1,196 @@
+"""Inverted full-text index over knowledge graph entities.
+
+Backs search_nodes and recall_context. Two posting maps are kept per
+entity field (name, entityType, each observation):
+
+- token postings (lowercased word → term frequency) for BM25 ranking
+- trigram postings (lowercased 3-gram → field count) for candidate lookup,
+  so the existing case-insensitive substring semantics keep working
+
+A query only touches entities whose fields contain every trigram of the
+query; candidates are then verified with a real substring check and
+ranked. Queries shorter than a trigram fall back to checking every entity.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# BM25 parameters (standard defaults)
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Incrementally maintained token + trigram index keyed by entity name."""
+
+    def __init__(self) -> None:
+        self._fields: dict[str, list[str]] = {}
+        self._order: dict[str, int] = {}
+        self._next_order = 0
+        self._tokens: dict[str, dict[str, int]] = {}
+        self._trigrams: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def add(self, name: str, entity_type: str, observations: Iterable[str]) -> None:
+        """Index a new entity. Its name and type are searchable like observations."""
+        if name in self._fields:
+            self.remove(name)
+        self._fields[name] = []
+        self._order[name] = self._next_order
+        self._next_order += 1
+        self._lengths[name] = 0
+        # Name tokens count twice so direct name hits outrank passing mentions
+        self._add_field(name, name, weight=2)
+        self._add_field(name, entity_type)
+        for observation in observations:
+            self._add_field(name, observation)
+
+    def add_observations(self, name: str, observations: Iterable[str]) -> None:
+        if name not in self._fields:
+            return
+        for observation in observations:
+            self._add_field(name, observation)
+
+    def remove_observations(self, name: str, observations: Iterable[str]) -> None:
+        fields = self._fields.get(name)
+        if fields is None:
+            return
+        for observation in observations:
+            lowered = observation.lower()
+            # Fields 0 and 1 are the name and type; never drop those here
+            try:
+                index = fields.index(lowered, 2)
+            except ValueError:
+                continue
+            del fields[index]
+            self._unpost(name, lowered, weight=1)
+
+    def remove(self, name: str) -> None:
+        fields = self._fields.pop(name, None)
+        if fields is None:
+            return
+        for position, lowered in enumerate(fields):
+            self._unpost(name, lowered, weight=2 if position == 0 else 1)
+        del self._lengths[name]
+        del self._order[name]
+
+    def search(self, query: str, limit: int | None = None, within: Collection[str] | None = None) -> list[str]:
+        """Names of entities with a field containing ``query``, best match first.
+
+        ``within`` restricts the search to those names (e.g. the entities
+        written to in a time range), so only they are checked.
+        """
+        needle = query.lower()
+        grams = _trigrams(needle)
+        if within is not None and (not grams or len(within) < len(self._fields) // 8):
+            candidates: Iterable[str] = [name for name in within if name in self._fields]
+        else:
+            candidates = self._candidates(grams) if grams else self._fields.keys()
+            if within is not None:
+                allowed = within if isinstance(within, set | frozenset | dict) else set(within)
+                candidates = [name for name in candidates if name in allowed]
+        matches = [name for name in candidates if any(needle in field for field in self._fields[name])]
+
+        scores = self._bm25(tokenize(query), matches)
+        matches.sort(key=lambda name: (-scores.get(name, 0.0), self._order[name]))
+        if limit is not None:
+            del matches[limit:]
+        return matches
+
+    def _candidates(self, grams: set[str]) -> Iterable[str]:
+        postings = []
+        for gram in grams:
+            posting = self._trigrams.get(gram)
+            if not posting:
+                return ()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def _bm25(self, query_tokens: list[str], names: list[str]) -> dict[str, float]:
+        if not query_tokens or not names:
+            return {}
+        n_docs = len(self._fields)
+        avg_length = self._total_length / n_docs if n_docs else 0.0
+        scores: dict[str, float] = {}
+        for token in set(query_tokens):
+            posting = self._tokens.get(token)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = _idf(n_docs, df)
+            for name in names:
+                tf = posting.get(name)
+                if not tf:
+                    continue
+                norm = 1 - _B + _B * (self._lengths[name] / avg_length if avg_length else 1.0)
+                scores[name] = scores.get(name, 0.0) + idf * tf * (_K1 + 1) / (tf + _K1 * norm)
+        return scores
+
+    def _add_field(self, name: str, text: str, weight: int = 1) -> None:
+        lowered = text.lower()
+        self._fields[name].append(lowered)
+        tokens = Counter(_TOKEN_RE.findall(lowered))
+        for token, count in tokens.items():
+            posting = self._tokens.setdefault(token, {})
+            posting[name] = posting.get(name, 0) + count * weight
+        length = sum(tokens.values()) * weight
+        self._lengths[name] += length
+        self._total_length += length
+        for gram in _trigrams(lowered):
+            posting = self._trigrams.setdefault(gram, {})
+            posting[name] = posting.get(name, 0) + 1
+
+    def _unpost(self, name: str, lowered: str, weight: int) -> None:
+        tokens = Counter(_TOKEN_RE.findall(lowered))
+        for token, count in tokens.items():
+            _decrement(self._tokens, token, name, count * weight)
+        length = sum(tokens.values()) * weight
+        self._lengths[name] = self._lengths.get(name, 0) - length
+        self._total_length -= length
+        for gram in _trigrams(lowered):
+            _decrement(self._trigrams, gram, name, 1)
+
+
+def _idf(n_docs: int, df: int) -> float:
+    return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+def _decrement(postings: dict[str, dict[str, int]], key: str, name: str, amount: int) -> None:
+    posting = postings.get(key)
+    if posting is None:
+        return
+    remaining = posting.get(name, 0) - amount
+    if remaining > 0:
+        posting[name] = remaining
+    else:
+        posting.pop(name, None)
+        if not posting:
+            del postings[key]
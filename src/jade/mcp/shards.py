@@ -0,0 +1,170 @@
+"""Hash-sharded JSONL layout for large knowledge graphs.
+
+A sharded graph lives in ``<file_path>.shards/``: N files
+``shard-0000.jsonl`` … ``shard-NNNN.jsonl`` in the usual JSONL record
+format, plus ``manifest.json`` recording N. An entity is stored in the
+shard its name hashes to and a relation in the shard of its ``from``
+entity, so a mutation dirties one or two shards and a save rewrites only
+those. The shards are independent files, so read_shards() parses them in
+worker processes (see pool_size() for when that pays off).
+
+Names are hashed with CRC-32 of their UTF-8 bytes, which, unlike
+``hash()``, is the same in every process and Python version.
+
+KnowledgeGraph(shards=N) uses this layout instead of its single file. It
+loads the shards with up to ``load_workers`` processes (default one per
+CPU), after which entities read in shard order rather than creation
+order. A graph with no layout yet (or one with a different shard count)
+is loaded from ``file_path`` and fully re-partitioned on its first write.
+From then on ``file_path`` is no longer written, so opening the graph
+without ``shards`` is refused. Sharding cannot be combined with lazy
+loading or binary snapshots. benchmarks/bench_shards.py compares the
+inline and process-pool loads.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from jade import codec
+from jade.mcp.snapshot import decode_columns, encode_snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from jade.mcp.snapshot import SnapshotColumns
+
+# Below this many bytes of shard files, starting worker processes costs more than it saves
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+_SHARD_FILE = re.compile(r"shard-(\d+)\.jsonl")
+
+
+def shard_of(name: str, shards: int) -> int:
+    """Index of the shard that stores ``name``."""
+    return zlib.crc32(name.encode("utf-8", "surrogatepass")) % shards
+
+
+def shard_dir(file_path: str) -> str:
+    return f"{file_path}.shards"
+
+
+def shard_path(directory: str, index: int) -> str:
+    return os.path.join(directory, f"shard-{index:04d}.jsonl")
+
+
+def manifest_path(directory: str) -> str:
+    return os.path.join(directory, "manifest.json")
+
+
+def read_manifest(directory: str) -> int | None:
+    """Shard count of the layout in ``directory``; None if there is none."""
+    try:
+        with open(manifest_path(directory), "rb") as f:
+            shards = codec.loads(f.read())["shards"]
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(shards, int) or isinstance(shards, bool) or shards < 1:
+        return None
+    return shards
+
+
+def write_manifest(directory: str, shards: int) -> None:
+    """Record the shard count (atomically), then delete shards beyond it."""
+    path = manifest_path(directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(codec.dumpb({"shards": shards}) + b"\n")
+    os.replace(tmp_path, path)
+    for filename in os.listdir(directory):
+        match = _SHARD_FILE.fullmatch(filename)
+        if match and int(match.group(1)) >= shards:
+            os.unlink(os.path.join(directory, filename))
+
+
+def write_shard(path: str, entities: Iterable[dict[str, Any]], relations: Iterable[dict[str, Any]]) -> None:
+    """Write one shard's records (atomically)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        for entity in entities:
+            f.write(codec.dumpb({**entity, "type": "entity"}) + b"\n")
+        for relation in relations:
+            f.write(codec.dumpb({**relation, "type": "relation"}) + b"\n")
+    os.replace(tmp_path, path)
+
+
+def read_records(path: str) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Entity and relation records of a JSONL file, without their ``type`` tag.
+
+    Corrupt lines are skipped; a missing or unreadable file has no records.
+    """
+    entities: list[dict[str, Any]] = []
+    relations: list[dict[str, Any]] = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    continue  # Skip corrupt lines, keep loading valid ones
+                if not isinstance(record, dict):
+                    continue
+                kind = record.pop("type", None)
+                if kind == "entity":
+                    entities.append(record)
+                elif kind == "relation":
+                    relations.append(record)
+    except OSError:
+        pass
+    return entities, relations
+
+
+def pool_size(paths: list[str], workers: int | None = None, min_bytes: int | None = None) -> int:
+    """How many processes should parse ``paths``; 1 means read them inline.
+
+    Up to ``workers`` (default: one per CPU) once the files together
+    reach ``min_bytes`` (default PARALLEL_MIN_BYTES).
+    """
+    if min_bytes is None:
+        min_bytes = PARALLEL_MIN_BYTES
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return 1
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            continue
+    return workers if total >= min_bytes else 1
+
+
+def read_shards(paths: list[str], workers: int) -> Iterator[SnapshotColumns]:
+    """Every path's records as snapshot columns, in order, parsed by ``workers`` processes.
+
+    Workers send back a binary snapshot rather than the records: it
+    pickles as a few byte strings and decodes here without per-record
+    work, where the records would cost about as much to unpickle as
+    the JSON did to parse.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(_shard_snapshot, paths):
+            yield decode_columns(data)
+
+
+def _shard_snapshot(path: str) -> bytes:
+    entities, relations = read_records(path)
+    if len({entity["name"] for entity in entities}) < len(entities):
+        # The snapshot holds one record per name; merge repeats as a load would
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(entities, relations)
+        entities, relations = [entity.to_dict() for entity in graph.entities], graph.relations
+    return encode_snapshot(entities, relations)
@@ -0,0 +1,500 @@
+"""Binary snapshot format for fast KnowledgeGraph cold start.
+
+JSONL stays the interchange/export format; the binary snapshot is a cache
+of one JSONL version that loads without a ``json.loads`` per line. Layout
+(little-endian, every section length-prefixed with a u64 byte count):
+
+    magic        b"JKGSNAP3"
+    header       JSON: source JSONL identity, counts, interned type table
+    names        string table: entity names in order (the prebuilt name
+                 index), then relation endpoints that have no entity
+    observations string table: every observation, in entity order
+    entity types u32 type-table id per entity
+    obs ends     u64 cumulative observation count per entity
+    rel from     u32 name id per relation
+    rel to       u32 name id per relation
+    rel types    u32 type-table id per relation
+    obs spans    u64 (start, end) byte range of each entity's observations
+                 within the observations table, for lazy per-entity decoding
+    obs times    f64 write time per observation, NaN where unknown
+                 (the JSONL ``observedAt`` lists, see recall)
+    extras       JSON: keys beyond name/entityType/observations of the
+                 entities that have any, by entity index, and likewise
+                 beyond from/to/relationType for relations
+
+A string table is one UTF-8 blob split on NUL in C (or a JSON array when a
+value contains NUL), and the columns are read straight into arrays, so the
+only per-record Python work is assembling entity dicts from slices.
+
+The header records which JSONL version the snapshot was built from, so
+KnowledgeGraph.load() only prefers it while that JSONL exists unchanged;
+KnowledgeGraph(binary_snapshot=True) refreshes it on every snapshot write.
+
+MappedSnapshot memory-maps a snapshot and decodes only names, types and
+relations; observations are decoded per entity on demand.
+
+Offline converter::
+
+    python -m jade.mcp.snapshot to-binary memory.jsonl [memory.jsonl.snap]
+    python -m jade.mcp.snapshot to-jsonl memory.jsonl.snap memory.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from jade.mcp.compact import OBSERVED_AT
+
+# Keys stored in columns; any others go in the extras section
+_COLUMN_KEYS = frozenset(("name", "entityType", "observations", OBSERVED_AT))
+_RELATION_KEYS = frozenset(("from", "to", "relationType"))
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+MAGIC = b"JKGSNAP3"
+_LEN = struct.Struct("<Q")
+_SEPARATOR = "\x00"
+_SECTIONS = 11
+_EMPTY_FLAG = 1 << 63
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable binary snapshot."""
+
+
+@dataclass
+class Snapshot:
+    """Decoded snapshot contents. Observation lists hold unique strings."""
+
+    source: list[int] | None
+    entities: list[dict[str, Any]] = field(default_factory=list)
+    relations: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class SnapshotColumns:
+    """Snapshot contents as stored, before any record is assembled.
+
+    Entity ``i`` is ``names[i]`` of type ``types[entity_types[i]]`` with
+    observations ``observations[obs_ends[i - 1]:obs_ends[i]]`` written at
+    the matching ``obs_times`` (NaN when unknown). Relation ``j`` links
+    ``names[rel_from[j]]`` to ``names[rel_to[j]]``; ``names`` continues
+    past the entities with relation endpoints that have no entity record.
+    """
+
+    source: list[int] | None
+    names: list[str]
+    types: list[str]
+    entity_types: array
+    observations: list[str]
+    obs_ends: array
+    obs_times: array
+    rel_from: array
+    rel_to: array
+    rel_types: array
+    entity_extras: dict[int, dict[str, Any]]
+    relation_extras: dict[int, dict[str, Any]]
+
+
+def file_identity(path: str) -> list[int] | None:
+    """Identify one version of a file by (inode, size, mtime). None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def snapshot_path(jsonl_path: str) -> str:
+    """Where the binary snapshot for a JSONL file lives."""
+    return f"{jsonl_path}.snap"
+
+
+def write_snapshot(
+    path: str,
+    entities: Iterable[dict[str, Any]],
+    relations: Iterable[dict[str, Any]],
+    source: list[int] | None = None,
+) -> None:
+    """Write entities and relations as a binary snapshot (atomically)."""
+    data = encode_snapshot(entities, relations, source)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def encode_snapshot(
+    entities: Iterable[dict[str, Any]],
+    relations: Iterable[dict[str, Any]],
+    source: list[int] | None = None,
+) -> bytes:
+    """Binary snapshot bytes of entities and relations; entity names must be unique."""
+    names: dict[str, int] = {}
+    types: dict[str, int] = {}
+
+    def type_id(value: str) -> int:
+        tid = types.get(value)
+        if tid is None:
+            tid = types[value] = len(types)
+        return tid
+
+    observations: list[str] = []
+    entity_types, obs_ends, obs_times = array("I"), array("Q"), array("d")
+    entity_extras: dict[str, dict[str, Any]] = {}
+    for entity in entities:
+        extra = {key: value for key, value in entity.items() if key not in _COLUMN_KEYS}
+        if extra:
+            entity_extras[str(len(entity_types))] = extra
+        names.setdefault(entity["name"], len(names))
+        entity_types.append(type_id(entity.get("entityType", "Concept")))
+        unique = list(dict.fromkeys(entity.get("observations", [])))
+        observations.extend(unique)
+        obs_ends.append(len(observations))
+        times = entity.get(OBSERVED_AT)
+        if isinstance(times, list):
+            stamps = dict(zip(entity["observations"], times, strict=False))
+            obs_times.extend(_time_or_nan(stamps.get(o)) for o in unique)
+        else:
+            obs_times.extend([math.nan] * len(unique))
+    entity_count = len(names)
+    obs_table, obs_spans = _encode_observations(observations, obs_ends)
+
+    rel_from, rel_to, rel_types = array("I"), array("I"), array("I")
+    relation_extras: dict[str, dict[str, Any]] = {}
+    for relation in relations:
+        if len(relation) > 3:
+            relation_extras[str(len(rel_from))] = {k: v for k, v in relation.items() if k not in _RELATION_KEYS}
+        # Endpoints without an entity record get ids past the entity names
+        rel_from.append(names.setdefault(relation["from"], len(names)))
+        rel_to.append(names.setdefault(relation["to"], len(names)))
+        rel_types.append(type_id(relation["relationType"]))
+
+    header = {
+        "source": source,
+        "entities": entity_count,
+        "relations": len(rel_from),
+        "types": list(types),
+    }
+    f = io.BytesIO()
+    f.write(MAGIC)
+    _write_section(f, json.dumps(header).encode("utf-8"))
+    _write_section(f, _encode_strings(list(names)))
+    _write_section(f, obs_table)
+    for column in (entity_types, obs_ends, rel_from, rel_to, rel_types, obs_spans, obs_times):
+        _write_section(f, _to_le(column).tobytes())
+    _write_section(f, json.dumps({"entities": entity_extras, "relations": relation_extras}).encode("utf-8"))
+    return f.getvalue()
+
+
+def read_snapshot(path: str) -> Snapshot:
+    """Decode a binary snapshot file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return decode_snapshot(data)
+
+
+def read_columns(path: str) -> SnapshotColumns:
+    """Decode a binary snapshot file into columns (see SnapshotColumns)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return decode_columns(data)
+
+
+def decode_snapshot(data: bytes | memoryview) -> Snapshot:
+    """Decode binary snapshot bytes (e.g. a file read or a memory map)."""
+    columns = decode_columns(data)
+    names, types, observations, obs_times = columns.names, columns.types, columns.observations, columns.obs_times
+    entities = []
+    start = 0
+    for index, (name, type_idx, end) in enumerate(zip(names, columns.entity_types, columns.obs_ends, strict=False)):
+        entity = {"name": name, "entityType": types[type_idx], "observations": observations[start:end]}
+        times = _times(obs_times[start:end])
+        if times is not None:
+            entity[OBSERVED_AT] = times
+        extra = columns.entity_extras.get(index)
+        if extra:
+            entity.update(extra)
+        entities.append(entity)
+        start = end
+    relations = _relations(names, types, columns.rel_from, columns.rel_to, columns.rel_types, columns.relation_extras)
+    return Snapshot(source=columns.source, entities=entities, relations=relations)
+
+
+def decode_columns(data: bytes | memoryview) -> SnapshotColumns:
+    """Decode binary snapshot bytes into columns, assembling no records."""
+    view = memoryview(data)
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        msg = "not a jade knowledge graph snapshot"
+        raise SnapshotError(msg)
+    header, sections = _read_sections(view)
+    entity_types, obs_ends, rel_from, rel_to, rel_types, _spans, obs_times = (
+        _from_le(code, section) for code, section in zip("IQIIIQd", sections[3:10], strict=True)
+    )
+    entity_extras, relation_extras = _decode_extras(sections[10])
+    return SnapshotColumns(
+        source=header.get("source"),
+        names=_decode_strings(sections[1], len(entity_types) + len(rel_from)),
+        types=header["types"],
+        entity_types=entity_types,
+        observations=_decode_strings(sections[2], obs_ends[-1] if obs_ends else 0),
+        obs_ends=obs_ends,
+        obs_times=obs_times,
+        rel_from=rel_from,
+        rel_to=rel_to,
+        rel_types=rel_types,
+        entity_extras=entity_extras,
+        relation_extras=relation_extras,
+    )
+
+
+class MappedSnapshot:
+    """A memory-mapped snapshot with only names, types and relations decoded.
+
+    ``names[i]`` / ``entity_types[i]`` describe entity ``i``, whose
+    observations observations(i) decodes straight from the mapping.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            view = memoryview(self._map)
+            if bytes(view[: len(MAGIC)]) != MAGIC:
+                msg = "not a jade knowledge graph snapshot"
+                raise SnapshotError(msg)
+            header, sections = _read_sections(view)
+            table = sections[2]
+            if bytes(table[:1]) != b"S":
+                msg = "observations table is not sliceable; load this snapshot eagerly"
+                raise SnapshotError(msg)
+            entity_types, ends, rel_from, rel_to, rel_types, spans, times = (
+                _from_le(code, section) for code, section in zip("IQIIIQd", sections[3:10], strict=True)
+            )
+            count = header["entities"]
+            names = _decode_strings(sections[1], count + len(rel_from))
+            extras, relation_extras = _decode_extras(sections[10])
+        except SnapshotError:
+            raise
+        except (ValueError, KeyError, IndexError, TypeError) as exc:
+            raise SnapshotError(str(exc)) from exc
+        types = header["types"]
+        self.source: list[int] | None = header.get("source")
+        self.names = names[:count]
+        self.entity_types = [types[t] for t in entity_types]
+        self.relations = _relations(names, types, rel_from, rel_to, rel_types, relation_extras)
+        self._observations = table[1:]
+        self._spans = spans
+        self._ends = ends
+        self._times = times
+        self._extras = extras
+
+    def observations(self, index: int) -> list[str]:
+        start, end = self._spans[2 * index], self._spans[2 * index + 1]
+        if start & _EMPTY_FLAG:
+            return [""]
+        if start == end:
+            return []
+        return str(self._observations[start:end], "utf-8", "surrogatepass").split(_SEPARATOR)
+
+    def observed_at(self, index: int) -> list[float | None] | None:
+        """Write times of entity ``index``'s observations, or None if none are known."""
+        start = self._ends[index - 1] if index else 0
+        return _times(self._times[start : self._ends[index]])
+
+    def extra(self, index: int) -> dict[str, Any] | None:
+        """Entity ``index``'s keys beyond name, entityType and observations, if it has any."""
+        return self._extras.get(index)
+
+    def close(self) -> None:
+        self._observations.release()
+        self._map.close()
+
+
+def read_source(path: str) -> list[int] | None:
+    """The JSONL identity recorded in a snapshot header, without decoding the rest."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            msg = "not a jade knowledge graph snapshot"
+            raise SnapshotError(msg)
+        (length,) = _LEN.unpack(f.read(_LEN.size))
+        return json.loads(f.read(length)).get("source")
+
+
+def _encode_observations(observations: list[str], obs_ends: array) -> tuple[bytes, array]:
+    """Observation string table plus each entity's byte span within it."""
+    spans = array("Q")
+    if any(_SEPARATOR in value for value in observations):
+        spans.extend([0] * (2 * len(obs_ends)))  # JSON tables cannot be sliced
+        return b"J" + json.dumps(observations).encode("utf-8"), spans
+    chunks: list[bytes] = []
+    pos = start = 0
+    for end in obs_ends:
+        if end == start:
+            spans.extend((pos, pos))
+            continue
+        if chunks:
+            pos += 1  # Separator between entities
+        chunk = _SEPARATOR.join(observations[start:end]).encode("utf-8", "surrogatepass")
+        chunks.append(chunk)
+        # A lone "" observation also has a zero-width span; flag it
+        spans.extend((pos | _EMPTY_FLAG, pos) if not chunk else (pos, pos + len(chunk)))
+        pos += len(chunk)
+        start = end
+    return b"S" + b"\x00".join(chunks), spans
+
+
+def _time_or_nan(at: Any) -> float:
+    return float(at) if isinstance(at, int | float) and not isinstance(at, bool) else math.nan
+
+
+def _times(column: array) -> list[float | None] | None:
+    """An ``observedAt`` list for a slice of the times column; None if every time is unknown."""
+    times = [None if math.isnan(at) else at for at in column]
+    return times if any(at is not None for at in times) else None
+
+
+def _decode_extras(section: memoryview) -> tuple[dict[int, dict[str, Any]], dict[int, dict[str, Any]]]:
+    """Entity and relation extras by index."""
+    extras = json.loads(bytes(section))
+    entities = {int(index): extra for index, extra in extras.get("entities", {}).items()}
+    relations = {int(index): extra for index, extra in extras.get("relations", {}).items()}
+    return entities, relations
+
+
+def _relations(
+    names: list[str],
+    types: list[str],
+    rel_from: array,
+    rel_to: array,
+    rel_types: array,
+    extras: dict[int, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    relations = [
+        {"from": names[f], "to": names[t], "relationType": types[r]}
+        for f, t, r in zip(rel_from, rel_to, rel_types, strict=True)
+    ]
+    for index, extra in extras.items():
+        relations[index].update(extra)
+    return relations
+
+
+def _encode_strings(values: list[str]) -> bytes:
+    """NUL-joined UTF-8 (split back in C), or a JSON array if a value contains NUL."""
+    if any(_SEPARATOR in value for value in values):
+        return b"J" + json.dumps(values).encode("utf-8")
+    return b"S" + _SEPARATOR.join(values).encode("utf-8", "surrogatepass")
+
+
+def _decode_strings(section: memoryview, count: int) -> list[str]:
+    kind, payload = bytes(section[:1]), section[1:]
+    if kind == b"J":
+        return json.loads(bytes(payload))
+    if kind != b"S":
+        msg = "unknown string table encoding"
+        raise SnapshotError(msg)
+    if not count:
+        return []  # Otherwise an empty payload is a table holding one ""
+    return str(payload, "utf-8", "surrogatepass").split(_SEPARATOR)
+
+
+def _read_sections(view: memoryview) -> tuple[dict[str, Any], list[memoryview]]:
+    sections = _split_sections(view, len(MAGIC))
+    if len(sections) != _SECTIONS:
+        msg = f"snapshot has {len(sections)} sections, expected {_SECTIONS}"
+        raise SnapshotError(msg)
+    return json.loads(bytes(sections[0])), sections
+
+
+def _write_section(f: BinaryIO, payload: bytes) -> None:
+    f.write(_LEN.pack(len(payload)))
+    f.write(payload)
+
+
+def _split_sections(view: memoryview, pos: int) -> list[memoryview]:
+    sections = []
+    while pos < len(view):
+        if pos + _LEN.size > len(view):
+            msg = "truncated snapshot"
+            raise SnapshotError(msg)
+        (length,) = _LEN.unpack_from(view, pos)
+        pos += _LEN.size
+        if pos + length > len(view):
+            msg = "truncated snapshot"
+            raise SnapshotError(msg)
+        sections.append(view[pos : pos + length])
+        pos += length
+    return sections
+
+
+def _to_le(column: array) -> array:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def _from_le(typecode: str, section: memoryview) -> array:
+    column = array(typecode)
+    column.frombytes(section)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+# ── Offline converter ──────────────────────────────────────────
+
+
+def jsonl_to_snapshot(jsonl_path: str, snap_path: str | None = None) -> str:
+    """Convert a JSONL memory file to a binary snapshot. Returns the snapshot path."""
+    from jade.mcp.memory_server import KnowledgeGraph
+
+    graph = KnowledgeGraph(file_path=jsonl_path)
+    graph.import_jsonl(jsonl_path)
+    out = snap_path or snapshot_path(jsonl_path)
+    entities = [entity.to_dict() for entity in graph.entities]
+    write_snapshot(out, entities, graph.relations, source=file_identity(jsonl_path))
+    return out
+
+
+def snapshot_to_jsonl(snap_path: str, jsonl_path: str) -> None:
+    """Export a binary snapshot back to the JSONL interchange format."""
+    from jade.mcp.memory_server import KnowledgeGraph
+
+    snapshot = read_snapshot(snap_path)
+    graph = KnowledgeGraph(snapshot.entities, snapshot.relations, file_path=jsonl_path)
+    graph.export_jsonl(jsonl_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade.mcp.snapshot", description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_binary = commands.add_parser("to-binary", help="JSONL → binary snapshot")
+    to_binary.add_argument("jsonl")
+    to_binary.add_argument("snapshot", nargs="?")
+    to_jsonl = commands.add_parser("to-jsonl", help="binary snapshot → JSONL")
+    to_jsonl.add_argument("snapshot")
+    to_jsonl.add_argument("jsonl")
+    args = parser.parse_args(argv)
+
+    if args.command == "to-binary":
+        print(jsonl_to_snapshot(args.jsonl, args.snapshot))
+    else:
+        snapshot_to_jsonl(args.snapshot, args.jsonl)
+        print(args.jsonl)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,692 @@
+"""SQLite storage engine for the knowledge graph.
+
+SqliteKnowledgeGraph has the same interface as KnowledgeGraph but keeps
+the graph in a SQLite database in WAL mode instead of in memory:
+
+- ``entities``: one row per entity; ``observations``: one row per
+  observation, in insertion order, with its write time (``created_at``,
+  indexed for date-range recall, see recall); ``relations``: one row per
+  (from, to, relationType) triple, indexed on both endpoints
+- ``search``: an FTS5 trigram index with one row per entity (name and
+  type) and one per observation, kept current by triggers
+- ``changes``: the change feed (see changes), one op record per
+  mutation keyed by its seq, trimmed to the last ``change_retention``
+- ``meta``: settings of the database itself, e.g. the change feed's
+  ``history`` id, created with it
+
+Each mutation is a single small transaction and each read an indexed
+query, so nothing is loaded at startup and nothing is rewritten on save.
+Search keeps the case-insensitive substring semantics of search_index,
+ranked by FTS5's BM25 with name hits weighted double; queries shorter
+than a trigram fall back to a LIKE scan.
+
+Each thread gets its own connection. reading() / writing() hold one
+transaction across several calls (a consistent snapshot, or a batch that
+commits once); other processes may open the same database concurrently.
+
+JSONL files convert both ways without taking the graph offline: imports
+commit in batches, so readers are never blocked for long::
+
+    python -m jade.mcp.sqlite_store import memory.jsonl memory.db
+    python -m jade.mcp.sqlite_store export memory.db memory.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from jade import codec
+from jade.mcp.changes import check_change_args
+from jade.mcp.compact import OBSERVED_AT
+from jade.mcp.recall import DEFAULT_LIMIT, check_recall_args, now, rank
+from jade.mcp.traversal import Direction, breadth_first
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Iterator
+    from contextlib import AbstractContextManager
+
+# File suffixes load_graph() serves from SQLite instead of JSONL
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# SQLite caps bound parameters per statement; chunk IN (...) lists below it
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    entity_type TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    entity_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE,
+    content TEXT NOT NULL,
+    created_at REAL,
+    UNIQUE (entity_id, content)
+);
+CREATE INDEX IF NOT EXISTS observations_by_entity ON observations(entity_id, id);
+CREATE TABLE IF NOT EXISTS relations (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    relation_type TEXT NOT NULL,
+    UNIQUE (source, target, relation_type)
+);
+CREATE INDEX IF NOT EXISTS relations_by_target ON relations(target);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('history', lower(hex(randomblob(16))));
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(name, content, entity_id UNINDEXED, tokenize='trigram');
+
+-- Entity rows use rowid -id, observation rows the observation id
+CREATE TRIGGER IF NOT EXISTS entities_search_insert AFTER INSERT ON entities BEGIN
+    INSERT INTO search(rowid, name, content, entity_id) VALUES (-new.id, new.name, new.entity_type, new.id);
+END;
+CREATE TRIGGER IF NOT EXISTS entities_search_delete AFTER DELETE ON entities BEGIN
+    DELETE FROM search WHERE rowid = -old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS observations_search_insert AFTER INSERT ON observations BEGIN
+    INSERT INTO search(rowid, name, content, entity_id) VALUES (new.id, '', new.content, new.entity_id);
+END;
+CREATE TRIGGER IF NOT EXISTS observations_search_delete AFTER DELETE ON observations BEGIN
+    DELETE FROM search WHERE rowid = old.id;
+END;
+"""
+
+
+class SqliteKnowledgeGraph:
+    """Knowledge graph stored in a SQLite database (see module docstring)."""
+
+    def __init__(
+        self, file_path: str = "./memory.db", *, busy_timeout_ms: int = 5000, change_retention: int = 100_000
+    ) -> None:
+        if busy_timeout_ms < 0:
+            msg = "busy_timeout_ms must be non-negative"
+            raise ValueError(msg)
+        if change_retention <= 0:
+            msg = "change_retention must be positive"
+            raise ValueError(msg)
+        self.file_path = file_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.change_retention = change_retention
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    @property
+    def entities(self) -> list[dict[str, Any]]:
+        """All entities in insertion order."""
+        with self._transaction(write=False) as conn:
+            return list(self._iter_entities(conn))
+
+    @property
+    def relations(self) -> list[dict[str, Any]]:
+        """All relations in insertion order."""
+        with self._transaction(write=False) as conn:
+            return [
+                _relation(row)
+                for row in conn.execute("SELECT source, target, relation_type FROM relations ORDER BY id")
+            ]
+
+    @property
+    def generation(self) -> int:
+        """Seq of the latest change; every committed mutation, from any process, bumps it."""
+        with self._transaction(write=False) as conn:
+            return _latest_seq(conn)
+
+    @property
+    def history(self) -> str:
+        """Identifies the change numbering; changes_since() seqs are only valid within it."""
+        with self._transaction(write=False) as conn:
+            return _history(conn)
+
+    def reading(self) -> AbstractContextManager[None]:
+        """Hold one read transaction (a consistent snapshot) across several reads."""
+        return self._hold(write=False)
+
+    def writing(self) -> AbstractContextManager[None]:
+        """Hold one write transaction across several mutations; they commit together."""
+        return self._hold(write=True)
+
+    def transaction(self) -> AbstractContextManager[None]:
+        """Apply several mutations atomically: the same write transaction as writing()."""
+        return self._hold(write=True)
+
+    @contextmanager
+    def _hold(self, *, write: bool) -> Iterator[None]:
+        with self._transaction(write=write):
+            yield
+
+    def load(self) -> None:
+        """Create the schema if the database is new (or upgrade it). Nothing is read into memory."""
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        if "created_at" not in {row[1] for row in conn.execute("PRAGMA table_info(observations)")}:
+            conn.execute("ALTER TABLE observations ADD COLUMN created_at REAL")  # Older observations have none
+        conn.execute("CREATE INDEX IF NOT EXISTS observations_by_time ON observations(created_at)")
+
+    def save(self) -> None:
+        """No-op: every mutation is committed by its own transaction."""
+
+    def flush(self) -> None:
+        """No-op, like save()."""
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: _transaction() issues BEGIN/COMMIT itself
+            conn = sqlite3.connect(
+                self.file_path, isolation_level=None, check_same_thread=False, timeout=self.busy_timeout_ms / 1000
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.write = False
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self, *, write: bool) -> Iterator[sqlite3.Connection]:
+        """A transaction on this thread's connection; nested calls join the outer one."""
+        conn = self._connection()
+        state = self._local
+        if state.depth:
+            if write and not state.write:
+                msg = "cannot take the write lock while holding the read lock"
+                raise RuntimeError(msg)
+            state.depth += 1
+            try:
+                yield conn
+            finally:
+                state.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        state.depth, state.write = 1, write
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            state.depth, state.write = 0, False
+
+    # ── Reads ───────────────────────────────────────────────────
+
+    def find_entity(self, name: str) -> dict[str, Any] | None:
+        with self._transaction(write=False) as conn:
+            row = conn.execute("SELECT id, name, entity_type FROM entities WHERE name = ?", (name,)).fetchone()
+            return None if row is None else self._with_observations(conn, [row])[0]
+
+    def search(self, query: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """Entities whose name, type or an observation contains ``query``, best first."""
+        with self._transaction(write=False) as conn:
+            return self._with_observations(conn, _matching_rows(conn, query, limit))
+
+    def recall(
+        self,
+        query: str,
+        limit: int | None = DEFAULT_LIMIT,
+        entity_types: Collection[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Up to ``limit`` entities matching ``query``, ranked by relevance and recency (see recall).
+
+        The type and time filters run inside the search query; the time
+        range is looked up in the ``observations_by_time`` index.
+        """
+        check_recall_args(limit, since, until)
+        low = -math.inf if since is None else since
+        high = math.inf if until is None else until
+        where = ""
+        params: list[Any] = []
+        if entity_types is not None:
+            types = list(entity_types)
+            where += f" AND e.entity_type IN ({','.join('?' * len(types))})"
+            params += types
+        if since is not None or until is not None:
+            where += " AND e.id IN (SELECT entity_id FROM observations WHERE created_at BETWEEN ? AND ?)"
+            params += [low, high]
+        with self._transaction(write=False) as conn:
+            rows = _matching_rows(conn, query, None, where, params)
+            names = {row[0]: row[1] for row in rows}
+            latest: dict[str, float] = {}
+            for chunk in _chunks(list(names)):
+                for entity_id, at in conn.execute(
+                    "SELECT entity_id, max(created_at) FROM observations"  # noqa: S608
+                    f" WHERE entity_id IN ({','.join('?' * len(chunk))}) AND created_at BETWEEN ? AND ?"
+                    " GROUP BY entity_id",
+                    [*chunk, low, high],
+                ):
+                    latest[names[entity_id]] = at
+            by_name = {row[1]: row for row in rows}
+            ranked = rank(list(by_name), latest, limit)
+            return self._with_observations(conn, [by_name[name] for name in ranked])
+
+    def has_relation(self, from_entity: str, to_entity: str, relation_type: str) -> bool:
+        with self._transaction(write=False) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM relations WHERE source = ? AND target = ? AND relation_type = ?",
+                (from_entity, to_entity, relation_type),
+            ).fetchone()
+            return row is not None
+
+    def relations_of(self, names: Iterable[str]) -> list[dict[str, Any]]:
+        """Relations with either endpoint in ``names``, each listed once."""
+        ids: dict[int, tuple[str, str, str]] = {}
+        with self._transaction(write=False) as conn:
+            for chunk in _chunks(list(dict.fromkeys(names))):
+                marks = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    f"SELECT id, source, target, relation_type FROM relations WHERE source IN ({marks})"  # noqa: S608
+                    f" UNION SELECT id, source, target, relation_type FROM relations WHERE target IN ({marks})",
+                    [*chunk, *chunk],
+                ):
+                    ids[row[0]] = row[1:]
+        return [_relation(ids[key]) for key in sorted(ids)]
+
+    def traverse(
+        self,
+        names: Iterable[str],
+        max_depth: int = 2,
+        relation_types: Collection[str] | None = None,
+        direction: Direction = Direction.BOTH,
+        max_nodes: int = 100,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], bool]:
+        """Entities within ``max_depth`` hops of ``names``, nearest first (see traversal)."""
+        with self._transaction(write=False) as conn:
+            depths, keys, truncated = breadth_first(
+                names,
+                lambda frontier, way: self._edges_of(conn, frontier, way),
+                max_depth,
+                relation_types,
+                Direction(direction),
+                max_nodes,
+            )
+            found: list[tuple[int, str, str]] = []
+            for chunk in _chunks(list(depths)):
+                found += conn.execute(
+                    f"SELECT id, name, entity_type FROM entities WHERE name IN ({','.join('?' * len(chunk))})",  # noqa: S608
+                    chunk,
+                ).fetchall()
+            order = {name: i for i, name in enumerate(depths)}
+            found.sort(key=lambda row: order[row[1]])
+            entities = self._with_observations(conn, found)
+        return entities, [_relation(key) for key in keys], truncated
+
+    @staticmethod
+    def _edges_of(conn: sqlite3.Connection, names: list[str], direction: Direction) -> Iterator[tuple[str, str, str]]:
+        columns = {Direction.OUT: ["source"], Direction.IN: ["target"], Direction.BOTH: ["source", "target"]}[direction]
+        for column in columns:
+            for chunk in _chunks(names):
+                yield from conn.execute(
+                    f"SELECT source, target, relation_type FROM relations WHERE {column} IN"  # noqa: S608
+                    f" ({','.join('?' * len(chunk))}) ORDER BY id",
+                    chunk,
+                )
+
+    def read_page(
+        self, offset: int = 0, limit: int | None = None, entity_types: Collection[str] | None = None
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int | None]:
+        """Up to ``limit`` records of the graph, resuming at position ``offset``.
+
+        The graph reads as every entity in insertion order, then every
+        relation; ``entity_types`` keeps only entities of those types and
+        relations touching one of them, and positions count the kept
+        records. Returns (entities, relations, next offset), with None once
+        the graph is exhausted.
+        """
+        types = list(entity_types) if entity_types is not None else []
+        entity_where = relation_where = ""
+        relation_params: list[str] = []
+        if entity_types is not None:
+            entity_where = f" WHERE entity_type IN ({','.join('?' * len(types))})"
+            selected = f"(SELECT name FROM entities{entity_where})"
+            relation_where = f" WHERE source IN {selected} OR target IN {selected}"
+            relation_params = [*types, *types]
+        take = -1 if limit is None else limit
+        with self._transaction(write=False) as conn:
+            entity_count = conn.execute(f"SELECT count(*) FROM entities{entity_where}", types).fetchone()[0]  # noqa: S608
+            relation_count = conn.execute(
+                f"SELECT count(*) FROM relations{relation_where}",  # noqa: S608
+                relation_params,
+            ).fetchone()[0]
+            entities: list[dict[str, Any]] = []
+            if offset < entity_count:
+                rows = conn.execute(
+                    f"SELECT id, name, entity_type FROM entities{entity_where} ORDER BY id LIMIT ? OFFSET ?",  # noqa: S608
+                    [*types, take, offset],
+                ).fetchall()
+                entities = self._with_observations(conn, rows)
+            relations: list[dict[str, Any]] = []
+            if limit is None or len(entities) < limit:
+                rows = conn.execute(
+                    f"SELECT source, target, relation_type FROM relations{relation_where}"  # noqa: S608
+                    " ORDER BY id LIMIT ? OFFSET ?",
+                    [*relation_params, -1 if limit is None else limit - len(entities), max(0, offset - entity_count)],
+                ).fetchall()
+                relations = [_relation(row) for row in rows]
+        position = max(offset, 0) + len(entities) + len(relations)
+        return entities, relations, position if position < entity_count + relation_count else None
+
+    def _with_observations(self, conn: sqlite3.Connection, rows: list[tuple[int, str, str]]) -> list[dict[str, Any]]:
+        """Entity dicts for (id, name, entity_type) rows, observations attached."""
+        observations: dict[int, list[str]] = {row[0]: [] for row in rows}
+        for chunk in _chunks(list(observations)):
+            marks = ",".join("?" * len(chunk))
+            for entity_id, content in conn.execute(
+                f"SELECT entity_id, content FROM observations WHERE entity_id IN ({marks}) ORDER BY id",  # noqa: S608
+                chunk,
+            ):
+                observations[entity_id].append(content)
+        return [
+            {"name": name, "entityType": entity_type, "observations": observations[i]} for i, name, entity_type in rows
+        ]
+
+    def _iter_entities(self, conn: sqlite3.Connection, *, times: bool = False) -> Iterator[dict[str, Any]]:
+        """Every entity in insertion order; ``times`` adds the JSONL ``observedAt`` list where known."""
+        rows = conn.execute(
+            "SELECT e.id, e.name, e.entity_type, o.content, o.created_at FROM entities AS e"
+            " LEFT JOIN observations AS o ON o.entity_id = e.id ORDER BY e.id, o.id"
+        )
+        for (_, name, entity_type), group in itertools.groupby(rows, key=lambda row: row[:3]):
+            members = [row[3:] for row in group if row[3] is not None]
+            entity = {"name": name, "entityType": entity_type, "observations": [content for content, _ in members]}
+            if times and any(at is not None for _, at in members):
+                entity[OBSERVED_AT] = [at for _, at in members]
+            yield entity
+
+    def changes_since(
+        self, seq: int, limit: int | None = None, history: str | None = None
+    ) -> tuple[list[dict[str, Any]], int, bool]:
+        """Up to ``limit`` changes numbered after ``seq``, oldest first (see KnowledgeGraph.changes_since)."""
+        check_change_args(seq, limit)
+        with self._transaction(write=False) as conn:
+            current = _latest_seq(conn)
+            (oldest,) = conn.execute("SELECT min(seq) FROM changes").fetchone()
+            if seq > current or (oldest is not None and seq < oldest - 1) or history not in (None, _history(conn)):
+                return [], current, True
+            rows = conn.execute(
+                "SELECT seq, op FROM changes WHERE seq > ? ORDER BY seq LIMIT ?", (seq, -1 if limit is None else limit)
+            ).fetchall()
+        changes = [{**codec.loads(op), "seq": change_seq} for change_seq, op in rows]
+        if limit is not None and len(changes) == limit:
+            return changes, changes[-1]["seq"], False
+        return changes, current, False
+
+    # ── Mutations ───────────────────────────────────────────────
+
+    def _log_change(self, conn: sqlite3.Connection, op: dict[str, Any]) -> None:
+        seq = conn.execute("INSERT INTO changes(op) VALUES (?)", (codec.dumps(op),)).lastrowid
+        conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - self.change_retention,))
+
+    def upsert_entity(self, name: str, entity_type: str = "Concept", observations: list[str] | None = None) -> None:
+        """Create an entity, or merge observations into an existing one."""
+        at = now()
+        with self._transaction(write=True) as conn:
+            _upsert(conn, name, entity_type, observations or [], itertools.repeat(at))
+            op = {
+                "op": "upsert_entity",
+                "name": name,
+                "entityType": entity_type,
+                "observations": observations or [],
+                "at": at,
+            }
+            self._log_change(conn, op)
+
+    def add_observations(self, name: str, contents: list[str]) -> bool:
+        """Append observations to an existing entity. False if it does not exist."""
+        with self._transaction(write=True) as conn:
+            row = conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return False
+            at = now()
+            _insert_observations(conn, row[0], contents, itertools.repeat(at))
+            self._log_change(conn, {"op": "add_observations", "name": name, "contents": contents, "at": at})
+            return True
+
+    def delete_entities(self, names: list[str]) -> None:
+        """Delete entities and every relation touching them."""
+        with self._transaction(write=True) as conn:
+            conn.executemany("DELETE FROM entities WHERE name = ?", [(name,) for name in names])
+            conn.executemany("DELETE FROM relations WHERE source = ?1 OR target = ?1", [(name,) for name in names])
+            self._log_change(conn, {"op": "delete_entities", "names": names})
+
+    def delete_observations(self, name: str, observations: list[str]) -> None:
+        """Remove specific observations from an entity."""
+        with self._transaction(write=True) as conn:
+            conn.executemany(
+                "DELETE FROM observations WHERE entity_id = (SELECT id FROM entities WHERE name = ?) AND content = ?",
+                [(name, observation) for observation in observations],
+            )
+            self._log_change(conn, {"op": "delete_observations", "name": name, "observations": observations})
+
+    def create_relation(self, from_entity: str, to_entity: str, relation_type: str) -> bool:
+        """Add a directed relation. False if the exact relation already exists."""
+        with self._transaction(write=True) as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO relations(source, target, relation_type) VALUES (?, ?, ?)",
+                (from_entity, to_entity, relation_type),
+            )
+            if cursor.rowcount != 1:
+                return False
+            op = {"op": "create_relation", "from": from_entity, "to": to_entity, "relationType": relation_type}
+            self._log_change(conn, op)
+            return True
+
+    def delete_relations(self, triples: list[tuple[str, str, str]]) -> None:
+        """Delete relations matching any (from, to, relationType) triple."""
+        with self._transaction(write=True) as conn:
+            conn.executemany(
+                "DELETE FROM relations WHERE source = ? AND target = ? AND relation_type = ?",
+                [tuple(triple) for triple in triples],
+            )
+            self._log_change(conn, {"op": "delete_relations", "relations": [list(t) for t in triples]})
+
+    # ── JSONL interchange ───────────────────────────────────────
+
+    def import_jsonl(self, path: str, batch_size: int = 10_000) -> int:
+        """Merge a JSONL memory file into the database; returns the records read.
+
+        Records are committed ``batch_size`` at a time, so a large import
+        never holds the write lock for long and the graph stays usable.
+        Corrupt lines are skipped, as load() does for JSONL graphs.
+        Observations keep the write times recorded in the file, if any.
+        """
+        if batch_size <= 0:
+            msg = "batch_size must be positive"
+            raise ValueError(msg)
+        count = 0
+        with open(path, "rb") as f:
+            records = (record for record in map(_parse_line, f) if record is not None)
+            while batch := list(itertools.islice(records, batch_size)):
+                with self._transaction(write=True) as conn:
+                    for kind, record in batch:
+                        if kind == "entity":
+                            self._import_entity(conn, record)
+                        else:
+                            self.create_relation(record["from"], record["to"], record["relationType"])
+                count += len(batch)
+        return count
+
+    def _import_entity(self, conn: sqlite3.Connection, record: dict[str, Any]) -> None:
+        name, entity_type, observations = record["name"], record.get("entityType", ""), record.get("observations", [])
+        times = record.get(OBSERVED_AT)
+        stamps = (
+            (at if isinstance(at, int | float) and not isinstance(at, bool) else None for at in times)
+            if isinstance(times, list)
+            else itertools.repeat(None)
+        )
+        _upsert(conn, name, entity_type, observations, stamps)
+        op = {"op": "upsert_entity", "name": name, "entityType": entity_type, "observations": observations}
+        self._log_change(conn, op)
+
+    def export_jsonl(self, path: str) -> None:
+        """Write the whole graph to a JSONL file (atomically) from one consistent snapshot."""
+        tmp_path = f"{path}.tmp"
+        with self._transaction(write=False) as conn, open(tmp_path, "wb") as f:
+            for entity in self._iter_entities(conn, times=True):
+                f.write(codec.dumpb({**entity, "type": "entity"}) + b"\n")
+            for row in conn.execute("SELECT source, target, relation_type FROM relations ORDER BY id"):
+                f.write(codec.dumpb({**_relation(row), "type": "relation"}) + b"\n")
+        os.replace(tmp_path, path)
+
+
+def _latest_seq(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'changes'").fetchone()
+    return row[0] if row else 0
+
+
+def _history(conn: sqlite3.Connection) -> str:
+    (history,) = conn.execute("SELECT value FROM meta WHERE key = 'history'").fetchone()
+    return history
+
+
+def _relation(row: Iterable[str]) -> dict[str, Any]:
+    source, target, relation_type = row
+    return {"from": source, "to": target, "relationType": relation_type}
+
+
+def _matching_rows(
+    conn: sqlite3.Connection, query: str, limit: int | None, where: str = "", params: Iterable[Any] = ()
+) -> list[tuple[int, str, str]]:
+    """(id, name, entity_type) of entities matching ``query``, best first.
+
+    ``where`` adds ``AND ...`` conditions on the entity row ``e``, bound to ``params``.
+    """
+    take = -1 if limit is None else limit
+    if len(query) >= 3:
+        # MATERIALIZED keeps bm25() in the full-text query, where FTS5 allows it
+        return conn.execute(
+            "WITH hit AS MATERIALIZED"
+            " (SELECT entity_id, bm25(search, 2.0, 1.0) AS score FROM search WHERE search MATCH ?)"
+            " SELECT e.id, e.name, e.entity_type FROM"
+            " (SELECT entity_id, min(score) AS score FROM hit GROUP BY entity_id) AS best"
+            f" JOIN entities AS e ON e.id = best.entity_id WHERE 1{where} ORDER BY best.score, e.id LIMIT ?",  # noqa: S608
+            ['"' + query.replace('"', '""') + '"', *params, take],
+        ).fetchall()
+    pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return conn.execute(
+        "SELECT e.id, e.name, e.entity_type FROM entities AS e WHERE e.id IN"
+        " (SELECT entity_id FROM search WHERE name LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\')"
+        f"{where} ORDER BY e.id LIMIT ?",  # noqa: S608
+        [pattern, pattern, *params, take],
+    ).fetchall()
+
+
+def _upsert(
+    conn: sqlite3.Connection,
+    name: str,
+    entity_type: str,
+    observations: list[str],
+    times: Iterable[float | None],
+) -> None:
+    conn.execute(
+        "INSERT INTO entities(name, entity_type) VALUES (?, ?) ON CONFLICT(name) DO NOTHING", (name, entity_type)
+    )
+    if observations:
+        (entity_id,) = conn.execute("SELECT id FROM entities WHERE name = ?", (name,)).fetchone()
+        _insert_observations(conn, entity_id, observations, times)
+
+
+def _insert_observations(
+    conn: sqlite3.Connection, entity_id: int, observations: Iterable[str], times: Iterable[float | None]
+) -> None:
+    """Insert new observations with their write times; existing ones keep theirs."""
+    conn.executemany(
+        "INSERT OR IGNORE INTO observations(entity_id, content, created_at) VALUES (?, ?, ?)",
+        [(entity_id, observation, at) for observation, at in zip(observations, times, strict=False)],
+    )
+
+
+def _chunks(values: list[Any]) -> Iterator[list[Any]]:
+    for start in range(0, len(values), _MAX_PARAMS):
+        yield values[start : start + _MAX_PARAMS]
+
+
+def _parse_line(line: bytes) -> tuple[str, dict[str, Any]] | None:
+    """(kind, record) for an entity or relation line; None for anything else."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = codec.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    kind = record.pop("type", None)
+    if kind == "entity" and "name" in record:
+        return kind, record
+    if kind == "relation" and {"from", "to", "relationType"} <= record.keys():
+        return kind, record
+    return None
+
+
+def jsonl_to_sqlite(jsonl_path: str, db_path: str) -> int:
+    """Import a JSONL memory file into a (new or existing) database."""
+    graph = SqliteKnowledgeGraph(db_path)
+    try:
+        graph.load()
+        return graph.import_jsonl(jsonl_path)
+    finally:
+        graph.close()
+
+
+def sqlite_to_jsonl(db_path: str, jsonl_path: str) -> None:
+    """Export a database to a JSONL memory file."""
+    graph = SqliteKnowledgeGraph(db_path)
+    try:
+        graph.load()
+        graph.export_jsonl(jsonl_path)
+    finally:
+        graph.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m jade.mcp.sqlite_store", description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    to_sqlite = commands.add_parser("import", help="JSONL → SQLite (merges into an existing database)")
+    to_sqlite.add_argument("jsonl")
+    to_sqlite.add_argument("db")
+    to_jsonl = commands.add_parser("export", help="SQLite → JSONL")
+    to_jsonl.add_argument("db")
+    to_jsonl.add_argument("jsonl")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        print(f"{jsonl_to_sqlite(args.jsonl, args.db)} records")
+    else:
+        sqlite_to_jsonl(args.db, args.jsonl)
+        print(args.jsonl)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
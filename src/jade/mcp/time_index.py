@@ -0,0 +1,51 @@
+"""Time-ordered index of observation write times for date-range recall.
+
+Entries are (write time, entity name) pairs kept sorted by time, so the
+entities written to within [since, until] are found with two binary
+searches instead of a scan of every entity. Writes arrive in time order,
+so adding an entry is almost always an append.
+
+Entries are never removed: deleting an entity or an observation leaves
+stale entries behind, so callers re-check each candidate against the
+entity's current observations (Entity.latest). A reload rebuilds the
+index without them.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class TimeIndex:
+    """Entity names sorted by the write times of their observations."""
+
+    __slots__ = ("_names", "_times")
+
+    def __init__(self, entries: Iterable[tuple[float, str]] = ()) -> None:
+        ordered = sorted(entries, key=lambda entry: entry[0])
+        self._times = array("d", [at for at, _ in ordered])
+        self._names = [name for _, name in ordered]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def add(self, at: float, name: str) -> None:
+        """Index a write to ``name`` at time ``at``."""
+        if not self._times or at >= self._times[-1]:
+            self._times.append(at)
+            self._names.append(name)
+        else:
+            position = bisect_right(self._times, at)
+            self._times.insert(position, at)
+            self._names.insert(position, name)
+
+    def between(self, since: float | None = None, until: float | None = None) -> list[str]:
+        """Names written to within [since, until] (inclusive), most recently written first."""
+        low = 0 if since is None else bisect_left(self._times, since)
+        high = len(self._times) if until is None else bisect_right(self._times, until)
+        return list(dict.fromkeys(reversed(self._names[low:high])))
@@ -0,0 +1,97 @@
+"""Bounded breadth-first traversal over knowledge graph relations.
+
+Backs the traverse tool: one call expands seed entities hop by hop
+instead of an agent chaining open_nodes round-trips. Each hop asks the
+storage backend for the relations touching the current frontier (an
+adjacency-index lookup), so the cost is proportional to the edges
+visited, never to the size of the graph.
+
+The walk stops after ``max_depth`` hops or once ``max_nodes`` names have
+been reached, whichever comes first; hitting the budget is reported as
+truncation.
+"""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Iterable
+
+RelationKey = tuple[str, str, str]
+
+
+class Direction(StrEnum):
+    """Which relations a traversal follows from each entity."""
+
+    OUT = "out"  # from → to
+    IN = "in"  # to → from
+    BOTH = "both"
+
+
+def check_traverse_args(max_depth: int, max_nodes: int) -> None:
+    if max_depth < 0:
+        msg = "maxDepth must be non-negative"
+        raise ValueError(msg)
+    if max_nodes < 1:
+        msg = "maxNodes must be at least 1"
+        raise ValueError(msg)
+
+
+def breadth_first(
+    seeds: Iterable[str],
+    edges_of: Callable[[list[str], Direction], Iterable[RelationKey]],
+    max_depth: int,
+    relation_types: Collection[str] | None = None,
+    direction: Direction = Direction.BOTH,
+    max_nodes: int = 100,
+) -> tuple[dict[str, int], list[RelationKey], bool]:
+    """Walk outward from ``seeds``.
+
+    ``edges_of(frontier, direction)`` returns the (from, to, relationType)
+    keys of relations leaving (OUT), entering (IN) or touching (BOTH) the
+    frontier names. Returns (name → hop distance in visit order, relations
+    between reached names, whether ``max_nodes`` cut the walk short).
+    """
+    check_traverse_args(max_depth, max_nodes)
+    depths: dict[str, int] = {}
+    truncated = False
+    for seed in seeds:
+        if seed in depths:
+            continue
+        if len(depths) == max_nodes:
+            truncated = True
+            break
+        depths[seed] = 0
+    edges: dict[RelationKey, None] = {}
+    frontier = list(depths)
+    for depth in range(1, max_depth + 1):
+        if not frontier:
+            break
+        members = set(frontier)
+        next_frontier: list[str] = []
+        for key in edges_of(frontier, direction):
+            if relation_types is not None and key[2] not in relation_types:
+                continue
+            neighbors = []
+            if direction is not Direction.IN and key[0] in members:
+                neighbors.append(key[1])
+            if direction is not Direction.OUT and key[1] in members:
+                neighbors.append(key[0])
+            for neighbor in neighbors:
+                if neighbor not in depths:
+                    if len(depths) == max_nodes:
+                        truncated = True
+                        continue
+                    depths[neighbor] = depth
+                    next_frontier.append(neighbor)
+            if key[0] in depths and key[1] in depths:
+                edges[key] = None
+        frontier = next_frontier
+    # The last names reached were never expanded; pick up the relations among them
+    if frontier:
+        for key in edges_of(frontier, direction):
+            if (relation_types is None or key[2] in relation_types) and key[0] in depths and key[1] in depths:
+                edges[key] = None
+    return depths, list(edges), truncated
@@ -2,13 +2,25 @@
 
 Fail-fast: connection failures raise immediately.
 Supports FakeRedis for testing without a running server.
+
+AsyncHotMemoryClient has the same API on redis.asyncio, for callers on
+an event loop (the FastMCP handlers, JadeAgent). Its commands draw
+connections from one ConnectionPool, sized by
+HotMemoryConfig.max_connections or passed in to share it between
+clients, so concurrent sessions each get a connection and their round
+trips overlap instead of queueing behind one another.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from jade import codec
+
+if TYPE_CHECKING:
+    from redis.asyncio import ConnectionPool
 
 
 @dataclass(frozen=True)
@@ -17,11 +29,15 @@ class HotMemoryConfig:
 
     redis_url: str
     default_ttl_seconds: int = 3600  # 1 hour default
+    max_connections: int | None = None  # AsyncHotMemoryClient pool size; None is unbounded
 
     def __post_init__(self) -> None:
         if not self.redis_url or not self.redis_url.strip():
             msg = "redis_url must be a non-empty string"
             raise ValueError(msg)
+        if self.max_connections is not None and self.max_connections < 1:
+            msg = "max_connections must be at least 1"
+            raise ValueError(msg)
 
 
 class _FakeRedis:
@@ -48,10 +64,10 @@ class _FakeRedis:
     def ttl(self, key: str) -> int:
         return self._ttls.get(key, -1)
 
-    def rpush(self, key: str, value: str) -> None:
+    def rpush(self, key: str, *values: str) -> None:
         if key not in self._lists:
             self._lists[key] = []
-        self._lists[key].append(value)
+        self._lists[key].extend(values)
 
     def lrange(self, key: str, start: int, end: int) -> list[str]:
         lst = self._lists.get(key, [])
@@ -59,6 +75,87 @@ class _FakeRedis:
             return lst[start:]
         return lst[start : end + 1]
 
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    """Queues _FakeRedis commands and runs them on execute(), like a Redis pipeline."""
+
+    def __init__(self, redis: _FakeRedis) -> None:
+        self._redis = redis
+        self._commands: list[tuple[str, tuple[Any, ...]]] = []
+
+    def delete(self, key: str) -> None:
+        self._commands.append(("delete", (key,)))
+
+    def rpush(self, key: str, *values: str) -> None:
+        self._commands.append(("rpush", (key, *values)))
+
+    def execute(self) -> list[Any]:
+        results = [getattr(self._redis, name)(*args) for name, args in self._commands]
+        self._commands.clear()
+        return results
+
+
+class _AsyncFakeRedis:
+    """Async in-memory Redis substitute for testing: a _FakeRedis behind awaitable commands."""
+
+    def __init__(self) -> None:
+        self._redis = _FakeRedis()
+
+    async def _round_trip(self) -> None:
+        await asyncio.sleep(0)
+
+    async def ping(self) -> bool:
+        await self._round_trip()
+        return True
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        await self._round_trip()
+        self._redis.set(key, value, ex=ex)
+
+    async def get(self, key: str) -> str | None:
+        await self._round_trip()
+        return self._redis.get(key)
+
+    async def delete(self, key: str) -> None:
+        await self._round_trip()
+        self._redis.delete(key)
+
+    async def ttl(self, key: str) -> int:
+        await self._round_trip()
+        return self._redis.ttl(key)
+
+    async def rpush(self, key: str, *values: str) -> None:
+        await self._round_trip()
+        self._redis.rpush(key, *values)
+
+    async def lrange(self, key: str, start: int, end: int) -> list[str]:
+        await self._round_trip()
+        return self._redis.lrange(key, start, end)
+
+    def pipeline(self, transaction: bool = True) -> _AsyncFakePipeline:
+        return _AsyncFakePipeline(self)
+
+
+class _AsyncFakePipeline:
+    """Queues _AsyncFakeRedis commands and runs them in one round trip on execute()."""
+
+    def __init__(self, redis: _AsyncFakeRedis) -> None:
+        self._redis = redis
+        self._pipeline = _FakePipeline(redis._redis)
+
+    def delete(self, key: str) -> None:
+        self._pipeline.delete(key)
+
+    def rpush(self, key: str, *values: str) -> None:
+        self._pipeline.rpush(key, *values)
+
+    async def execute(self) -> list[Any]:
+        await self._redis._round_trip()
+        return self._pipeline.execute()
+
 
 class HotMemoryClient:
     """Redis hot memory client for session-scoped state."""
@@ -88,7 +185,7 @@ class HotMemoryClient:
         """Write session state with TTL."""
         key = self._session_key(session_id)
         ttl = ttl_seconds or self._default_ttl
-        self._redis.set(key, json.dumps(data), ex=ttl)
+        self._redis.set(key, codec.dumps(data), ex=ttl)
 
     def read_session(self, session_id: str) -> dict[str, Any] | None:
         """Read session state. Returns None if not found."""
@@ -96,7 +193,7 @@ class HotMemoryClient:
         value = self._redis.get(key)
         if value is None:
             return None
-        return json.loads(value)
+        return codec.loads(value)
 
     def delete_session(self, session_id: str) -> None:
         """Delete session state."""
@@ -121,7 +218,128 @@ class HotMemoryClient:
         key = self._working_memory_key(session_id, namespace)
         return self._redis.lrange(key, 0, -1)
 
+    def replace_working_memory(self, session_id: str, namespace: str, items: list[str]) -> None:
+        """Replace a session's working memory list with ``items`` in one round trip."""
+        key = self._working_memory_key(session_id, namespace)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if items:
+            pipe.rpush(key, *items)
+        pipe.execute()
+
     def clear_working_memory(self, session_id: str, namespace: str) -> None:
         """Clear a session's working memory list."""
         key = self._working_memory_key(session_id, namespace)
         self._redis.delete(key)
+
+
+class AsyncHotMemoryClient:
+    """HotMemoryClient on redis.asyncio, for use from an event loop.
+
+    Create it with ``await AsyncHotMemoryClient.connect(config)``, which
+    verifies the connection. Pass ``pool`` to share one ConnectionPool
+    (created with ``decode_responses=True``) between clients; otherwise
+    the client makes its own from the config and aclose() disconnects it.
+    """
+
+    def __init__(
+        self,
+        config: HotMemoryConfig,
+        *,
+        pool: ConnectionPool | None = None,
+        use_fake: bool = False,
+    ) -> None:
+        self._config = config
+        self._default_ttl = config.default_ttl_seconds
+        self._pool: ConnectionPool | None = None
+
+        if use_fake:
+            self._redis: Any = _AsyncFakeRedis()
+        else:
+            import redis.asyncio
+
+            if pool is None:
+                pool = redis.asyncio.ConnectionPool.from_url(
+                    config.redis_url, decode_responses=True, max_connections=config.max_connections
+                )
+                self._pool = pool
+            self._redis = redis.asyncio.Redis(connection_pool=pool)
+
+    @classmethod
+    async def connect(
+        cls,
+        config: HotMemoryConfig,
+        *,
+        pool: ConnectionPool | None = None,
+        use_fake: bool = False,
+    ) -> AsyncHotMemoryClient:
+        """Create a client and verify its connection (fail fast)."""
+        client = cls(config, pool=pool, use_fake=use_fake)
+        try:
+            await client._redis.ping()
+        except BaseException:
+            await client.aclose()
+            raise
+        return client
+
+    async def aclose(self) -> None:
+        """Disconnect the client's own connection pool; a shared pool is left to its owner."""
+        if self._pool is not None:
+            await self._pool.disconnect()
+
+    def _session_key(self, session_id: str) -> str:
+        return f"jade:session:{session_id}"
+
+    def _working_memory_key(self, session_id: str, namespace: str) -> str:
+        return f"jade:wm:{session_id}:{namespace}"
+
+    async def write_session(self, session_id: str, data: dict[str, Any], ttl_seconds: int | None = None) -> None:
+        """Write session state with TTL."""
+        key = self._session_key(session_id)
+        ttl = ttl_seconds or self._default_ttl
+        await self._redis.set(key, codec.dumps(data), ex=ttl)
+
+    async def read_session(self, session_id: str) -> dict[str, Any] | None:
+        """Read session state. Returns None if not found."""
+        key = self._session_key(session_id)
+        value = await self._redis.get(key)
+        if value is None:
+            return None
+        return codec.loads(value)
+
+    async def delete_session(self, session_id: str) -> None:
+        """Delete session state."""
+        key = self._session_key(session_id)
+        await self._redis.delete(key)
+
+    async def get_ttl(self, session_id: str) -> int | None:
+        """Get remaining TTL for a session. Returns None if key doesn't exist."""
+        key = self._session_key(session_id)
+        ttl = await self._redis.ttl(key)
+        if ttl < 0:
+            return None
+        return ttl
+
+    async def add_working_memory(self, session_id: str, namespace: str, item: str) -> None:
+        """Add an item to a session's working memory list."""
+        key = self._working_memory_key(session_id, namespace)
+        await self._redis.rpush(key, item)
+
+    async def get_working_memory(self, session_id: str, namespace: str) -> list[str]:
+        """Get all items in a session's working memory list."""
+        key = self._working_memory_key(session_id, namespace)
+        return await self._redis.lrange(key, 0, -1)
+
+    async def replace_working_memory(self, session_id: str, namespace: str, items: list[str]) -> None:
+        """Replace a session's working memory list with ``items`` in one round trip."""
+        key = self._working_memory_key(session_id, namespace)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.delete(key)
+        if items:
+            pipe.rpush(key, *items)
+        await pipe.execute()
+
+    async def clear_working_memory(self, session_id: str, namespace: str) -> None:
+        """Clear a session's working memory list."""
+        key = self._working_memory_key(session_id, namespace)
+        await self._redis.delete(key)
@@ -10,11 +10,12 @@ serialization. No API calls, no side effects.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import Any
 
+from jade import codec
+
 
 class TaskType(StrEnum):
     """Conventional commit types — maps 1:1 to commit prefixes."""
@@ -166,7 +167,7 @@ class TaskPlan:
         }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        return codec.dumps_pretty(self.to_dict())
 
 
 @dataclass(frozen=True)
@@ -223,4 +224,4 @@ class TaskReview:
         }
 
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), indent=2)
+        return codec.dumps_pretty(self.to_dict())
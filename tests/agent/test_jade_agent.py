@@ -178,3 +178,59 @@ class TestJadeAgentErrorPropagation:
             asyncio.get_event_loop().run_until_complete(
                 agent.handle_tool_call("create_entities", {"entities": [{"name": ""}]})
             )
+
+
+class TestJadeAgentSharedGraph:
+    """Memory and Jade toolsets operate on one shared KnowledgeGraph."""
+
+    @pytest.fixture
+    def agent(self, clean_memory_file: str) -> JadeAgent:
+        config = JadeAgentConfig(
+            api_key="sk-test",
+            model="claude-sonnet-4-20250514",
+            memory_file_path=clean_memory_file,
+        )
+        return JadeAgent(config)
+
+    @pytest.mark.asyncio
+    async def test_memory_tool_write_visible_to_jade_tool(self, agent: JadeAgent) -> None:
+        await agent.handle_tool_call(
+            "create_entities",
+            {"entities": [{"name": "shared-note", "entityType": "Concept", "observations": ["graph is shared"]}]},
+        )
+        result = await agent.handle_tool_call("recall_context", {"query": "shared"})
+        assert [e["name"] for e in json.loads(result)["entities"]] == ["shared-note"]
+
+    @pytest.mark.asyncio
+    async def test_jade_tool_write_survives_memory_tool_save(self, agent: JadeAgent, clean_memory_file: str) -> None:
+        await agent.handle_tool_call(
+            "record_decision",
+            {"decisionName": "share-graph", "rationale": "one store", "decidedBy": "Alex", "sessionId": "s1"},
+        )
+        await agent.handle_tool_call(
+            "create_entities", {"entities": [{"name": "later", "entityType": "Concept", "observations": []}]}
+        )
+        with open(clean_memory_file, encoding="utf-8") as f:
+            on_disk = f.read()
+        assert "share-graph" in on_disk
+        assert "later" in on_disk
+        assert agent.graph.find_entity("share-graph") is not None
+
+    @pytest.mark.asyncio
+    async def test_update_hot_memory_writes_through_async_client(self, clean_memory_file: str) -> None:
+        from jade.memory.hot import AsyncHotMemoryClient, HotMemoryConfig
+
+        hot = await AsyncHotMemoryClient.connect(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+        config = JadeAgentConfig(
+            api_key="sk-test",
+            model="claude-sonnet-4-20250514",
+            memory_file_path=clean_memory_file,
+            hot_memory=hot,
+        )
+        agent = JadeAgent(config)
+        await agent.handle_tool_call(
+            "update_hot_memory", {"sessionId": "s1", "summary": "Planned the cache", "activeThreads": ["a"]}
+        )
+        session = await hot.read_session("s1")
+        assert session is not None and session["summary"] == "Planned the cache"
+        assert await hot.get_working_memory("s1", "activeThreads") == ["a"]
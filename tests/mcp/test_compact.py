@@ -0,0 +1,126 @@
+"""Tests for the compact entity and relation records."""
+
+from __future__ import annotations
+
+import pytest
+
+from jade import codec
+from jade.mcp.compact import _LIST_MAX, Entity, RelationIndex, SymbolTable
+from jade.mcp.memory_server import KnowledgeGraph
+
+
+class TestSymbolTable:
+    """Each distinct string is stored once."""
+
+    def test_intern_returns_shared_instance(self) -> None:
+        symbols = SymbolTable()
+        first = symbols.intern("".join(["Con", "cept"]))
+        assert symbols.intern("".join(["Conc", "ept"])) is first
+        assert symbols.id("Concept") == 0 and symbols[0] == "Concept"
+        assert symbols.find("Person") is None and len(symbols) == 1
+
+
+class TestEntity:
+    """Entity reads like the dict record it replaces."""
+
+    def test_dict_interface(self) -> None:
+        entity = Entity("Alex", "Person", ["likes tea"])
+        assert entity == {"name": "Alex", "entityType": "Person", "observations": ["likes tea"]}
+        assert entity.get("missing") is None
+        assert {**entity, "type": "entity"}["entityType"] == "Person"
+        with pytest.raises(KeyError):
+            entity["missing"]
+
+    def test_extra_keys_round_trip(self) -> None:
+        record = {"name": "Alex", "entityType": "Person", "observations": [], "source": "import"}
+        entity = Entity.from_record(record, SymbolTable(), [])
+        assert entity == record and list(entity) == list(record)
+        entity["entityType"] = "Robot"
+        assert entity.to_dict()["entityType"] == "Robot"
+
+    def test_encodes_as_object(self) -> None:
+        entity = Entity("Alex", "Person", ["a"])
+        assert codec.loads(codec.dumpb({"entities": [entity]})) == {"entities": [entity.to_dict()]}
+        assert codec.loads(codec.dumps_pretty(entity)) == entity
+
+
+class TestRelationIndex:
+    """Relations are interned triples with endpoint adjacency."""
+
+    def test_add_discard_and_order(self) -> None:
+        relations = RelationIndex(SymbolTable())
+        assert relations.add("A", "B", "knows") is True
+        assert relations.add("A", "B", "knows") is False
+        relations.add("C", "A", "uses")
+        assert ("A", "B", "knows") in relations and ("A", "B", "likes") not in relations
+        assert list(relations.keys()) == [("A", "B", "knows"), ("C", "A", "uses")]
+        assert relations.incoming("A") == [("C", "A", "uses")]
+        assert relations.discard("A", "B", "knows") is True
+        assert relations.discard("A", "B", "knows") is False
+        assert relations.outgoing("A") == [] and not relations.has_outgoing("A")
+        assert list(relations.values()) == [{"from": "C", "to": "A", "relationType": "uses"}]
+
+    def test_hub_adjacency(self) -> None:
+        relations = RelationIndex(SymbolTable())
+        targets = [f"n{i}" for i in range(_LIST_MAX * 2)]
+        for target in targets:
+            relations.add("hub", target, "links")
+        relations.discard("hub", "n3", "links")
+        assert [key[1] for key in relations.outgoing("hub")] == [t for t in targets if t != "n3"]
+        assert list(relations.sources()) == ["hub"]
+
+    def test_extra_keys_kept_beside_triple(self) -> None:
+        relations = RelationIndex(SymbolTable())
+        assert relations.add_record({"from": "A", "to": "B", "relationType": "knows", "weight": 2})
+        relations.add("A", "C", "knows")
+        assert relations.record(("A", "B", "knows"))["weight"] == 2
+        assert [r.get("weight") for r in relations.values()] == [2, None]
+        relations.discard("A", "B", "knows")
+        relations.add("A", "B", "knows")
+        assert "weight" not in relations.record(("A", "B", "knows"))
+
+
+class TestGraphIntegration:
+    """KnowledgeGraph shares one symbol per name across entities and relations."""
+
+    def test_loaded_names_are_shared(self, tmp_path) -> None:
+        path = str(tmp_path / "memory.jsonl")
+        source = KnowledgeGraph(file_path=path)
+        source.upsert_entity("Redis", "Technology", ["In-memory store"])
+        source.upsert_entity("Neon", "Technology")
+        source.create_relation("Redis", "Neon", "complements")
+        source.save()
+
+        graph = KnowledgeGraph(file_path=path)
+        graph.load()
+        redis, neon = graph.entities
+        assert redis["entityType"] is neon["entityType"]
+        assert next(iter(graph._relations.keys()))[0] is redis["name"]
+        assert graph.entities == source.entities and graph.relations == source.relations
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"binary_snapshot": True}, {"lazy": True, "binary_snapshot": True}, {"shards": 2}]
+    )
+    def test_relation_extras_round_trip(self, tmp_path, options: dict[str, object]) -> None:
+        import json
+
+        path = str(tmp_path / "memory.jsonl")
+        with open(path, "w") as f:
+            f.write(
+                json.dumps({"type": "relation", "from": "A", "to": "B", "relationType": "uses", "weight": 0.5}) + "\n"
+            )
+            f.write(json.dumps({"type": "relation", "from": "B", "to": "C", "relationType": "uses"}) + "\n")
+        for _ in range(2):  # Load from the JSONL, save, then load what was saved
+            graph = KnowledgeGraph(file_path=path, **options)
+            graph.load()
+            graph.upsert_entity("A")  # Dirties the graph (and its shard) so save() rewrites it
+            graph.save()
+        assert graph.relations == [
+            {"from": "A", "to": "B", "relationType": "uses", "weight": 0.5},
+            {"from": "B", "to": "C", "relationType": "uses"},
+        ]
+        assert graph.relations_of(["A"])[0]["weight"] == 0.5
+        with pytest.raises(RuntimeError), graph.transaction():
+            graph.delete_entities(["A"])
+            raise RuntimeError
+        assert graph.relations_of(["A"])[0]["weight"] == 0.5  # Restored by the rollback
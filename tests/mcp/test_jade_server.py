@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import tempfile
+from typing import Any
 
 import pytest
 
@@ -25,6 +26,31 @@ async def jade_server(memory_file: str):
     return server
 
 
+class TestJadeServerStorage:
+    """The memory file path selects the storage engine, as for the memory server."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_path(self, tmp_path) -> None:
+        import json
+        import sqlite3
+
+        from jade.mcp.jade_server import create_jade_server
+
+        path = str(tmp_path / "memory.db")
+        server = create_jade_server(memory_file_path=path)
+        await server.call_tool("log_insight", {"insight": "Redis caches sessions"})
+        result = await server.call_tool("recall_context", {"query": "sessions"})
+        assert len(json.loads(result[1]["result"])["entities"]) == 1
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT count(*) FROM entities").fetchone() == (1,)
+
+    def test_rejects_unknown_suffix(self, tmp_path) -> None:
+        from jade.mcp.jade_server import create_jade_server
+
+        with pytest.raises(ValueError, match="must end with .jsonl"):
+            create_jade_server(memory_file_path=str(tmp_path / "memory.txt"))
+
+
 class TestJadeServerTools:
     """Jade server exposes domain-specific tools."""
 
@@ -133,6 +159,39 @@ class TestRecordDecisionEmptyGuards:
         assert len(graph.relations) == 0
 
 
+class TestIdempotentWrites:
+    """Retried record_decision and log_insight calls leave the graph unchanged."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_do_not_grow_graph(self, memory_file: str) -> None:
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file)
+        server = create_jade_server(graph=graph)
+        decision = {"decisionName": "use-redis", "rationale": "fast", "decidedBy": "Alex", "sessionId": "s1"}
+        insight = {"insight": "Redis keeps hot memory close", "sessionId": "s1"}
+        for _ in range(3):
+            await server.call_tool("record_decision", decision)
+            await server.call_tool("log_insight", insight)
+        assert len(graph.entities) == 4
+        assert len(graph.relations) == 3
+        assert graph.find_entity("use-redis")["observations"] == ["fast"]
+        assert graph.changes_since(0)[1] == 7  # Only the first round wrote anything
+
+        await server.call_tool("record_decision", {**decision, "rationale": "and simple"})
+        assert graph.find_entity("use-redis")["observations"] == ["fast", "and simple"]
+
+    def test_insight_names_are_stable_and_collision_safe(self) -> None:
+        from jade.mcp.jade_server import insight_name
+
+        name = insight_name("Redis keeps hot memory close")
+        assert name.startswith("redis-keeps-hot-memory-close-")
+        assert insight_name("  Redis keeps hot  memory close ") == name
+        assert insight_name("Redis keeps hot memory close to the agent") != name
+        assert len(insight_name("?!")) == 8
+
+
 class TestRecallContext:
     """recall_context searches the knowledge graph by session, date, or topic."""
 
@@ -170,6 +229,250 @@ class TestUpdateHotMemory:
         assert result is not None
 
 
+class TestHotMemoryWriteThrough:
+    """With a HotMemoryClient, update_hot_memory writes Redis first and the graph in the background."""
+
+    @pytest.mark.asyncio
+    async def test_writes_redis_then_graph(self, memory_file: str) -> None:
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.hot import HotMemoryClient, HotMemoryConfig
+
+        hot = HotMemoryClient(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+        graph = KnowledgeGraph(file_path=memory_file)
+        server = create_jade_server(graph=graph, hot_memory=hot)
+        async with server.settings.lifespan(server):
+            await server.call_tool(
+                "update_hot_memory", {"sessionId": "s1", "summary": "Planned the cache", "activeThreads": ["a", "b"]}
+            )
+            await server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": "Built it"})
+
+            session = hot.read_session("s1")
+            assert session is not None and session["summary"] == "Built it"
+            assert session["entities"] == [
+                {
+                    "name": "s1",
+                    "entityType": "Session",
+                    "observations": ["Planned the cache", "Active thread: a", "Active thread: b", "Built it"],
+                }
+            ]
+            assert hot.get_working_memory("s1", "activeThreads") == []
+        # Stopping the server drains the background graph writes
+        entity = graph.find_entity("s1")
+        assert entity is not None and entity["observations"] == session["entities"][0]["observations"]
+
+    @pytest.mark.asyncio
+    async def test_failed_graph_write_reported_on_next_call(
+        self, memory_file: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import json
+        from concurrent.futures import Future, ThreadPoolExecutor
+
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.hot import HotMemoryClient, HotMemoryConfig
+
+        submitted: list[Future[None]] = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+                submitted.append(super().submit(fn, *args, **kwargs))
+                return submitted[-1]
+
+        monkeypatch.setattr("jade.mcp.jade_server.ThreadPoolExecutor", RecordingExecutor)
+        hot = HotMemoryClient(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+        graph = KnowledgeGraph(file_path=memory_file)
+        upsert_entity = graph.upsert_entity
+        failures = iter([OSError("disk full")])
+
+        def fail_once(*args: object) -> object:
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return upsert_entity(*args)
+
+        graph.upsert_entity = fail_once  # type: ignore[method-assign]
+        server = create_jade_server(graph=graph, hot_memory=hot)
+        await server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": "first"})
+        submitted[0].exception(timeout=5)  # Wait for the failed background write
+
+        result = await server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": "again"})
+        assert json.loads(result[1]["result"])["graphWriteErrors"] == ["s1: disk full"]
+        assert hot.read_session("s1")["summary"] == "again"  # The new update still went through
+        submitted[1].result(timeout=5)
+        result = await server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": "third"})
+        assert "graphWriteErrors" not in json.loads(result[1]["result"])
+        assert graph.find_entity("s1") is not None
+
+    @pytest.mark.asyncio
+    async def test_sync_client_writes_off_the_event_loop(self, memory_file: str) -> None:
+        import asyncio
+        import threading
+
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.hot import HotMemoryClient, HotMemoryConfig
+
+        hot = HotMemoryClient(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+        read_session = hot.read_session
+        loop_ran = threading.Event()
+
+        def wait_for_loop(session_id: str) -> dict[str, Any] | None:
+            # Only set by a coroutine, so this times out if the Redis calls run on the loop
+            assert loop_ran.wait(timeout=5), "update_hot_memory blocked the event loop"
+            return read_session(session_id)
+
+        async def run_on_loop() -> None:
+            await asyncio.sleep(0)
+            loop_ran.set()
+
+        hot.read_session = wait_for_loop  # type: ignore[method-assign]
+        server = create_jade_server(graph=KnowledgeGraph(file_path=memory_file), hot_memory=hot)
+        async with server.settings.lifespan(server):
+            await asyncio.gather(
+                server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": "x"}), run_on_loop()
+            )
+        assert hot.read_session("s1")["summary"] == "x"
+
+    @pytest.mark.asyncio
+    async def test_async_client_writes_without_blocking(self, memory_file: str) -> None:
+        import asyncio
+
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.hot import AsyncHotMemoryClient, HotMemoryConfig
+
+        hot = await AsyncHotMemoryClient.connect(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+        graph = KnowledgeGraph(file_path=memory_file)
+        server = create_jade_server(graph=graph, hot_memory=hot)
+        async with server.settings.lifespan(server):
+            await asyncio.gather(
+                *(
+                    server.call_tool(
+                        "update_hot_memory", {"sessionId": f"s{n}", "summary": "Planned", "activeThreads": ["a"]}
+                    )
+                    for n in range(5)
+                )
+            )
+            session = await hot.read_session("s3")
+            assert session is not None and session["summary"] == "Planned"
+            assert await hot.get_working_memory("s3", "activeThreads") == ["a"]
+        assert all(graph.find_entity(f"s{n}") is not None for n in range(5))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("async_client", [True, False])
+    async def test_concurrent_updates_to_one_session_keep_every_summary(
+        self, memory_file: str, async_client: bool
+    ) -> None:
+        import asyncio
+
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.hot import AsyncHotMemoryClient, HotMemoryClient, HotMemoryConfig
+
+        config = HotMemoryConfig(redis_url="redis://localhost:6379")
+        if async_client:
+            hot: Any = await AsyncHotMemoryClient.connect(config, use_fake=True)
+        else:
+            hot = HotMemoryClient(config, use_fake=True)
+        graph = KnowledgeGraph(file_path=memory_file)
+        server = create_jade_server(graph=graph, hot_memory=hot)
+        async with server.settings.lifespan(server):
+            await asyncio.gather(
+                *(server.call_tool("update_hot_memory", {"sessionId": "s1", "summary": f"sum{n}"}) for n in range(5))
+            )
+            session = hot.read_session("s1")
+            if async_client:
+                session = await session
+        observations = session["entities"][0]["observations"]
+        assert sorted(observations) == [f"sum{n}" for n in range(5)]
+        assert graph.find_entity("s1")["observations"] == observations  # Same order in Redis and the graph
+
+
+class TestHybridRecall:
+    """With embeddings and cold memory, recall_context fuses lexical and vector results."""
+
+    @pytest.fixture
+    def hybrid(self, memory_file: str):
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.memory_server import KnowledgeGraph
+        from jade.memory.cold import ColdMemoryClient, ColdMemoryConfig
+        from jade.memory.embeddings import EmbeddingConfig, EmbeddingPipeline
+
+        embeddings = EmbeddingPipeline(EmbeddingConfig(api_key="test", dimensions=32), use_fake=True)
+        cold = ColdMemoryClient(
+            ColdMemoryConfig(database_url="postgresql://localhost/test", api_key="test", embedding_dimensions=32),
+            use_fake=True,
+        )
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.upsert_entity("redis", "Technology", ["we cache sessions in redis"])
+        # The fake embeds by hash, so only this exact text is "near" the query
+        cold.insert_entity("hot-store", "Concept", ["keeps sessions warm"], embeddings.embed("cache sessions"))
+        cold.insert_entity("elsewhere", "Concept", ["unrelated"], embeddings.embed("something else"))
+        server = create_jade_server(graph=graph, embeddings=embeddings, cold_memory=cold)
+        return server, graph, embeddings
+
+    @staticmethod
+    async def _names(server, **arguments: object) -> list[str]:
+        import json
+
+        result = await server.call_tool("recall_context", {"query": "cache sessions", **arguments})
+        return [e["name"] for e in json.loads(result[1]["result"])["entities"]]
+
+    @pytest.mark.asyncio
+    async def test_fuses_lexical_and_vector_hits(self, hybrid) -> None:
+        server, _, _ = hybrid
+        names = await self._names(server, limit=2)
+        assert set(names) == {"redis", "hot-store"}
+        assert await self._names(server, entityTypes=["Technology"]) == ["redis"]
+        assert set(await self._names(server, limit=2, entityTypes=[])) == {"redis", "hot-store"}
+        assert await self._names(server, since="2000-01-01") == ["redis"]  # Cold-only hits have no write time
+
+    @pytest.mark.asyncio
+    async def test_lookups_run_concurrently(self, hybrid, monkeypatch: pytest.MonkeyPatch) -> None:
+        import threading
+
+        server, graph, embeddings = hybrid
+        embed, recall = embeddings.embed, graph.recall
+        both_running = threading.Barrier(2, timeout=5)  # Breaks, failing the call, if the lookups run in turn
+
+        def meet_then_embed(text: str) -> list[float]:
+            both_running.wait()
+            return embed(text)
+
+        def meet_then_recall(*args: object) -> list[object]:
+            both_running.wait()
+            return recall(*args)
+
+        monkeypatch.setattr(embeddings, "embed", meet_then_embed)
+        monkeypatch.setattr(graph, "recall", meet_then_recall)
+        assert "redis" in await self._names(server)
+
+    @pytest.mark.asyncio
+    async def test_response_built_under_read_lock(self, hybrid, monkeypatch: pytest.MonkeyPatch) -> None:
+        import threading
+
+        server, graph, _ = hybrid
+        relations_of = graph.relations_of
+        held: list[bool] = []
+
+        def check_lock(names: object) -> list[object]:
+            held.append(threading.get_ident() in graph._rw._readers)
+            return relations_of(names)
+
+        monkeypatch.setattr(graph, "relations_of", check_lock)
+        await self._names(server)
+        assert held == [True]
+
+    def test_requires_both_backends(self, memory_file: str) -> None:
+        from jade.mcp.jade_server import create_jade_server
+        from jade.memory.embeddings import EmbeddingConfig, EmbeddingPipeline
+
+        embeddings = EmbeddingPipeline(EmbeddingConfig(api_key="test"), use_fake=True)
+        with pytest.raises(ValueError, match="must be given together"):
+            create_jade_server(memory_file_path=memory_file, embeddings=embeddings)
+
+
 class TestLogInsight:
     """log_insight records an observation or learning."""
 
@@ -184,3 +487,45 @@ class TestLogInsight:
             },
         )
         assert result is not None
+
+
+class TestRecallContextRanking:
+    """recall_context ranks matches and honours limit."""
+
+    @pytest.mark.asyncio
+    async def test_recall_context_limit_keeps_best_match(self, jade_server) -> None:
+        import json
+
+        await jade_server.call_tool(
+            "log_insight", {"insight": "Redis keeps hot memory close", "sessionId": "session-001"}
+        )
+        await jade_server.call_tool(
+            "record_decision",
+            {"decisionName": "redis", "rationale": "fast", "decidedBy": "Alex", "sessionId": "session-001"},
+        )
+        result = await jade_server.call_tool("recall_context", {"query": "redis", "limit": 1})
+        parsed = json.loads(result[1]["result"])
+        assert [e["name"] for e in parsed["entities"]] == ["redis"]
+        assert all("redis" in (r["from"], r["to"]) for r in parsed["relations"])
+
+    @pytest.mark.asyncio
+    async def test_recall_context_filters_by_type_and_time(self, jade_server) -> None:
+        import json
+
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        await jade_server.call_tool("log_insight", {"insight": "Redis keeps hot memory close", "sessionId": "s1"})
+        await jade_server.call_tool(
+            "record_decision", {"decisionName": "redis", "rationale": "fast", "decidedBy": "Alex", "sessionId": "s1"}
+        )
+
+        async def names(**arguments: object) -> list[str]:
+            result = await jade_server.call_tool("recall_context", {"query": "redis", **arguments})
+            return [e["name"] for e in json.loads(result[1]["result"])["entities"]]
+
+        assert await names(entityTypes=["Decision"]) == ["redis"]
+        assert len(await names(entityTypes=[])) == 2  # No filter, as in the read tools
+        assert len(await names(since="2000-01-01")) == 2
+        assert await names(until="2000-01-01") == []
+        with pytest.raises(ToolError, match="since must be an ISO 8601"):
+            await names(since="yesterday")
@@ -0,0 +1,200 @@
+"""Tests for lazily decoded entity storage (KnowledgeGraph lazy mode)."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from jade.mcp.lazy_store import LazyEntityStore
+from jade.mcp.memory_server import KnowledgeGraph
+
+
+@pytest.fixture
+def memory_file() -> str:
+    """Provide a clean temp JSONL path plus its sidecar files."""
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    os.unlink(path)
+    yield path
+    for leftover in (path, f"{path}.wal", f"{path}.snap", f"{path}.lock"):
+        if os.path.exists(leftover):
+            os.unlink(leftover)
+
+
+def _write_graph(path: str, count: int = 50, *, binary: bool = False) -> None:
+    graph = KnowledgeGraph(file_path=path, binary_snapshot=binary)
+    for i in range(count):
+        graph.upsert_entity(f"e{i}", "Concept", [f"fact {i}a", f"fact {i}b"])
+    for i in range(count - 1):
+        graph.create_relation(f"e{i}", f"e{i + 1}", "next")
+    graph.save()
+
+
+def _lazy(path: str, cache_size: int = 8, **kwargs: object) -> KnowledgeGraph:
+    graph = KnowledgeGraph(file_path=path, lazy=True, lazy_cache_size=cache_size, **kwargs)
+    graph.load()
+    return graph
+
+
+def _eager(path: str) -> KnowledgeGraph:
+    graph = KnowledgeGraph(file_path=path)
+    graph.load()
+    return graph
+
+
+class TestLazyLoad:
+    """Lazy load sees the same graph as a full load."""
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_matches_eager_load(self, memory_file: str, binary: bool) -> None:
+        _write_graph(memory_file, binary=binary)
+        lazy = _lazy(memory_file)
+        assert isinstance(lazy._entities, LazyEntityStore)
+        assert lazy.entities == _eager(memory_file).entities
+        assert lazy.relations == _eager(memory_file).relations
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_load_decodes_no_entities(self, memory_file: str, binary: bool) -> None:
+        _write_graph(memory_file, binary=binary)
+        graph = _lazy(memory_file)
+        assert graph._entities.decodes == 0
+        assert graph._entities.resident == 0
+        assert graph.find_entity("e7")["observations"] == ["fact 7a", "fact 7b"]
+        assert graph._entities.decodes == 1
+
+    def test_missing_file_gives_empty_graph(self, memory_file: str) -> None:
+        graph = _lazy(memory_file)
+        assert graph.entities == []
+        graph.upsert_entity("New", "Concept", ["first"])
+        assert graph.find_entity("New")["observations"] == ["first"]
+
+    def test_foreign_line_layout_and_duplicate_names(self, memory_file: str) -> None:
+        lines = [
+            {"type": "entity", "name": "Redis", "entityType": "Technology", "observations": ["fast"]},
+            {"name": "Redis", "entityType": "Technology", "observations": ["fast", "in-memory"], "type": "entity"},
+            {"type": "relation", "from": "Redis", "to": "Neon", "relationType": "complements"},
+        ]
+        with open(memory_file, "w") as f:
+            f.write("\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+        graph = _lazy(memory_file)
+        assert graph.entities == _eager(memory_file).entities
+        assert graph.find_entity("Redis")["observations"] == ["fast", "in-memory"]
+        assert graph.has_relation("Redis", "Neon", "complements")
+
+    def test_escaped_names(self, memory_file: str) -> None:
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.upsert_entity('say "hi" \\ naïve', "Concept", ["ok"])
+        graph.save()
+        assert _lazy(memory_file).find_entity('say "hi" \\ naïve')["observations"] == ["ok"]
+
+    def test_empty_string_observation_in_snapshot(self, memory_file: str) -> None:
+        graph = KnowledgeGraph(file_path=memory_file, binary_snapshot=True)
+        graph.upsert_entity("Blank", "Concept", [""])
+        graph.upsert_entity("None", "Concept")
+        graph.upsert_entity("Both", "Concept", ["", "x"])
+        graph.save()
+        lazy = _lazy(memory_file)
+        assert lazy.find_entity("Blank")["observations"] == [""]
+        assert lazy.find_entity("None")["observations"] == []
+        assert lazy.find_entity("Both")["observations"] == ["", "x"]
+
+
+class TestLazyCache:
+    """Decoded entities live in a bounded LRU; mutated ones are pinned."""
+
+    def test_resident_set_is_bounded(self, memory_file: str) -> None:
+        _write_graph(memory_file, count=100, binary=True)
+        graph = _lazy(memory_file, cache_size=8)
+        for i in range(100):
+            graph.find_entity(f"e{i}")
+        assert graph._entities.resident == 8
+
+    def test_recently_used_entities_stay_cached(self, memory_file: str) -> None:
+        _write_graph(memory_file)
+        graph = _lazy(memory_file, cache_size=2)
+        graph.find_entity("e0")
+        graph.find_entity("e1")
+        graph.find_entity("e0")
+        graph.find_entity("e2")  # Evicts e1, the least recently used
+        decodes = graph._entities.decodes
+        graph.find_entity("e0")
+        assert graph._entities.decodes == decodes
+        graph.find_entity("e1")
+        assert graph._entities.decodes == decodes + 1
+
+    def test_iteration_does_not_flush_the_cache(self, memory_file: str) -> None:
+        _write_graph(memory_file)
+        graph = _lazy(memory_file, cache_size=2)
+        hot = graph.find_entity("e3")
+        assert len(graph.entities) == 50
+        assert graph.find_entity("e3") is hot
+        assert graph._entities.resident == 1
+
+    def test_mutations_survive_eviction(self, memory_file: str) -> None:
+        _write_graph(memory_file)
+        graph = _lazy(memory_file, cache_size=2)
+        assert graph.add_observations("e0", ["edited"])
+        graph.delete_observations("e1", ["fact 1a"])
+        for i in range(2, 50):
+            graph.find_entity(f"e{i}")
+        assert graph.find_entity("e0")["observations"] == ["fact 0a", "fact 0b", "edited"]
+        assert graph.find_entity("e1")["observations"] == ["fact 1b"]
+
+    def test_save_and_reload_round_trip(self, memory_file: str) -> None:
+        _write_graph(memory_file)
+        graph = _lazy(memory_file, cache_size=2)
+        graph.add_observations("e5", ["edited"])
+        graph.delete_entities(["e6"])
+        graph.upsert_entity("e99", "Concept", ["new"])
+        graph.save()
+
+        reloaded = _eager(memory_file)
+        assert reloaded.find_entity("e5")["observations"][-1] == "edited"
+        assert reloaded.find_entity("e6") is None
+        assert not reloaded.has_relation("e5", "e6", "next")
+        assert [e["name"] for e in reloaded.entities][-1] == "e99"
+
+    def test_wal_replay_on_lazy_load(self, memory_file: str) -> None:
+        _write_graph(memory_file, binary=True)
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.add_observations("e1", ["logged"])
+        graph.save()
+
+        lazy = _lazy(memory_file, cache_size=2, wal=True)
+        for i in range(10, 40):
+            lazy.find_entity(f"e{i}")
+        assert lazy.find_entity("e1")["observations"][-1] == "logged"
+
+    def test_search_works_lazily(self, memory_file: str) -> None:
+        _write_graph(memory_file)
+        graph = _lazy(memory_file, cache_size=2)
+        assert [e["name"] for e in graph.search("fact 42a")] == ["e42"]
+
+    def test_reload_after_foreign_compaction_releases_old_map(self, memory_file: str) -> None:
+        _write_graph(memory_file, binary=True)
+        lazy = _lazy(memory_file, wal=True, watch=True, watch_interval_ms=60_000)
+        writer = KnowledgeGraph(file_path=memory_file, wal=True, binary_snapshot=True)
+        try:
+            writer.load()
+            writer.upsert_entity("e99", "Concept", ["new"])
+            writer.compact()
+            old = lazy._entities
+            assert lazy.refresh() is True
+            assert old._source is None
+            assert lazy._entities is not old
+            assert lazy.find_entity("e99")["observations"] == ["new"]
+        finally:
+            lazy.close()
+            writer.close()
+
+    def test_rejects_non_positive_cache_size(self) -> None:
+        with pytest.raises(ValueError, match="lazy_cache_size"):
+            KnowledgeGraph(lazy=True, lazy_cache_size=0)
+
+    def test_rejects_cache_size_without_lazy(self) -> None:
+        with pytest.raises(ValueError, match="lazy_cache_size only applies with lazy=True"):
+            KnowledgeGraph(lazy_cache_size=8)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
+from typing import Any
 
 import pytest
 
@@ -14,8 +16,10 @@ def memory_file() -> str:
     fd, path = tempfile.mkstemp(suffix=".jsonl")
     os.close(fd)
     yield path
-    if os.path.exists(path):
-        os.unlink(path)
+    for leftover in (path, f"{path}.wal", f"{path}.snap", f"{path}.lock"):
+        if os.path.exists(leftover):
+            os.unlink(leftover)
+    shutil.rmtree(f"{path}.shards", ignore_errors=True)
 
 
 @pytest.fixture
@@ -28,7 +32,7 @@ async def memory_server(memory_file: str):
 
 
 class TestMemoryServerTools:
-    """The memory server must expose all 9 knowledge graph tools."""
+    """The memory server must expose all 9 knowledge graph tools plus traverse, apply_mutations and changes_since."""
 
     @pytest.mark.asyncio
     async def test_server_has_create_entities_tool(self, memory_server) -> None:
@@ -85,9 +89,27 @@ class TestMemoryServerTools:
         assert "open_nodes" in tool_names
 
     @pytest.mark.asyncio
-    async def test_server_exposes_exactly_9_tools(self, memory_server) -> None:
+    async def test_server_has_traverse_tool(self, memory_server) -> None:
         tools = await memory_server.list_tools()
-        assert len(tools) == 9
+        tool_names = [t.name for t in tools]
+        assert "traverse" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_server_has_apply_mutations_tool(self, memory_server) -> None:
+        tools = await memory_server.list_tools()
+        tool_names = [t.name for t in tools]
+        assert "apply_mutations" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_server_has_changes_since_tool(self, memory_server) -> None:
+        tools = await memory_server.list_tools()
+        tool_names = [t.name for t in tools]
+        assert "changes_since" in tool_names
+
+    @pytest.mark.asyncio
+    async def test_server_exposes_9_protocol_tools_plus_extensions(self, memory_server) -> None:
+        tools = await memory_server.list_tools()
+        assert len(tools) == 12
 
 
 class TestMemoryServerOperations:
@@ -239,6 +261,8 @@ class TestCorruptJSONLRecovery:
 
     @pytest.mark.asyncio
     async def test_all_corrupt_lines_results_in_empty_graph(self, memory_file: str) -> None:
+        import json
+
         with open(memory_file, "w", encoding="utf-8") as f:
             f.write("bad line 1\n")
             f.write("{not json\n")
@@ -247,8 +271,7 @@ class TestCorruptJSONLRecovery:
 
         server = create_memory_server(memory_file_path=memory_file)
         result = await server.call_tool("read_graph", {})
-        result_text = str(result)
-        assert '"entities": []' in result_text
+        assert json.loads(result[1]["result"])["entities"] == []
 
 
 class TestObservationMergeOrder:
@@ -343,3 +366,1155 @@ class TestMemoryFilePathValidation:
 
         with pytest.raises(ValueError, match="must end with .jsonl"):
             create_memory_server(memory_file_path="/tmp/bad.json")
+
+
+class TestWriteAheadLog:
+    """WAL mode appends op records instead of rewriting the snapshot."""
+
+    def test_mutations_append_to_log_not_snapshot(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.upsert_entity("Alex", "Person", ["Human partner"])
+        graph.save()
+        assert os.path.getsize(memory_file) == 0
+        assert os.path.getsize(graph.wal_path) > 0
+
+    def test_load_replays_log(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.upsert_entity("Alex", "Person", ["a"])
+        graph.upsert_entity("Jade", "Person")
+        graph.create_relation("Alex", "Jade", "related_to")
+        graph.add_observations("Alex", ["b"])
+        graph.delete_observations("Alex", ["a"])
+        graph.save()
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert reloaded.find_entity("Alex")["observations"] == ["b"]
+        assert len(reloaded.relations) == 1
+
+        reloaded.wal = True
+        reloaded.delete_entities(["Jade"])
+        reloaded.save()
+        third = KnowledgeGraph(file_path=memory_file)
+        third.load()
+        assert third.find_entity("Jade") is None
+        assert third.relations == []
+
+    def test_compaction_folds_log_into_snapshot(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True, compact_bytes=1)
+        graph.load()
+        graph.upsert_entity("Alex", "Person", ["Human partner"])
+        graph.save()
+        assert os.path.getsize(memory_file) > 0
+        with open(graph.wal_path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 1  # Only the checkpoint header remains
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert reloaded.find_entity("Alex")["observations"] == ["Human partner"]
+
+    def test_stale_log_not_replayed_after_compaction(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.create_relation("A", "B", "related_to")
+        graph.save()
+        with open(graph.wal_path, encoding="utf-8") as f:
+            old_log = f.read()
+        graph.compact()
+        # Simulate a crash after the snapshot swap but before the log reset
+        with open(graph.wal_path, "w", encoding="utf-8") as f:
+            f.write(old_log)
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert len(reloaded.relations) == 1
+
+    def test_torn_log_tail_skipped(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.upsert_entity("Kept", "Concept")
+        graph.save()
+        with open(graph.wal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "upsert_ent')
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert [e["name"] for e in reloaded.entities] == ["Kept"]
+
+    @pytest.mark.asyncio
+    async def test_server_in_wal_mode_survives_restart(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import create_memory_server
+
+        server1 = create_memory_server(memory_file_path=memory_file, wal=True)
+        await server1.call_tool(
+            "create_entities",
+            {"entities": [{"name": "Logged", "entityType": "Concept", "observations": ["via wal"]}]},
+        )
+        server2 = create_memory_server(memory_file_path=memory_file, wal=True)
+        result = await server2.call_tool("open_nodes", {"names": ["Logged"]})
+        assert "via wal" in str(result)
+
+    def test_compaction_tuning_requires_wal(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        for options in ({"compact_bytes": 1}, {"compact_ratio": 0.5}):
+            with pytest.raises(ValueError, match="only applies with wal=True"):
+                KnowledgeGraph(**options)
+        assert KnowledgeGraph(wal=True).compact_bytes == 4 * 1024 * 1024
+
+
+class TestEntityIndex:
+    """The name index stays in step with every mutation path."""
+
+    def test_find_entity_tracks_upsert_and_delete(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        graph.upsert_entity("Alex", "Person", ["a"])
+        assert graph.find_entity("Alex")["entityType"] == "Person"
+        graph.delete_entities(["Alex"])
+        assert graph.find_entity("Alex") is None
+        assert graph.entities == []
+
+    def test_constructor_entities_are_indexed(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(entities=[{"name": "Seed", "entityType": "Concept", "observations": []}])
+        assert graph.find_entity("Seed") is not None
+
+    def test_load_merges_duplicate_records_in_order(self, memory_file: str) -> None:
+        import json
+
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        with open(memory_file, "w", encoding="utf-8") as f:
+            for i in range(1000):
+                record = {"type": "entity", "name": f"e{i % 10}", "entityType": "Concept", "observations": [f"o{i}"]}
+                f.write(json.dumps(record) + "\n")
+
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.load()
+        assert [e["name"] for e in graph.entities] == [f"e{i}" for i in range(10)]
+        assert graph.find_entity("e3")["observations"][:2] == ["o3", "o13"]
+
+
+class TestRelationIndex:
+    """Adjacency maps and the triple set keep relation queries local."""
+
+    def test_duplicate_relation_rejected(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        assert graph.create_relation("A", "B", "related_to") is True
+        assert graph.create_relation("A", "B", "related_to") is False
+        assert graph.create_relation("A", "B", "uses_tool") is True
+        assert len(graph.relations) == 2
+
+    def test_relations_of_returns_incident_edges_once(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        graph.create_relation("A", "B", "related_to")
+        graph.create_relation("B", "C", "related_to")
+        graph.create_relation("C", "D", "related_to")
+        related = graph.relations_of(["A", "B"])
+        assert [(r["from"], r["to"]) for r in related] == [("A", "B"), ("B", "C")]
+
+    def test_delete_entity_drops_incident_edges_only(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        for name in ("A", "B", "C"):
+            graph.upsert_entity(name)
+        graph.create_relation("A", "B", "related_to")
+        graph.create_relation("C", "A", "related_to")
+        graph.create_relation("B", "C", "related_to")
+        graph.delete_entities(["A"])
+        assert [(r["from"], r["to"]) for r in graph.relations] == [("B", "C")]
+        assert graph.relations_of(["A"]) == []
+
+    def test_load_collapses_duplicate_relation_lines(self, memory_file: str) -> None:
+        import json
+
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        with open(memory_file, "w", encoding="utf-8") as f:
+            for _ in range(3):
+                f.write(json.dumps({"type": "relation", "from": "A", "to": "B", "relationType": "related_to"}) + "\n")
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.load()
+        assert len(graph.relations) == 1
+
+    @pytest.mark.asyncio
+    async def test_create_relations_reports_duplicates(self, memory_server) -> None:
+        import json
+
+        args = {"relations": [{"from": "A", "to": "B", "relationType": "related_to"}]}
+        await memory_server.call_tool("create_relations", args)
+        result = await memory_server.call_tool("create_relations", args)
+        parsed = json.loads(result[1]["result"])
+        assert parsed["created"] == []
+        assert parsed["duplicates"] == ["A -> B"]
+
+
+class TestSearchNodesIndex:
+    """search_nodes is served by the incrementally maintained full-text index."""
+
+    @pytest.mark.asyncio
+    async def test_search_reflects_later_mutations(self, memory_server) -> None:
+        import json
+
+        await memory_server.call_tool("search_nodes", {"query": "warm"})  # Builds the index
+        await memory_server.call_tool(
+            "create_entities",
+            {"entities": [{"name": "Cache", "entityType": "Concept", "observations": ["warm path"]}]},
+        )
+        result = await memory_server.call_tool("search_nodes", {"query": "warm"})
+        assert [e["name"] for e in json.loads(result[1]["result"])["entities"]] == ["Cache"]
+
+        await memory_server.call_tool(
+            "delete_observations", {"deletions": [{"entityName": "Cache", "observations": ["warm path"]}]}
+        )
+        result = await memory_server.call_tool("search_nodes", {"query": "warm"})
+        assert json.loads(result[1]["result"])["entities"] == []
+
+    @pytest.mark.asyncio
+    async def test_search_limit(self, memory_server) -> None:
+        import json
+
+        await memory_server.call_tool(
+            "create_entities",
+            {"entities": [{"name": f"topic-{i}", "entityType": "Concept", "observations": []} for i in range(5)]},
+        )
+        result = await memory_server.call_tool("search_nodes", {"query": "topic", "limit": 3})
+        assert len(json.loads(result[1]["result"])["entities"]) == 3
+
+
+class TestObservationList:
+    """Insertion-ordered observation set that still serializes as a list."""
+
+    def test_merge_skips_duplicates_and_reports_added(self) -> None:
+        from jade.mcp.memory_server import ObservationList
+
+        obs = ObservationList(["a", "b", "a"])
+        assert obs == ["a", "b"]
+        assert obs.merge(["b", "c", "c"]) == ["c"]
+        assert obs == ["a", "b", "c"]
+        assert "c" in obs
+        assert "z" not in obs
+
+    def test_append_is_idempotent(self) -> None:
+        from jade.mcp.memory_server import ObservationList
+
+        obs = ObservationList()
+        obs.append("x")
+        obs.append("x")
+        assert obs == ["x"]
+
+    def test_discard_preserves_order(self) -> None:
+        from jade.mcp.memory_server import ObservationList
+
+        obs = ObservationList(["a", "b", "c", "d"])
+        assert obs.discard(["c", "a", "missing"]) == ["a", "c"]
+        assert obs == ["b", "d"]
+        assert "a" not in obs
+
+    def test_positional_mutation_keeps_membership_in_sync(self) -> None:
+        from jade.mcp.memory_server import ObservationList
+
+        obs = ObservationList(["a", "b"])
+        obs[0] = "b"
+        assert obs == ["b"]
+        del obs[0]
+        assert "b" not in obs
+
+    def test_serializes_as_plain_list(self) -> None:
+        import json
+
+        from jade.mcp.memory_server import ObservationList
+
+        assert json.dumps({"observations": ObservationList(["a", "b"])}) == '{"observations": ["a", "b"]}'
+
+    def test_graph_entities_use_observation_list(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph, ObservationList
+
+        graph = KnowledgeGraph(entities=[{"name": "Seed", "entityType": "Concept", "observations": ["x", "x"]}])
+        graph.upsert_entity("New", "Concept", ["y"])
+        for entity in graph.entities:
+            assert isinstance(entity["observations"], ObservationList)
+        assert graph.find_entity("Seed")["observations"] == ["x"]
+
+
+class TestDurabilityModes:
+    """Group-commit and interval durability coalesce saves into fewer writes."""
+
+    def _entity_names_on_disk(self, path: str) -> list[str]:
+        import json
+
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line)["name"] for line in f if line.strip()]
+
+    def test_group_commit_flushes_at_mutation_budget(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        graph = KnowledgeGraph(
+            file_path=memory_file, durability=Durability.GROUP, group_window_ms=60_000, group_max_mutations=3
+        )
+        for name in ("a", "b"):
+            graph.upsert_entity(name)
+            graph.save()
+        assert self._entity_names_on_disk(memory_file) == []
+
+        graph.upsert_entity("c")
+        graph.save()
+        assert self._entity_names_on_disk(memory_file) == ["a", "b", "c"]
+        assert graph.flush_stats.flushes == 1
+        assert graph.flush_stats.last_batch == 3
+        graph.close()
+
+    def test_group_commit_timer_flushes_after_window(self, memory_file: str) -> None:
+        import time
+
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, durability=Durability.GROUP, group_window_ms=20)
+        graph.upsert_entity("late")
+        graph.save()
+        deadline = time.monotonic() + 2
+        while graph.flush_stats.flushes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self._entity_names_on_disk(memory_file) == ["late"]
+        graph.close()
+
+    def test_interval_flusher_writes_in_background(self, memory_file: str) -> None:
+        import time
+
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True, durability=Durability.INTERVAL, flush_interval_ms=20)
+        graph.load()
+        for name in ("x", "y"):
+            graph.upsert_entity(name)
+        graph.save()
+        deadline = time.monotonic() + 2
+        while graph.flush_stats.flushes == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        graph.close()
+        assert graph.flush_stats.mutations == 2
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert [e["name"] for e in reloaded.entities] == ["x", "y"]
+
+    def test_explicit_flush_and_close(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, durability=Durability.INTERVAL, flush_interval_ms=60_000)
+        graph.upsert_entity("first")
+        graph.save()
+        graph.flush()
+        assert self._entity_names_on_disk(memory_file) == ["first"]
+        graph.upsert_entity("second")
+        graph.save()
+        graph.close()
+        assert self._entity_names_on_disk(memory_file) == ["first", "second"]
+        assert graph.flush_stats.flushes == 2
+        assert graph.flush_stats.mean_batch == 1.0
+
+    def test_rejects_non_positive_window(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        with pytest.raises(ValueError, match="must be positive"):
+            KnowledgeGraph(group_window_ms=0)
+
+    def test_rejects_tuning_for_other_durability(self) -> None:
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        with pytest.raises(ValueError, match="group_window_ms only applies with durability=GROUP"):
+            KnowledgeGraph(group_window_ms=10)
+        with pytest.raises(ValueError, match="flush_interval_ms only applies with durability=INTERVAL"):
+            KnowledgeGraph(durability=Durability.GROUP, flush_interval_ms=10)
+        graph = KnowledgeGraph(durability="group", group_max_mutations=5)
+        assert (graph.group_window_ms, graph.group_max_mutations) == (50, 5)
+
+
+class TestInjectedGraph:
+    """create_memory_server can serve an already loaded graph."""
+
+    @pytest.mark.asyncio
+    async def test_tools_operate_on_injected_graph(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import create_memory_server, load_graph
+
+        graph = load_graph(memory_file)
+        server = create_memory_server(graph=graph)
+        await server.call_tool(
+            "create_entities", {"entities": [{"name": "Injected", "entityType": "Concept", "observations": []}]}
+        )
+        assert graph.find_entity("Injected") is not None
+        assert graph.file_path == os.path.realpath(memory_file)
+
+
+class TestReadToolPaging:
+    """read_graph, search_nodes and open_nodes page, filter and project."""
+
+    @staticmethod
+    async def _call(server: Any, tool: str, args: dict[str, Any]) -> dict[str, Any]:
+        import json
+
+        result = await server.call_tool(tool, args)
+        return json.loads(result[1]["result"])
+
+    @pytest.fixture
+    async def paged_server(self, memory_file: str):
+        from jade.mcp.memory_server import create_memory_server
+
+        server = create_memory_server(memory_file_path=memory_file)
+        entities = [
+            {"name": f"n{i}", "entityType": "Decision" if i % 2 else "Concept", "observations": [f"obs {i}", "shared"]}
+            for i in range(5)
+        ]
+        await server.call_tool("create_entities", {"entities": entities})
+        await server.call_tool(
+            "create_relations",
+            {"relations": [{"from": f"n{i}", "to": f"n{i + 1}", "relationType": "next"} for i in range(4)]},
+        )
+        return server
+
+    @pytest.mark.asyncio
+    async def test_read_graph_unpaged_has_no_cursor(self, paged_server: Any) -> None:
+        page = await self._call(paged_server, "read_graph", {})
+        assert len(page["entities"]) == 5
+        assert len(page["relations"]) == 4
+        assert "nextCursor" not in page
+
+    @pytest.mark.asyncio
+    async def test_read_graph_pages_cover_graph_once(self, paged_server: Any) -> None:
+        entities, relations, cursor, pages = [], [], None, 0
+        while True:
+            args: dict[str, Any] = {"limit": 2}
+            if cursor:
+                args["cursor"] = cursor
+            page = await self._call(paged_server, "read_graph", args)
+            pages += 1
+            assert len(page["entities"]) + len(page["relations"]) <= 2
+            entities += [e["name"] for e in page["entities"]]
+            relations += [r["from"] for r in page["relations"]]
+            cursor = page.get("nextCursor")
+            if cursor is None:
+                break
+        assert entities == [f"n{i}" for i in range(5)]
+        assert relations == [f"n{i}" for i in range(4)]
+        assert pages == 5
+
+    @pytest.mark.asyncio
+    async def test_read_graph_entity_type_filter(self, paged_server: Any) -> None:
+        page = await self._call(paged_server, "read_graph", {"entityTypes": ["Decision"]})
+        assert [e["name"] for e in page["entities"]] == ["n1", "n3"]
+        # Every relation touches a Decision, since types alternate
+        assert len(page["relations"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_projection_and_truncation(self, paged_server: Any) -> None:
+        page = await self._call(paged_server, "read_graph", {"projection": "names", "limit": 1})
+        assert page["entities"] == [{"name": "n0"}]
+        page = await self._call(paged_server, "open_nodes", {"names": ["n2"], "maxObservations": 1})
+        assert page["entities"] == [
+            {"name": "n2", "entityType": "Concept", "observations": ["obs 2"], "observationCount": 2}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_nodes_pages_in_rank_order(self, paged_server: Any) -> None:
+        everything = await self._call(paged_server, "search_nodes", {"query": "shared"})
+        first = await self._call(paged_server, "search_nodes", {"query": "shared", "limit": 3})
+        second = await self._call(
+            paged_server, "search_nodes", {"query": "shared", "limit": 3, "cursor": first["nextCursor"]}
+        )
+        assert first["entities"] + second["entities"] == everything["entities"]
+        assert "nextCursor" not in second
+
+    @pytest.mark.asyncio
+    async def test_search_nodes_type_filter(self, paged_server: Any) -> None:
+        page = await self._call(
+            paged_server, "search_nodes", {"query": "shared", "entityTypes": ["Concept"], "projection": "summary"}
+        )
+        assert sorted(e["name"] for e in page["entities"]) == ["n0", "n2", "n4"]
+        assert all(set(e) == {"name", "entityType"} for e in page["entities"])
+
+    @pytest.mark.asyncio
+    async def test_open_nodes_pages_requested_names(self, paged_server: Any) -> None:
+        first = await self._call(paged_server, "open_nodes", {"names": ["n0", "n1", "n2"], "limit": 2})
+        assert [e["name"] for e in first["entities"]] == ["n0", "n1"]
+        assert {(r["from"], r["to"]) for r in first["relations"]} == {("n0", "n1"), ("n1", "n2")}
+        second = await self._call(
+            paged_server, "open_nodes", {"names": ["n0", "n1", "n2"], "limit": 2, "cursor": first["nextCursor"]}
+        )
+        assert [e["name"] for e in second["entities"]] == ["n2"]
+        assert "nextCursor" not in second
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_rejected(self, paged_server: Any) -> None:
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        with pytest.raises(ToolError, match="cursor"):
+            await paged_server.call_tool("read_graph", {"cursor": "bogus"})
+        with pytest.raises(ToolError, match="limit"):
+            await paged_server.call_tool("read_graph", {"limit": 0})
+
+
+class TestTraverseTool:
+    """traverse expands seeds breadth-first within depth and node budgets."""
+
+    @staticmethod
+    async def _call(server: Any, args: dict[str, Any]) -> dict[str, Any]:
+        import json
+
+        result = await server.call_tool("traverse", args)
+        return json.loads(result[1]["result"])
+
+    @pytest.fixture
+    async def session_server(self, memory_file: str):
+        from jade.mcp.memory_server import create_memory_server
+
+        server = create_memory_server(memory_file_path=memory_file)
+        entities = [
+            {"name": "S1", "entityType": "Session", "observations": ["kickoff"]},
+            {"name": "D1", "entityType": "Decision", "observations": ["use Redis"]},
+            {"name": "D2", "entityType": "Decision", "observations": ["use Neon"]},
+            {"name": "Alex", "entityType": "Person", "observations": ["partner"]},
+            {"name": "Jade", "entityType": "Agent", "observations": ["assistant"]},
+        ]
+        relations = [
+            {"from": "D1", "to": "S1", "relationType": "decided_in"},
+            {"from": "D2", "to": "S1", "relationType": "decided_in"},
+            {"from": "D1", "to": "Alex", "relationType": "decided_by"},
+            {"from": "D2", "to": "Jade", "relationType": "decided_by"},
+        ]
+        await server.call_tool("create_entities", {"entities": entities})
+        await server.call_tool("create_relations", {"relations": relations})
+        return server
+
+    @pytest.mark.asyncio
+    async def test_session_to_people_in_one_call(self, session_server: Any) -> None:
+        result = await self._call(session_server, {"names": ["S1"], "maxDepth": 2})
+        assert [e["name"] for e in result["entities"]] == ["S1", "D1", "D2", "Alex", "Jade"]
+        assert len(result["relations"]) == 4
+        assert result["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_depth_limits_expansion(self, session_server: Any) -> None:
+        result = await self._call(session_server, {"names": ["S1"], "maxDepth": 1})
+        assert [e["name"] for e in result["entities"]] == ["S1", "D1", "D2"]
+        assert {r["relationType"] for r in result["relations"]} == {"decided_in"}
+        result = await self._call(session_server, {"names": ["S1"], "maxDepth": 0})
+        assert [e["name"] for e in result["entities"]] == ["S1"]
+        assert result["relations"] == []
+
+    @pytest.mark.asyncio
+    async def test_relation_type_and_direction_filters(self, session_server: Any) -> None:
+        result = await self._call(session_server, {"names": ["D1"], "relationTypes": ["decided_by"]})
+        assert [e["name"] for e in result["entities"]] == ["D1", "Alex"]
+        result = await self._call(session_server, {"names": ["S1"], "direction": "out"})
+        assert [e["name"] for e in result["entities"]] == ["S1"]
+        result = await self._call(session_server, {"names": ["Alex"], "direction": "in", "maxDepth": 3})
+        assert [e["name"] for e in result["entities"]] == ["Alex", "D1"]
+
+    @pytest.mark.asyncio
+    async def test_node_budget_truncates(self, session_server: Any) -> None:
+        result = await self._call(session_server, {"names": ["S1"], "maxNodes": 2, "projection": "names"})
+        assert result["entities"] == [{"name": "S1"}, {"name": "D1"}]
+        assert result["relations"] == [{"from": "D1", "to": "S1", "relationType": "decided_in"}]
+        assert result["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_budget_rejected(self, session_server: Any) -> None:
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        with pytest.raises(ToolError, match="maxNodes must be at least 1"):
+            await session_server.call_tool("traverse", {"names": ["S1"], "maxNodes": 0})
+
+
+class TestTransactions:
+    """transaction() applies a batch atomically with one save."""
+
+    def test_batch_saves_once(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        with graph.transaction():
+            graph.upsert_entity("Decision", "Decision", ["use Redis"])
+            assert graph.create_relation("Decision", "Alex", "decided_by")  # Sees earlier ops
+            with graph.transaction():  # Nested joins the outer batch
+                graph.add_observations("Decision", ["for hot memory"])
+        assert graph.flush_stats.flushes == 1
+        assert graph.flush_stats.last_batch == 3
+
+        reloaded = KnowledgeGraph(file_path=memory_file, wal=True)
+        reloaded.load()
+        assert reloaded.find_entity("Decision")["observations"] == ["use Redis", "for hot memory"]
+        assert reloaded.has_relation("Decision", "Alex", "decided_by")
+
+    def test_failure_undoes_every_mutation(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        graph.upsert_entity("Alex", "Person", ["a", "b", "c"])
+        graph.upsert_entity("Redis", "Technology")
+        graph.create_relation("Alex", "Redis", "uses")
+        graph.save()
+        before = (graph.entities, graph.relations)
+        assert [e["name"] for e in graph.search("b")] == ["Alex"]
+
+        with pytest.raises(RuntimeError, match="boom"), graph.transaction():
+            graph.upsert_entity("New", "Concept", ["fresh"])
+            graph.upsert_entity("Alex", "Person", ["d"])
+            graph.delete_observations("Alex", ["b"])
+            graph.create_relation("Alex", "New", "knows")
+            graph.delete_relations([("Alex", "Redis", "uses")])
+            graph.delete_entities(["Redis"])
+            raise RuntimeError("boom")
+
+        assert (graph.entities, graph.relations) == before
+        assert graph.find_entity("New") is None
+        assert [e["name"] for e in graph.search("b")] == ["Alex"]  # Search index rebuilt
+        assert graph.search("fresh") == []
+        graph.save()
+        reloaded = KnowledgeGraph(file_path=memory_file, wal=True)
+        reloaded.load()
+        assert (reloaded.entities, reloaded.relations) == before
+
+
+class TestApplyMutationsTool:
+    """apply_mutations runs heterogeneous mutation ops as one transaction."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_batch_returns_per_op_results(self, memory_server) -> None:
+        import json
+
+        operations = [
+            {"op": "create_entities", "entities": [{"name": "D1", "entityType": "Decision", "observations": []}]},
+            {"op": "add_observations", "observations": [{"entityName": "D1", "contents": ["a", "b", "c"]}]},
+            {"op": "create_relations", "relations": [{"from": "D1", "to": "Alex", "relationType": "decided_by"}]},
+            {"op": "create_relations", "relations": [{"from": "D1", "to": "Alex", "relationType": "decided_by"}]},
+        ]
+        result = await memory_server.call_tool("apply_mutations", {"operations": operations})
+        results = json.loads(result[1]["result"])["results"]
+        assert results == [
+            {"op": "create_entities", "created": ["D1"]},
+            {"op": "add_observations", "added": [{"entityName": "D1", "addedCount": 3}]},
+            {"op": "create_relations", "created": ["D1 -> Alex"]},
+            {"op": "create_relations", "created": [], "duplicates": ["D1 -> Alex"]},
+        ]
+
+        result = await memory_server.call_tool("open_nodes", {"names": ["D1"]})
+        opened = json.loads(result[1]["result"])
+        assert opened["entities"][0]["observations"] == ["a", "b", "c"]
+        assert len(opened["relations"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_op_rolls_back_batch(self, memory_server) -> None:
+        import json
+
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        operations = [
+            {"op": "create_entities", "entities": [{"name": "Kept?", "entityType": "Concept", "observations": []}]},
+            {"op": "create_entities", "entities": [{"entityType": "Concept"}]},
+        ]
+        with pytest.raises(ToolError, match="Entity name is required"):
+            await memory_server.call_tool("apply_mutations", {"operations": operations})
+        result = await memory_server.call_tool("read_graph", {})
+        assert json.loads(result[1]["result"])["entities"] == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_malformed_ops_before_applying(self, memory_server) -> None:
+        from mcp.server.fastmcp.exceptions import ToolError
+
+        with pytest.raises(ToolError, match=r"operations\[1\]: op must be one of"):
+            await memory_server.call_tool(
+                "apply_mutations", {"operations": [{"op": "delete_entities", "entityNames": []}, {"op": "drop"}]}
+            )
+        with pytest.raises(ToolError, match="needs a relations list"):
+            await memory_server.call_tool("apply_mutations", {"operations": [{"op": "delete_relations"}]})
+
+
+class TestChangeFeed:
+    """Every mutation gets a seq; changes_since serves the feed incrementally."""
+
+    def test_changes_in_order_with_cursor(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        graph.upsert_entity("Alex", "Person", ["a"])
+        graph.create_relation("Alex", "Redis", "uses")
+        graph.delete_relations([("Alex", "Redis", "uses")])
+        changes, seq, reset = graph.changes_since(0)
+        assert [(c["seq"], c["op"]) for c in changes] == [
+            (1, "upsert_entity"),
+            (2, "create_relation"),
+            (3, "delete_relations"),
+        ]
+        assert seq == 3 and reset is False
+
+        changes, seq, _ = graph.changes_since(0, limit=2)
+        assert [c["seq"] for c in changes] == [1, 2] and seq == 2
+        changes, seq, _ = graph.changes_since(seq, limit=2)
+        assert [c["seq"] for c in changes] == [3] and seq == 3
+        assert graph.changes_since(3) == ([], 3, False)
+
+    def test_ring_overflow_and_foreign_seq_reset(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(change_buffer=2)
+        for name in ("a", "b", "c"):
+            graph.upsert_entity(name)
+        assert [c["name"] for c in graph.changes_since(1)[0]] == ["b", "c"]
+        assert graph.changes_since(0) == ([], 3, True)
+        assert graph.changes_since(99) == ([], 3, True)
+        with pytest.raises(ValueError, match="seq must be non-negative"):
+            graph.changes_since(-1)
+
+    def test_rolled_back_changes_leave_the_feed(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph()
+        graph.upsert_entity("kept")
+        with pytest.raises(RuntimeError), graph.transaction():
+            graph.upsert_entity("dropped")
+            raise RuntimeError
+        graph.upsert_entity("next")
+        assert [(c["seq"], c["name"]) for c in graph.changes_since(0)[0]] == [(1, "kept"), (2, "next")]
+
+    def test_wal_persists_numbering_and_serves_old_changes(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True)
+        graph.load()
+        for name in ("a", "b"):
+            graph.upsert_entity(name)
+            graph.save()
+
+        restarted = KnowledgeGraph(file_path=memory_file, wal=True, change_buffer=1)
+        restarted.load()
+        restarted.upsert_entity("c")
+        restarted.upsert_entity("d")  # Ring now holds only d; c is unflushed
+        changes, seq, reset = restarted.changes_since(0)
+        assert reset is True and seq == 4  # c left the ring before reaching the log
+        restarted.save()
+        changes, seq, reset = restarted.changes_since(0)
+        assert [(c["seq"], c["name"]) for c in changes] == [(1, "a"), (2, "b"), (3, "c"), (4, "d")]
+        assert seq == 4 and reset is False
+
+        restarted.compact()  # Checkpoint carries the seq and history forward
+        again = KnowledgeGraph(file_path=memory_file, wal=True)
+        again.load()
+        again.upsert_entity("e")
+        assert again.history == restarted.history
+        assert again.changes_since(4, history=restarted.history)[0][0]["seq"] == 5
+        assert again.changes_since(2)[2] is True
+
+    def test_restart_without_wal_starts_a_new_history(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.load()
+        for n in range(5):
+            graph.upsert_entity(f"a{n}")
+        graph.save()
+        seq, history = graph.changes_since(0)[1], graph.history
+
+        restarted = KnowledgeGraph(file_path=memory_file)
+        restarted.load()
+        for n in range(8):
+            restarted.upsert_entity(f"b{n}")
+        assert restarted.history != history
+        assert restarted.changes_since(seq, history=history) == ([], 8, True)
+        changes, _, reset = restarted.changes_since(0, history=restarted.history)
+        assert len(changes) == 8 and reset is False
+
+    @pytest.mark.asyncio
+    async def test_changes_since_tool(self, memory_server) -> None:
+        import json
+
+        await memory_server.call_tool(
+            "create_entities", {"entities": [{"name": "Feed", "entityType": "Concept", "observations": ["x"]}]}
+        )
+        result = await memory_server.call_tool("changes_since", {"seq": 0})
+        payload = json.loads(result[1]["result"])
+        assert isinstance(payload["changes"][0].pop("at"), float)  # Write time, see recall
+        history = payload.pop("history")
+        assert payload == {
+            "changes": [
+                {"op": "upsert_entity", "name": "Feed", "entityType": "Concept", "observations": ["x"], "seq": 1}
+            ],
+            "seq": 1,
+            "reset": False,
+        }
+        result = await memory_server.call_tool("changes_since", {"seq": 1, "history": history})
+        assert json.loads(result[1]["result"])["reset"] is False
+        result = await memory_server.call_tool("changes_since", {"seq": 1, "history": "elsewhere"})
+        assert json.loads(result[1]["result"])["reset"] is True
+
+
+class TestConcurrentAccess:
+    """Read tools run alongside mutations from other threads without errors."""
+
+    def test_readers_and_writers_in_parallel(self, memory_file: str) -> None:
+        import threading
+
+        from jade.mcp.memory_server import Durability, KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, durability=Durability.GROUP)
+        for i in range(50):
+            graph.upsert_entity(f"seed{i}", "Concept", [f"seed observation {i}"])
+        errors: list[BaseException] = []
+
+        def writer(worker: int) -> None:
+            try:
+                for i in range(200):
+                    with graph.writing():
+                        graph.upsert_entity(f"w{worker}-{i}", "Concept", [f"written {i}"])
+                        graph.create_relation(f"w{worker}-{i}", f"seed{i % 50}", "mentions")
+                    if i % 3 == 0:
+                        graph.delete_entities([f"w{worker}-{i - 1}"])
+                    graph.save()
+            except BaseException as exc:
+                errors.append(exc)
+
+        def reader() -> None:
+            try:
+                for _ in range(200):
+                    with graph.reading():
+                        graph.read_page(0, None)
+                        graph.search("observation", 5)
+                        graph.relations_of(["seed1", "seed2"])
+            except BaseException as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(2)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+        graph.close()
+        assert errors == []
+        assert len(graph.relations) == sum(1 for r in graph.relations if graph.find_entity(r["from"]))
+
+    @pytest.mark.asyncio
+    async def test_read_tools_overlap(self, memory_file: str) -> None:
+        import asyncio
+        import threading
+
+        from jade.mcp.memory_server import KnowledgeGraph, create_memory_server
+
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.upsert_entity("A", "Concept")
+        both_reading = threading.Barrier(2, timeout=5)
+        read_page = graph.read_page
+
+        def meet_then_read(*args: object) -> object:
+            both_reading.wait()  # Breaks (and fails the call) unless the other read is in progress too
+            return read_page(*args)
+
+        graph.read_page = meet_then_read  # type: ignore[method-assign]
+        server = create_memory_server(graph=graph, response_cache_size=0)
+        await asyncio.gather(*(server.call_tool("read_graph", {"limit": n}) for n in (1, 2)))
+
+    @pytest.mark.asyncio
+    async def test_waiting_writer_leaves_event_loop_free(self, memory_file: str) -> None:
+        import asyncio
+        import threading
+
+        from jade.mcp.memory_server import KnowledgeGraph, create_memory_server
+
+        graph = KnowledgeGraph(file_path=memory_file)
+        server = create_memory_server(graph=graph)
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock() -> None:
+            with graph.writing():
+                locked.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(5)
+        write = asyncio.ensure_future(
+            server.call_tool("create_entities", {"entities": [{"name": "A", "entityType": "Concept"}]})
+        )
+        await asyncio.sleep(0.01)  # Only returns before the release if the blocked write is off the loop
+        assert not write.done()
+        release.set()
+        await write
+        holder.join(5)
+        assert graph.find_entity("A") is not None
+
+
+class TestMultiProcessWatch:
+    """watch=True keeps graphs sharing one memory file coherent."""
+
+    @staticmethod
+    def _graph(memory_file: str, interval_ms: int = 60_000) -> Any:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, wal=True, watch=True, watch_interval_ms=interval_ms)
+        graph.load()
+        return graph
+
+    def test_requires_wal(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        with pytest.raises(ValueError, match="requires wal=True"):
+            KnowledgeGraph(watch=True)
+        with pytest.raises(ValueError, match="watch_interval_ms only applies with watch=True"):
+            KnowledgeGraph(wal=True, watch_interval_ms=8)
+
+    def test_refresh_tails_appended_ops_without_reloading(self, memory_file: str) -> None:
+        a, b = self._graph(memory_file), self._graph(memory_file)
+        try:
+            assert a.refresh() is False
+            b.upsert_entity("FromB", "Concept", ["hello"])
+            b.save()
+
+            def no_reload() -> None:
+                raise AssertionError("expected an incremental tail, not a full load")
+
+            a.load = no_reload
+            assert a.refresh() is True
+            assert a.find_entity("FromB")["observations"] == ["hello"]
+            assert a._wal_bytes == os.path.getsize(a.wal_path)
+            assert a.refresh() is False
+        finally:
+            a.close()
+            b.close()
+
+    def test_writer_catches_up_before_appending(self, memory_file: str) -> None:
+        a, b = self._graph(memory_file), self._graph(memory_file)
+        try:
+            a.upsert_entity("FromA")
+            a.save()
+            b.upsert_entity("FromB")
+            b.save()  # Applies A's op first, then appends its own
+            assert b.find_entity("FromA") is not None
+            a.refresh()
+            assert {e["name"] for e in a.entities} == {"FromA", "FromB"}
+        finally:
+            a.close()
+            b.close()
+
+    def test_compaction_elsewhere_reloads_and_keeps_unflushed_ops(self, memory_file: str) -> None:
+        a, b = self._graph(memory_file), self._graph(memory_file)
+        try:
+            b.upsert_entity("Compacted", "Concept", ["x"])
+            b.save()
+            a.upsert_entity("Unflushed")  # Not saved yet
+            b.compact()
+
+            assert a.refresh() is True
+            assert a.find_entity("Compacted") is not None
+            assert a.find_entity("Unflushed") is not None
+            a.save()
+            b.refresh()
+            assert b.find_entity("Unflushed") is not None
+        finally:
+            a.close()
+            b.close()
+
+    def test_poller_picks_up_changes(self, memory_file: str) -> None:
+        import time
+
+        a, b = self._graph(memory_file, interval_ms=20), self._graph(memory_file)
+        try:
+            b.upsert_entity("Polled")
+            b.save()
+            deadline = time.monotonic() + 5
+            while a.find_entity("Polled") is None and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert a.find_entity("Polled") is not None
+        finally:
+            a.close()
+            b.close()
+
+    def test_other_process_appends(self, memory_file: str) -> None:
+        import subprocess
+        import sys
+
+        a = self._graph(memory_file)
+        script = (
+            "import sys\n"
+            "from jade.mcp.memory_server import KnowledgeGraph\n"
+            "g = KnowledgeGraph(file_path=sys.argv[1], wal=True, watch=True)\n"
+            "g.load()\n"
+            "g.upsert_entity('FromChild', 'Concept', ['spawned'])\n"
+            "g.close()\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        try:
+            subprocess.run([sys.executable, "-c", script, memory_file], check=True, env=env, timeout=60)
+            assert a.refresh() is True
+            assert a.find_entity("FromChild")["observations"] == ["spawned"]
+        finally:
+            a.close()
+
+
+class TestShardedStorage:
+    """shards=N partitions the graph across files saved and loaded independently."""
+
+    @staticmethod
+    def _graph(memory_file: str, **kwargs: Any) -> Any:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=memory_file, shards=4, **kwargs)
+        graph.load()
+        return graph
+
+    @staticmethod
+    def _populate(graph: Any) -> None:
+        for i in range(20):
+            graph.upsert_entity(f"E{i}", "Concept", [f"obs {i}"])
+        for i in range(19):
+            graph.create_relation(f"E{i}", f"E{i + 1}", "next")
+        graph.save()
+
+    @staticmethod
+    def _inodes(graph: Any) -> list[int]:
+        from jade.mcp.shards import shard_path
+
+        return [os.stat(shard_path(graph.shard_dir, i)).st_ino for i in range(graph.shards)]
+
+    def test_round_trip(self, memory_file: str) -> None:
+        graph = self._graph(memory_file)
+        self._populate(graph)
+        assert sorted(os.listdir(graph.shard_dir))[0] == "manifest.json"
+
+        reloaded = self._graph(memory_file)
+        assert {e["name"] for e in reloaded.entities} == {f"E{i}" for i in range(20)}
+        assert reloaded.find_entity("E7")["observations"] == ["obs 7"]
+        assert len(reloaded.relations) == 19
+        assert len(reloaded.relations_of(["E7"])) == 2
+
+    def test_records_live_in_their_hash_shard(self, memory_file: str) -> None:
+        from jade.mcp.shards import read_records, shard_of, shard_path
+
+        graph = self._graph(memory_file)
+        self._populate(graph)
+        for i in range(graph.shards):
+            entities, relations = read_records(shard_path(graph.shard_dir, i))
+            assert all(shard_of(e["name"], 4) == i for e in entities)
+            assert all(shard_of(r["from"], 4) == i for r in relations)
+
+    def test_save_rewrites_only_dirty_shards(self, memory_file: str) -> None:
+        from jade.mcp.shards import shard_of
+
+        graph = self._graph(memory_file)
+        self._populate(graph)
+        before = self._inodes(graph)
+        graph.add_observations("E3", ["more"])
+        graph.save()
+        after = self._inodes(graph)
+        changed = [i for i in range(4) if before[i] != after[i]]
+        assert changed == [shard_of("E3", 4)]
+
+        reloaded = self._graph(memory_file)
+        assert reloaded.find_entity("E3")["observations"] == ["obs 3", "more"]
+
+    def test_delete_entity_rewrites_shards_of_its_relations(self, memory_file: str) -> None:
+        from jade.mcp.shards import shard_of
+
+        graph = self._graph(memory_file)
+        self._populate(graph)
+        before = self._inodes(graph)
+        graph.delete_entities(["E5"])
+        graph.save()
+        after = self._inodes(graph)
+        changed = {i for i in range(4) if before[i] != after[i]}
+        assert changed == {shard_of("E5", 4), shard_of("E4", 4)}
+
+        reloaded = self._graph(memory_file)
+        assert reloaded.find_entity("E5") is None
+        assert len(reloaded.relations) == 17
+
+    def test_migrates_single_file_graph(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        plain = KnowledgeGraph(file_path=memory_file)
+        self._populate(plain)
+
+        sharded = self._graph(memory_file)
+        assert len(sharded.entities) == 20
+        sharded.save()
+        assert len(os.listdir(sharded.shard_dir)) == 5
+        assert len(self._graph(memory_file).relations) == 19
+
+    def test_reshards_on_count_change(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        self._populate(self._graph(memory_file))
+        resharded = KnowledgeGraph(file_path=memory_file, shards=2)
+        resharded.load()
+        resharded.save()
+        assert sorted(os.listdir(resharded.shard_dir)) == ["manifest.json", "shard-0000.jsonl", "shard-0001.jsonl"]
+
+        reloaded = KnowledgeGraph(file_path=memory_file, shards=2)
+        reloaded.load()
+        assert len(reloaded.entities) == 20
+        assert len(reloaded.relations) == 19
+
+    def test_unsharded_open_of_sharded_graph_is_refused(self, memory_file: str) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph, load_graph
+
+        self._populate(self._graph(memory_file))
+        for kwargs in ({}, {"wal": True}, {"lazy": True}):
+            with pytest.raises(ValueError, match="open it with shards=4"):
+                KnowledgeGraph(file_path=memory_file, **kwargs).load()
+        with pytest.raises(ValueError, match="shards=4"):
+            load_graph(memory_file)
+
+        reopened = load_graph(memory_file, shards=4)
+        assert len(reopened.entities) == 20
+        assert len(reopened.relations) == 19
+
+    def test_parallel_load(self, memory_file: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        from jade.mcp import shards
+
+        self._populate(self._graph(memory_file))
+        monkeypatch.setattr(shards, "PARALLEL_MIN_BYTES", 0)
+        reloaded = self._graph(memory_file, load_workers=2)
+        assert len(reloaded.entities) == 20
+        assert len(reloaded.relations) == 19
+
+    def test_wal_compaction_writes_shards(self, memory_file: str) -> None:
+        graph = self._graph(memory_file, wal=True)
+        self._populate(graph)
+        assert not os.path.exists(graph.shard_dir)
+        graph.compact()
+        graph.upsert_entity("Late", "Concept", ["after compaction"])
+        graph.save()
+
+        reloaded = self._graph(memory_file, wal=True)
+        assert len(reloaded.entities) == 21
+        assert reloaded.find_entity("Late")["observations"] == ["after compaction"]
+
+    def test_rejects_incompatible_options(self) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        with pytest.raises(ValueError, match="shards cannot be combined"):
+            KnowledgeGraph(shards=4, lazy=True)
+        with pytest.raises(ValueError, match="non-negative"):
+            KnowledgeGraph(shards=-1)
+        with pytest.raises(ValueError, match="load_workers only applies with shards"):
+            KnowledgeGraph(load_workers=2)
@@ -0,0 +1,56 @@
+"""Tests for read-tool pagination helpers."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from jade.mcp.paging import Projection, decode_cursor, encode_cursor, encode_page, iter_page_json, project
+
+ENTITY = {"name": "Redis", "entityType": "Technology", "observations": ["a", "b", "c"]}
+
+
+class TestCursor:
+    def test_round_trip(self) -> None:
+        assert decode_cursor(encode_cursor(42)) == 42
+
+    def test_missing_cursor_starts_at_zero(self) -> None:
+        assert decode_cursor(None) == 0
+        assert decode_cursor("") == 0
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor!", "e30=", encode_cursor(-1)])
+    def test_invalid_cursor_rejected(self, cursor: str) -> None:
+        with pytest.raises(ValueError, match="cursor"):
+            decode_cursor(cursor)
+
+
+class TestProject:
+    def test_full_keeps_entity(self) -> None:
+        assert project(ENTITY, Projection.FULL) is ENTITY
+
+    def test_summary_and_names(self) -> None:
+        assert project(ENTITY, Projection.SUMMARY) == {"name": "Redis", "entityType": "Technology"}
+        assert project(ENTITY, Projection.NAMES) == {"name": "Redis"}
+
+    def test_truncates_observations_and_reports_total(self) -> None:
+        trimmed = project(ENTITY, Projection.FULL, max_observations=2)
+        assert trimmed["observations"] == ["a", "b"]
+        assert trimmed["observationCount"] == 3
+        assert ENTITY["observations"] == ["a", "b", "c"]
+
+    def test_no_truncation_when_within_limit(self) -> None:
+        assert "observationCount" not in project(ENTITY, Projection.FULL, max_observations=3)
+
+
+class TestEncodePage:
+    def test_streams_one_chunk_per_record(self) -> None:
+        relation = {"from": "Redis", "to": "Neon", "relationType": "complements"}
+        chunks = list(iter_page_json([ENTITY, ENTITY], [relation]))
+        assert len(chunks) == 4 + 3  # framing + records
+        assert json.loads("".join(chunks)) == {"entities": [ENTITY, ENTITY], "relations": [relation]}
+
+    def test_next_cursor_only_when_more_remains(self) -> None:
+        assert "nextCursor" not in json.loads(encode_page([], []))
+        page = json.loads(encode_page([ENTITY], [], next_offset=1))
+        assert decode_cursor(page["nextCursor"]) == 1
@@ -0,0 +1,122 @@
+"""Tests for ranked, filtered recall and observation write times."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from jade.mcp.memory_server import KnowledgeGraph
+from jade.mcp.recall import fuse, parse_time, rank
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Write times come from the list's last value; append to move time forward."""
+    times = [1000.0]
+    monkeypatch.setattr("jade.mcp.memory_server.now", lambda: times[-1])
+    return times
+
+
+def _populate(graph: KnowledgeGraph, clock: list[float]) -> None:
+    graph.upsert_entity("redis", "Technology", ["Redis is the hot memory store"])
+    clock.append(2000.0)
+    graph.upsert_entity("cache-notes", "Concept", ["Notes mention redis once"])
+    clock.append(3000.0)
+    graph.add_observations("redis", ["redis sessions expire"])
+
+
+class TestParseTime:
+    """ISO 8601 arguments become epoch seconds."""
+
+    def test_dates_and_datetimes(self) -> None:
+        assert parse_time(None, "since") is None
+        assert parse_time("1970-01-02", "since") == 86400.0
+        assert parse_time("1970-01-01T01:00:00+01:00", "since") == 0.0
+        assert parse_time("1970-01-01", "until", end_of_day=True) == 86400.0 - 0.001
+        assert parse_time("1970-01-01T00:00:10", "until", end_of_day=True) == 10.0
+
+    def test_rejects_garbage(self) -> None:
+        with pytest.raises(ValueError, match="since must be an ISO 8601"):
+            parse_time("last tuesday", "since")
+
+
+class TestRank:
+    """Reciprocal rank fusion of relevance and recency."""
+
+    def test_fuses_relevance_and_recency(self) -> None:
+        # "b" is second by relevance but the newest; "a" is the oldest
+        assert rank(["a", "b", "c", "d"], {"a": 1.0, "b": 9.0, "c": 5.0, "d": 7.0}, 2) == ["b", "a"]
+        assert rank(["a", "b", "c"], {"c": 5.0}, 2) == ["a", "c"]
+        assert rank(["a", "b"], {}, None) == ["a", "b"]  # Ties keep relevance order
+
+    def test_fuse_rewards_agreement(self) -> None:
+        assert fuse([["a", "b", "c"], ["b"]], None) == ["b", "a", "c"]
+        assert fuse([["a"], ["b"]], 1) == ["a"]  # Ties keep first-seen order
+
+
+class TestGraphRecall:
+    """KnowledgeGraph.recall filters by type and write time and ranks the rest."""
+
+    def test_filters_and_ranking(self, tmp_path, clock: list[float]) -> None:
+        graph = KnowledgeGraph(file_path=str(tmp_path / "memory.jsonl"))
+        _populate(graph, clock)
+        assert [e["name"] for e in graph.recall("redis")] == ["redis", "cache-notes"]
+        assert [e["name"] for e in graph.recall("redis", entity_types=["Concept"])] == ["cache-notes"]
+        assert [e["name"] for e in graph.recall("redis", since=1500.0, until=2500.0)] == ["cache-notes"]
+        assert [e["name"] for e in graph.recall("", since=2500.0)] == ["redis"]
+        assert graph.recall("redis", limit=1)[0]["name"] == "redis"
+        with pytest.raises(ValueError, match="since must not be after until"):
+            graph.recall("redis", since=2.0, until=1.0)
+
+    def test_time_index_follows_mutations(self, tmp_path, clock: list[float]) -> None:
+        graph = KnowledgeGraph(file_path=str(tmp_path / "memory.jsonl"))
+        _populate(graph, clock)
+        assert graph.recall("", since=1500.0) != []  # Builds the index
+        clock.append(4000.0)
+        graph.upsert_entity("fresh", "Concept", ["new"])
+        graph.delete_observations("redis", ["redis sessions expire"])
+        graph.delete_entities(["cache-notes"])
+        assert [e["name"] for e in graph.recall("", since=1500.0)] == ["fresh"]
+        assert [e["name"] for e in graph.recall("", until=1500.0)] == ["redis"]
+
+    def test_write_times_survive_reload(self, tmp_path, clock: list[float]) -> None:
+        path = str(tmp_path / "memory.jsonl")
+        graph = KnowledgeGraph(file_path=path)
+        _populate(graph, clock)
+        graph.save()
+        with open(path) as f:
+            first = json.loads(f.readline())
+        assert first["observedAt"] == [1000.0, 3000.0]
+
+        for options in ({}, {"binary_snapshot": True}, {"lazy": True}):
+            if options:
+                writer = KnowledgeGraph(file_path=path, binary_snapshot=True)
+                writer.load()
+                writer.compact()  # Rewrites the JSONL and the binary snapshot
+            reloaded = KnowledgeGraph(file_path=path, **options)
+            reloaded.load()
+            assert reloaded.entities == graph.entities
+            assert [e["name"] for e in reloaded.recall("", since=2500.0)] == ["redis"], options
+
+    def test_wal_replay_keeps_original_times(self, tmp_path, clock: list[float]) -> None:
+        path = str(tmp_path / "memory.jsonl")
+        graph = KnowledgeGraph(file_path=path, wal=True)
+        _populate(graph, clock)
+        graph.save()
+        clock.append(9000.0)
+        reloaded = KnowledgeGraph(file_path=path, wal=True)
+        reloaded.load()
+        assert [e["name"] for e in reloaded.recall("", since=1500.0, until=2500.0)] == ["cache-notes"]
+
+    def test_entities_without_times_rank_last_and_never_match_a_range(self, tmp_path, clock: list[float]) -> None:
+        path = tmp_path / "memory.jsonl"
+        path.write_text(
+            json.dumps({"type": "entity", "name": "legacy redis", "entityType": "Concept", "observations": ["x"]})
+            + "\n"
+        )
+        graph = KnowledgeGraph(file_path=str(path))
+        graph.load()
+        graph.upsert_entity("redis-2", "Concept", ["later"])
+        assert {e["name"] for e in graph.recall("redis")} == {"redis-2", "legacy redis"}
+        assert [e["name"] for e in graph.recall("redis", until=5000.0)] == ["redis-2"]
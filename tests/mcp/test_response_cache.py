@@ -0,0 +1,115 @@
+"""Tests for the generation-keyed response cache."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from jade.mcp.response_cache import ResponseCache, freeze
+
+
+class TestResponseCache:
+    """Encoded responses are reused until the generation moves on."""
+
+    def test_hit_until_generation_changes(self) -> None:
+        cache = ResponseCache()
+        calls: list[int] = []
+
+        def encode() -> str:
+            calls.append(1)
+            return f"response-{len(calls)}"
+
+        assert cache.get_or_encode(1, "k", encode) == "response-1"
+        assert cache.get_or_encode(1, "k", encode) == "response-1"
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert cache.get_or_encode(2, "k", encode) == "response-2"
+        assert cache.get_or_encode(1, "k", encode) == "response-3"  # Stale reader: encoded, not cached
+        assert cache.get_or_encode(2, "k", encode) == "response-2"
+
+    def test_bounded_by_entries_and_size(self) -> None:
+        cache = ResponseCache(max_entries=2, max_chars=10)
+        for key in ("a", "b", "c"):
+            cache.get_or_encode(1, key, lambda: "xxx")
+        assert len(cache) == 2
+        cache.get_or_encode(1, "d", lambda: "y" * 6)  # 3 + 6 fits, the older entry goes
+        assert len(cache) == 2
+        cache.get_or_encode(1, "big", lambda: "z" * 11)
+        assert len(cache) == 2 and cache.get_or_encode(1, "big", lambda: "fresh") == "fresh"
+
+    def test_disabled_and_invalid(self) -> None:
+        cache = ResponseCache(max_entries=0)
+        assert cache.get_or_encode(1, "k", lambda: "a") == "a"
+        assert cache.get_or_encode(1, "k", lambda: "b") == "b"
+        with pytest.raises(ValueError, match="must be non-negative"):
+            ResponseCache(max_entries=-1)
+
+    def test_freeze_normalizes_arguments(self) -> None:
+        assert freeze(["a", {"b": [1]}]) == ("a", (("b", (1,)),))
+        assert freeze({"y", "x"}) == ("x", "y")
+
+
+class TestGraphGeneration:
+    """Every mutation, load and rollback bumps KnowledgeGraph.generation."""
+
+    def test_generation_bumps(self, tmp_path) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        graph = KnowledgeGraph(file_path=str(tmp_path / "memory.jsonl"))
+        start = graph.generation
+        graph.upsert_entity("A")
+        after_upsert = graph.generation
+        assert after_upsert > start
+        graph.find_entity("A")
+        graph.search("A")
+        assert graph.generation == after_upsert
+        with pytest.raises(RuntimeError), graph.transaction():
+            graph.delete_entities(["A"])
+            raise RuntimeError
+        assert graph.generation > after_upsert + 1
+
+
+class TestCachedReadTools:
+    """Repeat reads of an unchanged graph skip the scan; mutations invalidate."""
+
+    @pytest.mark.asyncio
+    async def test_read_graph_cached_until_mutation(self, tmp_path) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph, create_memory_server
+
+        graph = KnowledgeGraph(file_path=str(tmp_path / "memory.jsonl"))
+        scans: list[int] = []
+        read_page = graph.read_page
+        graph.read_page = lambda *args: scans.append(1) or read_page(*args)  # type: ignore[method-assign]
+        server = create_memory_server(graph=graph)
+        await server.call_tool(
+            "create_entities", {"entities": [{"name": "A", "entityType": "Concept", "observations": []}]}
+        )
+
+        first = await server.call_tool("read_graph", {"entityTypes": ["Concept"]})
+        second = await server.call_tool("read_graph", {"entityTypes": ["Concept"]})
+        assert first[1] == second[1] and len(scans) == 1
+        await server.call_tool("read_graph", {"projection": "names"})
+        assert len(scans) == 2
+
+        await server.call_tool("add_observations", {"observations": [{"entityName": "A", "contents": ["new"]}]})
+        third = await server.call_tool("read_graph", {"entityTypes": ["Concept"]})
+        assert json.loads(third[1]["result"])["entities"][0]["observations"] == ["new"]
+        assert len(scans) == 3
+
+    @pytest.mark.asyncio
+    async def test_recall_context_cached_on_sqlite(self, tmp_path) -> None:
+        from jade.mcp.jade_server import create_jade_server
+        from jade.mcp.sqlite_store import SqliteKnowledgeGraph
+
+        graph = SqliteKnowledgeGraph(str(tmp_path / "memory.db"))
+        graph.load()
+        try:
+            server = create_jade_server(graph=graph)
+            graph.upsert_entity("Redis", "Technology", ["cache"])
+            first = await server.call_tool("recall_context", {"query": "cache"})
+            graph.upsert_entity("Memcached", "Technology", ["cache too"])
+            second = await server.call_tool("recall_context", {"query": "cache"})
+            assert len(json.loads(first[1]["result"])["entities"]) == 1
+            assert len(json.loads(second[1]["result"])["entities"]) == 2
+        finally:
+            graph.close()
@@ -0,0 +1,91 @@
+"""Tests for the reader-writer lock guarding KnowledgeGraph."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from jade.mcp.rwlock import ReadWriteLock
+
+
+def _start(target: object) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestReadWriteLock:
+    def test_readers_share_the_lock(self) -> None:
+        lock = ReadWriteLock()
+        inside = threading.Barrier(3, timeout=2)
+
+        def reader() -> None:
+            with lock.read():
+                inside.wait()  # Only passes if all three hold the read side together
+
+        threads = [_start(reader) for _ in range(3)]
+        for thread in threads:
+            thread.join(2)
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self) -> None:
+        lock = ReadWriteLock()
+        events: list[str] = []
+
+        def reader() -> None:
+            with lock.read():
+                events.append("read")
+
+        with lock.write():
+            thread = _start(reader)
+            time.sleep(0.05)
+            assert events == []
+        thread.join(2)
+        assert events == ["read"]
+
+    def test_waiting_writer_blocks_new_readers(self) -> None:
+        lock = ReadWriteLock()
+        order: list[str] = []
+        held = lock.read()
+        held.__enter__()
+
+        def writer() -> None:
+            with lock.write():
+                order.append("write")
+
+        def late_reader() -> None:
+            with lock.read():
+                order.append("read")
+
+        w = _start(writer)
+        time.sleep(0.05)
+        r = _start(late_reader)
+        time.sleep(0.05)
+        assert order == []
+        held.__exit__(None, None, None)
+        w.join(2)
+        r.join(2)
+        assert order == ["write", "read"]
+
+    def test_reentrant_and_writer_may_read(self) -> None:
+        lock = ReadWriteLock()
+        with lock.write(), lock.write(), lock.read():
+            pass
+        with lock.read(), lock.read():
+            pass
+        # Fully released: another thread can write
+        acquired: list[bool] = []
+
+        def writer() -> None:
+            with lock.write():
+                acquired.append(True)
+
+        _start(writer).join(2)
+        assert acquired == [True]
+
+    def test_upgrade_raises_instead_of_deadlocking(self) -> None:
+        lock = ReadWriteLock()
+        with lock.read(), pytest.raises(RuntimeError, match="write lock"), lock.write():
+            pass
@@ -0,0 +1,84 @@
+"""Tests for the inverted full-text index behind search_nodes and recall_context."""
+
+from __future__ import annotations
+
+from jade.mcp.search_index import SearchIndex, tokenize
+
+
+class TestTokenize:
+    def test_lowercases_and_splits_on_punctuation(self) -> None:
+        assert tokenize("Use Redis, for hot-memory!") == ["use", "redis", "for", "hot", "memory"]
+
+
+class TestSubstringSemantics:
+    """Trigram candidates plus verification keep substring matching intact."""
+
+    def test_matches_substring_inside_a_word(self) -> None:
+        index = SearchIndex()
+        index.add("use-redis", "Decision", ["Redis provides fast session state"])
+        index.add("use-postgres", "Decision", ["Neon for cold storage"])
+        assert index.search("edi") == ["use-redis"]
+
+    def test_matches_name_and_type_case_insensitively(self) -> None:
+        index = SearchIndex()
+        index.add("Alex", "Person", [])
+        assert index.search("ALEX") == ["Alex"]
+        assert index.search("person") == ["Alex"]
+
+    def test_trigrams_across_fields_do_not_match(self) -> None:
+        index = SearchIndex()
+        index.add("abc", "Concept", ["def"])
+        assert index.search("abcdef") == []
+
+    def test_short_query_falls_back_to_scan(self) -> None:
+        index = SearchIndex()
+        index.add("A1", "Concept", [])
+        index.add("B2", "Concept", [])
+        assert index.search("a") == ["A1"]
+        assert index.search("") == ["A1", "B2"]
+
+
+class TestRanking:
+    def test_name_hit_outranks_passing_mention(self) -> None:
+        index = SearchIndex()
+        index.add("notes", "Concept", ["we might try redis later"])
+        index.add("redis", "Tool", ["in-memory store"])
+        assert index.search("redis") == ["redis", "notes"]
+
+    def test_rarer_term_scores_higher(self) -> None:
+        index = SearchIndex()
+        index.add("a", "Concept", ["cache layer"])
+        index.add("b", "Concept", ["cache layer vector"])
+        index.add("c", "Concept", ["cache"])
+        results = index.search("layer vector")
+        assert results == ["b"]
+        assert index.search("cache")[0] == "c"  # Shortest document wins ties on tf
+
+    def test_limit_truncates(self) -> None:
+        index = SearchIndex()
+        for i in range(5):
+            index.add(f"e{i}", "Concept", ["shared"])
+        assert index.search("shared", limit=2) == ["e0", "e1"]
+
+
+class TestIncrementalUpdates:
+    def test_added_observation_becomes_searchable(self) -> None:
+        index = SearchIndex()
+        index.add("e", "Concept", [])
+        index.add_observations("e", ["learned about trigrams"])
+        assert index.search("trigram") == ["e"]
+
+    def test_removed_observation_stops_matching(self) -> None:
+        index = SearchIndex()
+        index.add("e", "Concept", ["temporary", "keeper"])
+        index.remove_observations("e", ["temporary"])
+        assert index.search("temporary") == []
+        assert index.search("keeper") == ["e"]
+
+    def test_removed_entity_leaves_no_postings(self) -> None:
+        index = SearchIndex()
+        index.add("gone", "Concept", ["vanishing text"])
+        index.remove("gone")
+        assert len(index) == 0
+        assert index._tokens == {}
+        assert index._trigrams == {}
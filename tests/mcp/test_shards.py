@@ -0,0 +1,122 @@
+"""Tests for the hash-sharded JSONL layout."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from jade.mcp.shards import (
+    pool_size,
+    read_manifest,
+    read_records,
+    read_shards,
+    shard_of,
+    shard_path,
+    write_manifest,
+    write_shard,
+)
+
+
+class TestShardOf:
+    """Names map to shards the same way in every process."""
+
+    def test_crc32_of_utf8_name(self) -> None:
+        import zlib
+
+        assert shard_of("Alex", 8) == zlib.crc32(b"Alex") % 8
+        assert shard_of("Zoë", 5) == zlib.crc32("Zoë".encode()) % 5
+
+    def test_in_range_and_spread(self) -> None:
+        counts = [0] * 4
+        for i in range(1000):
+            counts[shard_of(f"entity-{i}", 4)] += 1
+        assert all(150 < count < 350 for count in counts)
+
+    def test_same_in_subprocess(self) -> None:
+        import subprocess
+        import sys
+
+        script = "import sys\nfrom jade.mcp.shards import shard_of\nprint(shard_of('Alex', 97))\n"
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        result = subprocess.run([sys.executable, "-c", script], check=True, env=env, capture_output=True, text=True)
+        assert int(result.stdout) == shard_of("Alex", 97)
+
+
+class TestManifest:
+    """The manifest records the shard count and prunes shards beyond it."""
+
+    def test_round_trip(self, tmp_path) -> None:
+        write_manifest(str(tmp_path), 4)
+        assert read_manifest(str(tmp_path)) == 4
+
+    def test_missing_or_invalid(self, tmp_path) -> None:
+        assert read_manifest(str(tmp_path)) is None
+        (tmp_path / "manifest.json").write_text('{"shards": 0}')
+        assert read_manifest(str(tmp_path)) is None
+        (tmp_path / "manifest.json").write_text("not json")
+        assert read_manifest(str(tmp_path)) is None
+
+    def test_prunes_extra_shards(self, tmp_path) -> None:
+        for i in range(4):
+            write_shard(shard_path(str(tmp_path), i), [], [])
+        write_manifest(str(tmp_path), 2)
+        assert sorted(os.listdir(tmp_path)) == ["manifest.json", "shard-0000.jsonl", "shard-0001.jsonl"]
+
+
+class TestReadShards:
+    """Shard files parse to the same records inline or in worker processes."""
+
+    @pytest.fixture
+    def paths(self, tmp_path) -> list[str]:
+        paths = []
+        for i in range(3):
+            path = shard_path(str(tmp_path), i)
+            write_shard(
+                path,
+                [{"name": f"E{i}", "entityType": "Concept", "observations": [f"obs {i}"]}],
+                [{"from": f"E{i}", "to": "E0", "relationType": "related_to"}],
+            )
+            paths.append(path)
+        with open(paths[1], "ab") as f:
+            f.write(b'{"type": "entity", "na\n')  # Corrupt line is skipped
+        return paths
+
+    def test_read_records(self, paths: list[str]) -> None:
+        entities, relations = read_records(paths[1])
+        assert entities == [{"name": "E1", "entityType": "Concept", "observations": ["obs 1"]}]
+        assert relations == [{"from": "E1", "to": "E0", "relationType": "related_to"}]
+
+    def test_missing_file_has_no_records(self, tmp_path) -> None:
+        assert read_records(str(tmp_path / "absent.jsonl")) == ([], [])
+
+    def test_parallel_matches_inline(self, paths: list[str]) -> None:
+        for path, columns in zip(paths, read_shards(paths, workers=2), strict=True):
+            entities, relations = read_records(path)
+            names = columns.names
+            assert names[: len(columns.entity_types)] == [e["name"] for e in entities]
+            assert columns.observations == [o for e in entities for o in e["observations"]]
+            parsed = zip(columns.rel_from, columns.rel_to, columns.rel_types, strict=True)
+            assert [(names[f], names[t], columns.types[k]) for f, t, k in parsed] == [
+                (r["from"], r["to"], r["relationType"]) for r in relations
+            ]
+
+    def test_workers_merge_repeated_names(self, tmp_path) -> None:
+        path = shard_path(str(tmp_path), 0)
+        write_shard(
+            path,
+            [
+                {"name": "E0", "entityType": "Concept", "observations": ["first"]},
+                {"name": "E0", "entityType": "Concept", "observations": ["first", "second"]},
+            ],
+            [],
+        )
+        (columns,) = read_shards([path], workers=2)
+        assert columns.names == ["E0"]
+        assert columns.observations == ["first", "second"]
+
+    def test_pool_size(self, paths: list[str]) -> None:
+        assert pool_size(paths, workers=1, min_bytes=0) == 1
+        assert pool_size(paths, workers=2, min_bytes=0) == 2
+        assert pool_size(paths, workers=8, min_bytes=0) == 3  # At most one per file
+        assert pool_size(paths, workers=2) == 1  # Far below PARALLEL_MIN_BYTES
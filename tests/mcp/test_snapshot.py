@@ -0,0 +1,253 @@
+"""Tests for the binary knowledge graph snapshot format."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+
+import pytest
+
+from jade.mcp.memory_server import KnowledgeGraph, create_memory_server, load_graph
+from jade.mcp.snapshot import (
+    SnapshotError,
+    file_identity,
+    jsonl_to_snapshot,
+    main,
+    read_snapshot,
+    snapshot_path,
+    snapshot_to_jsonl,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def memory_file() -> str:
+    """Provide a clean temp JSONL path plus its sidecar files."""
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    os.unlink(path)
+    yield path
+    for leftover in (path, f"{path}.wal", f"{path}.snap", f"{path}.out.jsonl"):
+        if os.path.exists(leftover):
+            os.unlink(leftover)
+
+
+def _sample_graph(path: str) -> KnowledgeGraph:
+    graph = KnowledgeGraph(file_path=path)
+    graph.upsert_entity("Redis", "Technology", ["In-memory store", "Used for hot memory"])
+    graph.upsert_entity("Neon", "Technology", ["Serverless Postgres"])
+    graph.upsert_entity("Empty", "Concept")
+    graph.create_relation("Redis", "Neon", "complements")
+    graph.create_relation("Neon", "Ghost", "mentions")  # endpoint with no entity
+    return graph
+
+
+class TestRoundTrip:
+    """write_snapshot → read_snapshot preserves the graph exactly."""
+
+    def test_entities_and_relations_survive(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        snap = snapshot_path(memory_file)
+        write_snapshot(snap, graph.entities, graph.relations)
+
+        snapshot = read_snapshot(snap)
+        assert snapshot.entities == graph.entities
+        assert snapshot.relations == graph.relations
+
+    def test_empty_graph(self, memory_file: str) -> None:
+        snap = snapshot_path(memory_file)
+        write_snapshot(snap, [], [])
+        snapshot = read_snapshot(snap)
+        assert snapshot.entities == []
+        assert snapshot.relations == []
+
+    def test_nul_and_non_ascii_strings_fall_back_safely(self, memory_file: str) -> None:
+        graph = KnowledgeGraph(file_path=memory_file)
+        graph.upsert_entity("naïve\x00name", "Concept", ["emoji 🚀", "nul\x00inside", ""])
+        snap = snapshot_path(memory_file)
+        write_snapshot(snap, graph.entities, graph.relations)
+        assert read_snapshot(snap).entities == graph.entities
+
+    def test_rejects_non_snapshot_files(self, memory_file: str) -> None:
+        with open(memory_file, "w") as f:
+            f.write('{"type": "entity"}\n')
+        with pytest.raises(SnapshotError):
+            read_snapshot(memory_file)
+
+    def test_rejects_truncated_snapshot(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        snap = snapshot_path(memory_file)
+        write_snapshot(snap, graph.entities, graph.relations)
+        with open(snap, "rb") as f:
+            data = f.read()
+        with open(snap, "wb") as f:
+            f.write(data[:-3])
+        with pytest.raises(SnapshotError):
+            read_snapshot(snap)
+
+
+class TestGraphLoad:
+    """KnowledgeGraph.load() prefers a snapshot only while it matches the JSONL."""
+
+    def test_binary_snapshot_is_refreshed_on_save(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.binary_snapshot = True
+        graph.save()
+        assert os.path.exists(graph.snapshot_path)
+        assert read_snapshot(graph.snapshot_path).source == file_identity(memory_file)
+
+    def test_load_from_snapshot_matches_jsonl_load(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.binary_snapshot = True
+        graph.save()
+
+        from_binary = KnowledgeGraph(file_path=memory_file)
+        from_binary.load()
+        os.unlink(graph.snapshot_path)
+        from_jsonl = KnowledgeGraph(file_path=memory_file)
+        from_jsonl.load()
+
+        assert from_binary.entities == from_jsonl.entities
+        assert from_binary.relations == from_jsonl.relations
+        assert from_binary.relations_of({"Neon"}) == from_jsonl.relations_of({"Neon"})
+        assert [e["name"] for e in from_binary.search("postgres")] == ["Neon"]
+
+    def test_stale_snapshot_is_ignored(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.binary_snapshot = True
+        graph.save()
+        # Rewrite the JSONL without refreshing the snapshot
+        graph.binary_snapshot = False
+        graph.upsert_entity("Fresh", "Concept")
+        graph.save()
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert reloaded.find_entity("Fresh") is not None
+
+    def test_corrupt_snapshot_falls_back_to_jsonl(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.save()
+        with open(graph.snapshot_path, "wb") as f:
+            f.write(b"garbage")
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert len(reloaded.entities) == 3
+
+    def test_snapshot_without_jsonl_is_stale(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.binary_snapshot = True
+        graph.save()
+        os.unlink(memory_file)
+
+        for lazy in (False, True):
+            reloaded = KnowledgeGraph(file_path=memory_file, lazy=lazy)
+            reloaded.load()
+            assert len(reloaded.entities) == 0
+
+    def test_extra_entity_keys_survive_snapshot_load(self, memory_file: str) -> None:
+        import json
+
+        with open(memory_file, "w") as f:
+            record = {"type": "entity", "name": "Redis", "entityType": "Technology", "observations": ["cache"]}
+            f.write(json.dumps({**record, "createdAt": "2024-01-01", "tags": ["hot"]}) + "\n")
+            f.write(json.dumps({**record, "name": "Neon"}) + "\n")
+        graph = KnowledgeGraph(file_path=memory_file, binary_snapshot=True)
+        graph.load()
+        graph.save()
+        assert read_snapshot(graph.snapshot_path).entities[0]["createdAt"] == "2024-01-01"
+
+        for lazy in (False, True):
+            # Both loads read the snapshot, since each save refreshes it along with the JSONL
+            reloaded = KnowledgeGraph(file_path=memory_file, lazy=lazy, binary_snapshot=True)
+            reloaded.load()
+            redis = reloaded.find_entity("Redis")
+            assert redis is not None and redis["createdAt"] == "2024-01-01" and redis["tags"] == ["hot"]
+            assert "createdAt" not in reloaded.find_entity("Neon")
+            reloaded.save()
+            with open(memory_file) as f:
+                assert json.loads(f.readline())["createdAt"] == "2024-01-01"
+
+    def test_wal_replays_on_top_of_binary_snapshot(self, memory_file: str) -> None:
+        graph = KnowledgeGraph(file_path=memory_file, wal=True, binary_snapshot=True)
+        graph.upsert_entity("Redis", "Technology", ["In-memory store"])
+        graph.compact()
+        graph.add_observations("Redis", ["Logged after the snapshot"])
+        graph.create_relation("Redis", "Neon", "complements")
+        graph.close()
+
+        reloaded = KnowledgeGraph(file_path=memory_file, wal=True)
+        reloaded.load()
+        assert reloaded.find_entity("Redis")["observations"] == ["In-memory store", "Logged after the snapshot"]
+        assert reloaded.has_relation("Redis", "Neon", "complements")
+
+    def test_write_times_survive_snapshot_load_and_early_edits(self, memory_file: str) -> None:
+        graph = KnowledgeGraph(file_path=memory_file, binary_snapshot=True)
+        graph.upsert_entity("Redis", "Technology", ["first", "second", "third"])
+        graph.upsert_entity("Neon", "Technology", ["only"])
+        graph._entities["Redis"].observed_at = {"first": 1.0, "third": 3.0}
+        graph.save()
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        assert reloaded._entities["Redis"].to_dict() == graph._entities["Redis"].to_dict()
+        # Edit before anything reads the times; each must stay with its own observation
+        reloaded.delete_observations("Redis", ["first"])
+        reloaded.add_observations("Redis", ["fourth"])
+        redis = reloaded._entities["Redis"]
+        assert redis.observed_at["third"] == 3.0
+        assert redis.observed_at["fourth"] > 3.0
+        assert "second" not in redis.observed_at
+        assert reloaded._entities["Neon"].observed_at == graph._entities["Neon"].observed_at
+
+    def test_relations_from_snapshot_follow_edits(self, memory_file: str) -> None:
+        graph = _sample_graph(memory_file)
+        graph.binary_snapshot = True
+        graph.save()
+
+        reloaded = KnowledgeGraph(file_path=memory_file)
+        reloaded.load()
+        reloaded.create_relation("Neon", "Redis", "backs")
+        reloaded.delete_relations([("Redis", "Neon", "complements")])
+        assert reloaded.relations_of({"Redis"}) == [{"from": "Neon", "to": "Redis", "relationType": "backs"}]
+        assert reloaded.has_relation("Neon", "Ghost", "mentions")
+
+    @pytest.mark.asyncio
+    async def test_server_option_rewrites_snapshot(self, memory_file: str) -> None:
+        server = create_memory_server(memory_file, binary_snapshot=True)
+        await server.call_tool(
+            "create_entities", {"entities": [{"name": "Redis", "entityType": "Technology", "observations": ["fast"]}]}
+        )
+        assert read_snapshot(snapshot_path(memory_file)).source == file_identity(memory_file)
+        reloaded = load_graph(memory_file)
+        assert reloaded.find_entity("Redis")["observations"] == ["fast"]
+
+    def test_sqlite_rejects_binary_snapshot(self, tmp_path) -> None:
+        with pytest.raises(ValueError, match="only apply to JSONL"):
+            load_graph(str(tmp_path / "memory.db"), binary_snapshot=True)
+
+
+class TestConverter:
+    """The offline converter moves data between JSONL and binary."""
+
+    def test_jsonl_to_binary_and_back(self, memory_file: str) -> None:
+        _sample_graph(memory_file).save()
+        snap = jsonl_to_snapshot(memory_file)
+        assert snap == snapshot_path(memory_file)
+
+        out = f"{memory_file}.out.jsonl"
+        snapshot_to_jsonl(snap, out)
+        with open(memory_file) as original, open(out) as converted:
+            assert converted.read() == original.read()
+
+    def test_cli(self, memory_file: str, capsys: pytest.CaptureFixture[str]) -> None:
+        _sample_graph(memory_file).save()
+        assert main(["to-binary", memory_file]) == 0
+        assert capsys.readouterr().out.strip() == snapshot_path(memory_file)
+
+        out = f"{memory_file}.out.jsonl"
+        assert main(["to-jsonl", snapshot_path(memory_file), out]) == 0
+        graph = KnowledgeGraph(file_path=out)
+        graph.load()
+        assert len(graph.entities) == 3
@@ -0,0 +1,317 @@
+"""Tests for the SQLite knowledge graph storage engine."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import pytest
+
+from jade.mcp.sqlite_store import SqliteKnowledgeGraph, main
+
+
+@pytest.fixture
+def graph(tmp_path) -> SqliteKnowledgeGraph:
+    graph = SqliteKnowledgeGraph(str(tmp_path / "memory.db"))
+    graph.load()
+    yield graph
+    graph.close()
+
+
+def _populate(graph: SqliteKnowledgeGraph) -> None:
+    graph.upsert_entity("Redis", "Technology", ["In-memory store", "Used for hot memory"])
+    graph.upsert_entity("Neon", "Technology", ["Serverless Postgres"])
+    graph.upsert_entity("Alex", "Person", ["Prefers Redis for caching"])
+    graph.create_relation("Redis", "Neon", "complements")
+    graph.create_relation("Alex", "Redis", "uses")
+
+
+class TestMutations:
+    """Mutations keep the in-memory graph's semantics."""
+
+    def test_upsert_merges_observations_in_order(self, graph: SqliteKnowledgeGraph) -> None:
+        graph.upsert_entity("Alex", "Person", ["a", "b"])
+        graph.upsert_entity("Alex", "Robot", ["b", "c"])
+        assert graph.find_entity("Alex") == {"name": "Alex", "entityType": "Person", "observations": ["a", "b", "c"]}
+
+    def test_add_and_delete_observations(self, graph: SqliteKnowledgeGraph) -> None:
+        assert graph.add_observations("Missing", ["x"]) is False
+        graph.upsert_entity("Alex", "Person", ["a"])
+        assert graph.add_observations("Alex", ["b", "a"]) is True
+        graph.delete_observations("Alex", ["a"])
+        assert graph.find_entity("Alex")["observations"] == ["b"]
+
+    def test_relations_reject_duplicates(self, graph: SqliteKnowledgeGraph) -> None:
+        assert graph.create_relation("A", "B", "knows") is True
+        assert graph.create_relation("A", "B", "knows") is False
+        assert graph.has_relation("A", "B", "knows")
+        graph.delete_relations([("A", "B", "knows")])
+        assert graph.relations == []
+
+    def test_delete_entity_removes_its_relations_and_search_rows(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        graph.delete_entities(["Redis"])
+        assert graph.find_entity("Redis") is None
+        assert graph.relations == []
+        assert [e["name"] for e in graph.search("memory")] == []
+
+    def test_persists_across_instances(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        other = SqliteKnowledgeGraph(graph.file_path)
+        other.load()
+        try:
+            assert [e["name"] for e in other.entities] == ["Redis", "Neon", "Alex"]
+            assert len(other.relations) == 2
+            assert [e["name"] for e in graph.search("postgres")] == ["Neon"]  # Both connections can search
+            assert [e["name"] for e in other.search("postgres")] == ["Neon"]
+        finally:
+            other.close()
+
+
+class TestSearch:
+    """FTS5 search keeps case-insensitive substring matching, best first."""
+
+    def test_substring_case_insensitive(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        assert [e["name"] for e in graph.search("POSTGR")] == ["Neon"]
+        assert {e["name"] for e in graph.search("technolog")} == {"Redis", "Neon"}
+
+    def test_name_hit_ranks_first(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        assert [e["name"] for e in graph.search("redis")] == ["Redis", "Alex"]
+        assert [e["name"] for e in graph.search("redis", limit=1)] == ["Redis"]
+
+    def test_short_query_falls_back_to_scan(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        assert [e["name"] for e in graph.search("ne")] == ["Neon"]
+        assert len(graph.search("")) == 3
+
+    def test_quotes_and_new_observations(self, graph: SqliteKnowledgeGraph) -> None:
+        graph.upsert_entity("Quote", "Concept")
+        assert graph.search('say "hi"') == []
+        graph.add_observations("Quote", ['They say "hi" often'])
+        assert [e["name"] for e in graph.search('say "hi"')] == ["Quote"]
+        graph.delete_observations("Quote", ['They say "hi" often'])
+        assert graph.search('say "hi"') == []
+
+
+class TestReads:
+    """Paged reads and relation lookups are indexed queries."""
+
+    def test_relations_of(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        assert graph.relations_of(["Redis", "Neon"]) == [
+            {"from": "Redis", "to": "Neon", "relationType": "complements"},
+            {"from": "Alex", "to": "Redis", "relationType": "uses"},
+        ]
+
+    def test_read_page_walks_entities_then_relations(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        entities, relations, offset = graph.read_page(0, 2)
+        assert [e["name"] for e in entities] == ["Redis", "Neon"] and relations == [] and offset == 2
+        entities, relations, offset = graph.read_page(offset, 2)
+        assert [e["name"] for e in entities] == ["Alex"] and len(relations) == 1 and offset == 4
+        entities, relations, offset = graph.read_page(offset, 2)
+        assert entities == [] and len(relations) == 1 and offset is None
+
+    def test_read_page_filters_types(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        entities, relations, offset = graph.read_page(0, None, {"Person"})
+        assert [e["name"] for e in entities] == ["Alex"]
+        assert relations == [{"from": "Alex", "to": "Redis", "relationType": "uses"}]
+        assert offset is None
+
+    def test_traverse(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        entities, relations, truncated = graph.traverse(["Alex"], max_depth=2)
+        assert [e["name"] for e in entities] == ["Alex", "Redis", "Neon"]
+        assert len(relations) == 2 and truncated is False
+        entities, _, truncated = graph.traverse(["Alex"], max_depth=2, max_nodes=2)
+        assert [e["name"] for e in entities] == ["Alex", "Redis"] and truncated is True
+
+
+class TestRecall:
+    """recall() filters by type and observation write time, ranked by relevance and recency."""
+
+    def test_filters_and_ranking(self, graph: SqliteKnowledgeGraph, monkeypatch: pytest.MonkeyPatch) -> None:
+        clock = [1000.0]
+        monkeypatch.setattr("jade.mcp.sqlite_store.now", lambda: clock[-1])
+        graph.upsert_entity("redis", "Technology", ["Redis is the hot memory store"])
+        clock.append(2000.0)
+        graph.upsert_entity("cache-notes", "Concept", ["Notes mention redis once"])
+        clock.append(3000.0)
+        graph.add_observations("redis", ["redis sessions expire"])
+
+        assert [e["name"] for e in graph.recall("redis")] == ["redis", "cache-notes"]
+        assert [e["name"] for e in graph.recall("redis", entity_types=["Concept"])] == ["cache-notes"]
+        assert [e["name"] for e in graph.recall("redis", since=1500.0, until=2500.0)] == ["cache-notes"]
+        assert [e["name"] for e in graph.recall("", since=2500.0)] == ["redis"]
+        assert [e["name"] for e in graph.recall("red", limit=1)] == ["redis"]
+
+    def test_times_round_trip_through_jsonl(self, graph: SqliteKnowledgeGraph, tmp_path) -> None:
+        jsonl = tmp_path / "memory.jsonl"
+        record = {"type": "entity", "name": "A", "entityType": "Concept", "observations": ["x", "y"]}
+        jsonl.write_text(json.dumps({**record, "observedAt": [5.0, None]}) + "\n")
+        graph.import_jsonl(str(jsonl))
+        assert [e["name"] for e in graph.recall("", until=10.0)] == ["A"]
+        out = tmp_path / "out.jsonl"
+        graph.export_jsonl(str(out))
+        assert json.loads(out.read_text())["observedAt"] == [5.0, None]
+
+    def test_upgrades_databases_without_write_times(self, tmp_path) -> None:
+        import sqlite3
+
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE entities (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, entity_type TEXT NOT NULL);"
+            "CREATE TABLE observations (id INTEGER PRIMARY KEY, entity_id INTEGER NOT NULL, content TEXT NOT NULL,"
+            " UNIQUE (entity_id, content));"
+        )
+        conn.close()
+        graph = SqliteKnowledgeGraph(path)
+        graph.load()
+        try:
+            graph.upsert_entity("A", "Concept", ["x"])
+            assert [e["name"] for e in graph.recall("x", since=1.0)] == ["A"]
+        finally:
+            graph.close()
+
+
+class TestChangeFeed:
+    """Mutations are numbered in the changes table."""
+
+    def test_changes_since(self, graph: SqliteKnowledgeGraph) -> None:
+        _populate(graph)
+        graph.create_relation("Redis", "Neon", "complements")  # Duplicate: no change
+        graph.delete_entities(["Alex"])
+        changes, seq, reset = graph.changes_since(0)
+        assert [c["op"] for c in changes] == ["upsert_entity"] * 3 + ["create_relation"] * 2 + ["delete_entities"]
+        assert seq == 6 and reset is False
+        changes, seq, _ = graph.changes_since(4, limit=1)
+        assert (
+            changes == [{"op": "create_relation", "from": "Alex", "to": "Redis", "relationType": "uses", "seq": 5}]
+            and seq == 5
+        )
+        assert graph.changes_since(7) == ([], 6, True)
+
+    def test_history_is_kept_per_database(self, tmp_path) -> None:
+        path = str(tmp_path / "history.db")
+        graph = SqliteKnowledgeGraph(path)
+        graph.load()
+        try:
+            graph.upsert_entity("a")
+            history = graph.history
+        finally:
+            graph.close()
+        reopened = SqliteKnowledgeGraph(path)
+        reopened.load()
+        try:
+            assert reopened.history == history
+            assert reopened.changes_since(0, history=history)[2] is False
+            assert reopened.changes_since(0, history="elsewhere") == ([], 1, True)
+        finally:
+            reopened.close()
+        for leftover in (path, f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+        recreated = SqliteKnowledgeGraph(path)
+        recreated.load()
+        try:
+            assert recreated.history != history
+        finally:
+            recreated.close()
+
+    def test_retention_trims_old_changes(self, tmp_path) -> None:
+        graph = SqliteKnowledgeGraph(str(tmp_path / "trim.db"), change_retention=2)
+        graph.load()
+        try:
+            for name in ("a", "b", "c"):
+                graph.upsert_entity(name)
+            assert [c["name"] for c in graph.changes_since(1)[0]] == ["b", "c"]
+            assert graph.changes_since(0) == ([], 3, True)
+        finally:
+            graph.close()
+
+
+class TestTransactions:
+    """reading() and writing() hold one transaction across calls."""
+
+    def test_failed_batch_rolls_back(self, graph: SqliteKnowledgeGraph) -> None:
+        with pytest.raises(ValueError, match="boom"), graph.writing():
+            graph.upsert_entity("Partial")
+            raise ValueError("boom")
+        assert graph.find_entity("Partial") is None
+
+    def test_write_inside_read_raises(self, graph: SqliteKnowledgeGraph) -> None:
+        with graph.reading(), pytest.raises(RuntimeError, match="read lock"):
+            graph.upsert_entity("Nope")
+
+    def test_reader_sees_snapshot_while_other_thread_writes(self, graph: SqliteKnowledgeGraph) -> None:
+        graph.upsert_entity("Before")
+        with graph.reading():
+            assert len(graph.entities) == 1
+            writer = threading.Thread(target=graph.upsert_entity, args=("During",))
+            writer.start()
+            writer.join()
+            assert len(graph.entities) == 1
+        assert len(graph.entities) == 2
+
+
+class TestJsonlInterchange:
+    """JSONL memory files import and export losslessly."""
+
+    def test_round_trip(self, graph: SqliteKnowledgeGraph, tmp_path) -> None:
+        from jade.mcp.memory_server import KnowledgeGraph
+
+        source = KnowledgeGraph(file_path=str(tmp_path / "source.jsonl"))
+        source.upsert_entity("Redis", "Technology", ["In-memory store"])
+        source.upsert_entity("Neon", "Technology")
+        source.create_relation("Redis", "Neon", "complements")
+        source.save()
+        with open(source.file_path, "ab") as f:
+            f.write(b'{"type": "entity", "na\n')  # Corrupt line is skipped
+
+        assert graph.import_jsonl(source.file_path, batch_size=2) == 3
+        out = str(tmp_path / "out.jsonl")
+        graph.export_jsonl(out)
+
+        reloaded = KnowledgeGraph(file_path=out)
+        reloaded.load()
+        assert reloaded.entities == source.entities
+        assert reloaded.relations == source.relations
+
+    def test_cli(self, tmp_path, capsys: pytest.CaptureFixture[str]) -> None:
+        jsonl = tmp_path / "memory.jsonl"
+        jsonl.write_text(
+            json.dumps({"type": "entity", "name": "A", "entityType": "Concept", "observations": []}) + "\n"
+        )
+        db = str(tmp_path / "memory.db")
+        assert main(["import", str(jsonl), db]) == 0
+        assert "1 records" in capsys.readouterr().out
+        out = str(tmp_path / "out.jsonl")
+        assert main(["export", db, out]) == 0
+        assert os.path.getsize(out) > 0
+
+
+class TestServerBackend:
+    """A .db memory path serves the MCP tools from SQLite."""
+
+    @pytest.mark.asyncio
+    async def test_tools_round_trip(self, tmp_path) -> None:
+        from jade.mcp.memory_server import create_memory_server
+
+        server = create_memory_server(memory_file_path=str(tmp_path / "memory.db"))
+        await server.call_tool(
+            "create_entities",
+            {"entities": [{"name": "Stored", "entityType": "Concept", "observations": ["in sqlite"]}]},
+        )
+        result = await server.call_tool("search_nodes", {"query": "sqlite"})
+        assert [e["name"] for e in json.loads(result[1]["result"])["entities"]] == ["Stored"]
+
+    def test_rejects_jsonl_options(self, tmp_path) -> None:
+        from jade.mcp.memory_server import load_graph
+
+        with pytest.raises(ValueError, match="only apply to JSONL"):
+            load_graph(str(tmp_path / "memory.db"), wal=True)
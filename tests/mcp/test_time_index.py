@@ -0,0 +1,25 @@
+"""Tests for the time-ordered index behind date-range recall."""
+
+from __future__ import annotations
+
+from jade.mcp.time_index import TimeIndex
+
+
+class TestTimeIndex:
+    """Range lookups by binary search, newest first, each name once."""
+
+    def test_between_is_inclusive_and_newest_first(self) -> None:
+        index = TimeIndex([(30.0, "c"), (10.0, "a"), (20.0, "b")])
+        assert index.between(10.0, 20.0) == ["b", "a"]
+        assert index.between(since=15.0) == ["c", "b"]
+        assert index.between(until=9.0) == []
+        assert index.between() == ["c", "b", "a"]
+
+    def test_add_keeps_order_and_dedupes_names(self) -> None:
+        index = TimeIndex()
+        index.add(10.0, "a")
+        index.add(30.0, "a")
+        index.add(20.0, "b")  # Out of order: inserted, not appended
+        assert len(index) == 3
+        assert index.between() == ["a", "b"]
+        assert index.between(15.0, 25.0) == ["b"]
@@ -0,0 +1,61 @@
+"""Tests for bounded breadth-first traversal."""
+
+from __future__ import annotations
+
+import pytest
+
+from jade.mcp.traversal import Direction, breadth_first
+
+_EDGES = [("a", "b", "knows"), ("b", "c", "knows"), ("c", "d", "owns"), ("e", "a", "knows")]
+
+
+def _edges_of(names: list[str], direction: Direction) -> list[tuple[str, str, str]]:
+    members = set(names)
+    return [
+        key
+        for key in _EDGES
+        if (direction is not Direction.IN and key[0] in members)
+        or (direction is not Direction.OUT and key[1] in members)
+    ]
+
+
+class TestBreadthFirst:
+    """Hop distances, filters and budgets."""
+
+    def test_depths_in_visit_order(self) -> None:
+        depths, edges, truncated = breadth_first(["a"], _edges_of, max_depth=3)
+        assert depths == {"a": 0, "b": 1, "e": 1, "c": 2, "d": 3}
+        assert len(edges) == 4
+        assert truncated is False
+
+    def test_direction(self) -> None:
+        assert list(breadth_first(["a"], _edges_of, 5, direction=Direction.OUT)[0]) == ["a", "b", "c", "d"]
+        assert list(breadth_first(["a"], _edges_of, 5, direction=Direction.IN)[0]) == ["a", "e"]
+
+    def test_relation_types(self) -> None:
+        depths, edges, _ = breadth_first(["a"], _edges_of, 5, relation_types={"knows"})
+        assert "d" not in depths
+        assert ("c", "d", "owns") not in edges
+
+    def test_budget_keeps_edges_between_reached_names_only(self) -> None:
+        depths, edges, truncated = breadth_first(["a", "a", "c"], _edges_of, 5, max_nodes=3)
+        assert list(depths) == ["a", "c", "b"]
+        assert all(key[0] in depths and key[1] in depths for key in edges)
+        assert truncated is True
+
+    def test_relations_among_last_hop(self) -> None:
+        edges = [("a", "b", "knows"), ("a", "c", "knows"), ("b", "c", "knows")]
+
+        def edges_of(names: list[str], direction: Direction) -> list[tuple[str, str, str]]:
+            return [key for key in edges if key[0] in names or key[1] in names]
+
+        depths, found, _ = breadth_first(["a"], edges_of, max_depth=1)
+        assert depths == {"a": 0, "b": 1, "c": 1}
+        assert found == edges
+        assert breadth_first(["b", "c"], edges_of, max_depth=0)[1] == [("b", "c", "knows")]
+
+    def test_rejects_bad_limits(self) -> None:
+        with pytest.raises(ValueError, match="maxDepth"):
+            breadth_first(["a"], _edges_of, -1)
+        with pytest.raises(ValueError, match="maxNodes"):
+            breadth_first(["a"], _edges_of, 1, max_nodes=0)
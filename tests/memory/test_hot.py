@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import pytest
 
-from jade.memory.hot import HotMemoryClient, HotMemoryConfig
+from jade.memory.hot import AsyncHotMemoryClient, HotMemoryClient, HotMemoryConfig
 
 
 class TestHotMemoryConfig:
@@ -121,6 +121,13 @@ class TestHotMemoryWorkingMemory:
         items = client.get_working_memory("sess-1", "context")
         assert len(items) == 0
 
+    def test_replace_working_memory(self, client: HotMemoryClient) -> None:
+        client.add_working_memory("sess-1", "threads", "old")
+        client.replace_working_memory("sess-1", "threads", ["a", "b"])
+        assert client.get_working_memory("sess-1", "threads") == ["a", "b"]
+        client.replace_working_memory("sess-1", "threads", [])
+        assert client.get_working_memory("sess-1", "threads") == []
+
     def test_session_isolation(self, client: HotMemoryClient) -> None:
         client.add_working_memory("sess-1", "data", "session1")
         client.add_working_memory("sess-2", "data", "session2")
@@ -128,3 +135,70 @@ class TestHotMemoryWorkingMemory:
         items2 = client.get_working_memory("sess-2", "data")
         assert items1 == ["session1"]
         assert items2 == ["session2"]
+
+
+class TestAsyncHotMemoryClient:
+    """AsyncHotMemoryClient mirrors HotMemoryClient on redis.asyncio."""
+
+    @pytest.fixture
+    async def client(self) -> AsyncHotMemoryClient:
+        return await AsyncHotMemoryClient.connect(HotMemoryConfig(redis_url="redis://localhost:6379"), use_fake=True)
+
+    @pytest.mark.asyncio
+    async def test_session_round_trip(self, client: AsyncHotMemoryClient) -> None:
+        await client.write_session("sess-1", {"topic": "TDD"}, ttl_seconds=60)
+        assert await client.read_session("sess-1") == {"topic": "TDD"}
+        assert await client.get_ttl("sess-1") == 60
+        await client.delete_session("sess-1")
+        assert await client.read_session("sess-1") is None
+        assert await client.get_ttl("sess-1") is None
+
+    @pytest.mark.asyncio
+    async def test_working_memory(self, client: AsyncHotMemoryClient) -> None:
+        await client.add_working_memory("sess-1", "context", "a")
+        await client.add_working_memory("sess-1", "context", "b")
+        assert await client.get_working_memory("sess-1", "context") == ["a", "b"]
+        await client.replace_working_memory("sess-1", "context", ["c"])
+        assert await client.get_working_memory("sess-1", "context") == ["c"]
+        await client.clear_working_memory("sess-1", "context")
+        assert await client.get_working_memory("sess-1", "context") == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions_overlap(
+        self, client: AsyncHotMemoryClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import asyncio
+
+        sessions = 20
+        arrived = 0
+        all_in_flight = asyncio.Event()
+
+        async def meet(_self: object) -> None:
+            # Each session's first round trip waits until every session has one in flight
+            nonlocal arrived
+            arrived += 1
+            if arrived == sessions:
+                all_in_flight.set()
+            await asyncio.wait_for(all_in_flight.wait(), 5)
+
+        monkeypatch.setattr("jade.memory.hot._AsyncFakeRedis._round_trip", meet)
+
+        async def session(n: int) -> dict[str, object] | None:
+            await client.write_session(f"sess-{n}", {"n": n})
+            return await client.read_session(f"sess-{n}")
+
+        results = await asyncio.gather(*(session(n) for n in range(sessions)))
+        assert results == [{"n": n} for n in range(sessions)]
+
+    def test_pool_from_config_or_shared(self) -> None:
+        import redis.asyncio
+
+        config = HotMemoryConfig(redis_url="redis://localhost:6379", max_connections=8)
+        assert AsyncHotMemoryClient(config)._redis.connection_pool.max_connections == 8
+        pool = redis.asyncio.ConnectionPool.from_url("redis://localhost:6379", decode_responses=True)
+        clients = [AsyncHotMemoryClient(config, pool=pool) for _ in range(2)]
+        assert all(client._redis.connection_pool is pool for client in clients)
+
+    def test_max_connections_validated(self) -> None:
+        with pytest.raises(ValueError, match="max_connections"):
+            HotMemoryConfig(redis_url="redis://localhost:6379", max_connections=0)
@@ -0,0 +1,58 @@
+"""Tests for the pluggable JSON codec."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from jade import codec
+from jade.mcp.memory_server import ObservationList
+
+
+@pytest.fixture(params=codec.available_codecs())
+def backend(request: pytest.FixtureRequest) -> codec.JsonCodec:
+    """Every installed backend, switched in globally for the test."""
+    previous = codec.set_codec(request.param)
+    yield codec.active_codec()
+    codec.set_codec(previous.name)
+
+
+class TestCodecSelection:
+    """The fastest installed backend is the default; stdlib is always there."""
+
+    def test_stdlib_always_available(self) -> None:
+        assert "json" in codec.available_codecs()
+        assert codec.available_codecs()[-1] == "json"
+
+    def test_default_is_fastest_installed(self) -> None:
+        assert codec.get_codec().name == codec.available_codecs()[0]
+
+    def test_unknown_codec_rejected(self) -> None:
+        with pytest.raises(ValueError, match="unknown JSON codec"):
+            codec.get_codec("yaml")
+
+
+class TestCodecBehaviour:
+    """Every backend round-trips the same values and rejects the same input."""
+
+    def test_round_trip(self, backend: codec.JsonCodec) -> None:
+        value = {"name": "Redis", "observations": ObservationList(["fast", "naïve 🚀"]), "n": 1, "ok": True}
+        assert json.loads(codec.dumps(value)) == value
+        assert codec.loads(codec.dumpb(value)) == value
+        assert codec.loads(codec.dumps(value)) == value
+
+    def test_pretty_is_indented(self, backend: codec.JsonCodec) -> None:
+        text = codec.dumps_pretty({"title": "Add feature", "steps": [1]})
+        assert '\n  "title": "Add feature"' in text
+        assert json.loads(text) == {"title": "Add feature", "steps": [1]}
+
+    def test_values_the_fast_path_cannot_encode_fall_back(self, backend: codec.JsonCodec) -> None:
+        value = {"surrogate": "\ud800", "big": 2**70}
+        assert json.loads(codec.dumps(value)) == value
+
+    def test_invalid_input_raises_value_error(self, backend: codec.JsonCodec) -> None:
+        with pytest.raises(ValueError):
+            codec.loads(b"{not json")
+        with pytest.raises(ValueError):
+            codec.loads(b'"\xff"')